@@ -12,6 +12,10 @@ from xlwings import view
 import logging
 import re
 import warnings
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from utils.instrumentation import stage
 
 
 current_date = datetime.today().date()
@@ -23,109 +27,288 @@ load_dotenv()
 
 SHIPROCKET_EMAIL = os.getenv("SHIPROCKET_EMAIL")
 SHIPROCKET_PASSWORD = os.getenv("SHIPROCKET_PASSWORD")
-LOGIN_URL = "https://apiv2.shiprocket.in/v1/external/auth/login"
-SHIPROCKET_ORDERS_URL = 'https://apiv2.shiprocket.in/v1/external/orders'
+SHIPROCKET_API_BASE = os.getenv("SHIPROCKET_API_BASE", "https://apiv2.shiprocket.in/v1/external")
 
+MAX_IN_FLIGHT_PAGES = int(os.getenv("SHIPROCKET_MAX_IN_FLIGHT", "4"))
+MAX_REQUEST_ATTEMPTS = 5
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
 
 
-_token_cache = {
-    'token': None,
-    'timestamp': None
-    }
-
 
 TOKEN_EXPIRY = timedelta(minutes=55)
 
-ProductRenameFinal = {
-    'name':"item_name",
-    'channel_sku':"item_sku",
-    'quantity':"item_quantity",
-    'available':"item_available",
-    'price':"item_price",
-    'product_cost':"item_cost",
-    'hsn':"item_hsn_code",
-    'discount':"item_discount",
-    'discount_including_tax':"item_discount_including_tax",
-    'selling_price':"item_selling_price",
-    'mrp':"item_mrp",
-    'tax_percentage':"tax_percent",
-    }
-
-
-ShipmentRenameFinal = {
-    'product_quantity':"shipment_quantity",
-    'total':"shipment_total",
+# Output column -> key in the order payload. Charges are read from order["awb_data"]["charges"];
+# products and shipments are lists, one output row per product per shipment.
+ORDER_FIELDS = {
+    'shiprocket_id': 'id',
+    'channel_order_id': 'channel_order_id',
+    'shiprocket_created_at': 'created_at',
+    'invoice_no': 'invoice_no',
+    'customer_name': 'customer_name',
+    'customer_email': 'customer_email',
+    'customer_phone': 'customer_phone',
+    'customer_address': 'customer_address',
+    'customer_address_2': 'customer_address_2',
+    'customer_city': 'customer_city',
+    'customer_state': 'customer_state',
+    'customer_pincode': 'customer_pincode',
+    'status': 'status',
+    'payment_method': 'payment_method',
+    'order_total': 'total',
+    'other_deduction': 'discount',
+    'picked_up_date': 'picked_up_date',
+    'etd_date': 'etd_date',
+    'out_for_delivery_date': 'out_for_delivery_date',
+    'delivered_date': 'delivered_date',
+    'other_charges': 'other_charges',
+    'giftwrap_charges': 'giftwrap_charges',
+    'rto_risk': 'rto_risk',
+    'pickup_location': 'pickup_location',
 }
 
-
-rename__final_dict = {
-    "awb_data.charges.cod_charges": "cod_charges",
-    "awb_data.charges.applied_weight_amount": "applied_weight_amount",
-    "awb_data.charges.freight_charges": "freight_charges",
-    "awb_data.charges.applied_weight": "applied_weight",
-    "awb_data.charges.charged_weight": "charged_weight",
-    "awb_data.charges.charged_weight_amount": "charged_weight_amount",
-    "awb_data.charges.charged_weight_amount_rto": "charged_weight_amount_rto",
-    "awb_data.charges.applied_weight_amount_rto": "applied_weight_amount_rto",
-    "awb_data.charges.billing_amount": "billing_amount",
-    
-    # Total & Discounts
-    "total": "order_total",
-    "discount": "other_deduction",
-    
-    # Item-level fields
-    "item_price": "item_net_price_excl_deduction",
-    "item_cost": "item_sp_excl_tax",
-    "item_discount": "item_disc_excl_tax",
-    "item_selling_price": "item_sp_incl_tax",
-    "item_discount_including_tax": "item_disc_incl_tax",
-    
-    # Timestamps
-    "created_at": "shiprocket_created_at"
+CHARGE_FIELDS = {
+    'cod_charges': 'cod_charges',
+    'applied_weight_amount': 'applied_weight_amount',
+    'freight_charges': 'freight_charges',
+    'charged_weight_amount': 'charged_weight_amount',
+    'charged_weight_amount_rto': 'charged_weight_amount_rto',
+    'applied_weight_amount_rto': 'applied_weight_amount_rto',
+    'billing_amount': 'billing_amount',
+    'applied_weight': 'applied_weight',
+    'charged_weight': 'charged_weight',
 }
 
+PRODUCT_FIELDS = {
+    'item_name': 'name',
+    'tax_percent': 'tax_percentage',
+    'item_quantity': 'quantity',
+    'item_net_price_excl_deduction': 'price',
+    'item_sp_excl_tax': 'product_cost',
+    'item_disc_excl_tax': 'discount',
+    'item_sp_incl_tax': 'selling_price',
+    'item_disc_incl_tax': 'discount_including_tax',
+}
 
-def get_shiprocket_token(force_refresh: bool = False) -> Optional[str]:
+SHIPMENT_FIELDS = {
+    'courier': 'courier',
+    'weight': 'weight',
+    'dimensions': 'dimensions',
+    'pickedup_timestamp': 'pickedup_timestamp',
+    'awb': 'awb',
+    'rto_delivered_date': 'rto_delivered_date',
+    'rto_initiated_date': 'rto_initiated_date',
+    'delivery_executive_name': 'delivery_executive_name',
+}
 
-    if not force_refresh and _token_cache['token']:
-        last_updated = datetime.fromtimestamp(_token_cache['timestamp'])
-        if datetime.now() - last_updated < TOKEN_EXPIRY:
-            return _token_cache['token']
-    
-    if not SHIPROCKET_EMAIL or not SHIPROCKET_PASSWORD:
-        print("Missing Shiprocket credentials in environment variables")
-        return None
-    
-    try:
-        response = requests.post(
-            LOGIN_URL,
-            headers={"Content-Type": "application/json"},
-            json={"email": SHIPROCKET_EMAIL, "password": SHIPROCKET_PASSWORD},
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            token_data = response.json()
-            token = token_data.get('token')
-            
+FINAL_COLUMNS = [
+    'shiprocket_id', 'channel_order_id', 'shiprocket_created_at', 'invoice_no',
+    'customer_name', 'customer_email', 'customer_phone', 'customer_address',
+    'customer_address_2', 'customer_city', 'customer_state', 'customer_pincode',
+    'status', 'payment_method', 'item_name', 'tax_percent',
+    'item_quantity', 'item_net_price_excl_deduction', 'item_sp_excl_tax', 'item_disc_excl_tax',
+    'item_sp_incl_tax', 'item_disc_incl_tax', 'order_total', 'other_deduction',
+    'picked_up_date', 'etd_date', 'out_for_delivery_date', 'delivered_date',
+    'rto_initiated_date', 'rto_delivered_date', 'cod_charges', 'applied_weight_amount',
+    'freight_charges', 'charged_weight_amount', 'charged_weight_amount_rto', 'applied_weight_amount_rto',
+    'billing_amount', 'other_charges', 'giftwrap_charges', 'courier',
+    'weight', 'dimensions', 'applied_weight', 'charged_weight',
+    'pickedup_timestamp', 'awb', 'delivery_executive_name', 'rto_risk',
+    'pickup_location'
+]
+
+# Product prices are numeric per product row; rows of orders without products stay empty.
+PRODUCT_NUMERIC_COLUMNS = ['item_net_price_excl_deduction', 'item_sp_excl_tax']
+WEIGHT_PATTERN = re.compile(r'(\d+\.?\d*)')
+COURIER_NOISE_PATTERN = re.compile(r'\bsurface\w*\b|\b\d+\s?(kg|kgs|gm|gms)\b', flags=re.IGNORECASE)
+
+
+class ShiprocketClient:
+    """
+    Shiprocket API client.
+
+    Owns one pooled keep-alive requests.Session, so pages reuse TCP/TLS connections,
+    caches the auth token and refreshes it on expiry or a 401, and retries throttled or
+    failed requests with exponential backoff that honours Retry-After.
+    """
+
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        base_url: str = SHIPROCKET_API_BASE,
+        pool_size: int = MAX_IN_FLIGHT_PAGES,
+        timeout: tuple = REQUEST_TIMEOUT,
+        max_attempts: int = MAX_REQUEST_ATTEMPTS,
+    ) -> None:
+        self.email = email or SHIPROCKET_EMAIL
+        self.password = password or SHIPROCKET_PASSWORD
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+        self._token = None
+        self._token_timestamp = None
+        self._token_lock = threading.Lock()
+        self._login_lock = threading.Lock()
+
+    def get_token(self, force_refresh: bool = False, stale_token: Optional[str] = None) -> Optional[str]:
+        """
+        Returns a valid auth token, logging in when there is none or it has expired.
+
+        Only one thread logs in at a time; threads that waited on it reuse the token it got.
+        `_token_lock` guards the cached token only and is never held over the login request
+        or its retry backoff.
+
+        Args:
+            force_refresh (bool): Replace the token that is current at call time.
+            stale_token (str, optional): A token the API rejected. It is replaced only if it is
+                still the current one, so concurrent 401s on one token cause a single login.
+
+        Returns:
+            str | None: The token, or None if the login failed.
+        """
+        with self._token_lock:
+            if force_refresh and stale_token is None:
+                stale_token = self._token
+            token = self._cached_token(stale_token)
+        if token:
+            return token
+
+        with self._login_lock:
+            # Another thread may have logged in while this one waited for the login lock.
+            with self._token_lock:
+                token = self._cached_token(stale_token)
             if token:
-                _token_cache['token'] = token
-                _token_cache['timestamp'] = time.time()
-                print("Shiprocket token generated successfully.")
                 return token
-            else:
-                print("Token missing in response:", token_data)
+
+            token = self._login()
+            if token:
+                with self._token_lock:
+                    self._token = token
+                    self._token_timestamp = time.time()
+            return token
+
+    def _cached_token(self, stale_token: Optional[str]) -> Optional[str]:
+        # Called with _token_lock held.
+        if not self._token or self._token == stale_token:
+            return None
+        if datetime.now() - datetime.fromtimestamp(self._token_timestamp) >= TOKEN_EXPIRY:
+            return None
+        return self._token
+
+    def _login(self) -> Optional[str]:
+        if not self.email or not self.password:
+            logging.error("Missing Shiprocket credentials in environment variables")
+            return None
+
+        response = self._send('POST', '/auth/login', json={"email": self.email, "password": self.password})
+        if response is None:
+            return None
+
+        if response.status_code != 200:
+            logging.error(f"Failed to fetch token. Status: {response.status_code}. Response: {response.text}")
+            return None
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            logging.error(f"Error parsing login response: {e}. Response: {response.text}")
+            return None
+
+        token = payload.get('token') if isinstance(payload, dict) else None
+        if not token:
+            logging.error(f"Token missing in response: {response.text}")
+            return None
+
+        logging.info("Shiprocket token generated successfully.")
+        return token
+
+    def get(self, path: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+        """Authenticated GET; refreshes the token once on a 401."""
+        token = self.get_token()
+        if not token:
+            logging.error("Failed to get Shiprocket token.")
+            return None
+
+        response = self._send('GET', path, params=params, headers={'Authorization': f'Bearer {token}'})
+        if response is not None and response.status_code == 401:
+            token = self.get_token(stale_token=token)
+            if token:
+                response = self._send('GET', path, params=params, headers={'Authorization': f'Bearer {token}'})
+        return response
+
+    def fetch_orders_page(self, params: Dict) -> Optional[Dict]:
+        """Fetches one page of the orders endpoint and returns the decoded JSON payload, or None."""
+        with stage('fetch page') as record:
+            response = self.get('/orders', params=params)
+            if response is None or response.status_code != 200:
+                if response is not None:
+                    logging.error(f"Orders page {params.get('page')} failed: {response.status_code}: {response.text}")
+                return None
+
+            try:
+                payload = response.json()
+            except ValueError as e:
+                logging.error(f"Error parsing JSON response: {e}")
                 return None
-    
-        print(f"Failed to fetch token. Status: {response.status_code}")
-        print("Response:", response.text)
-        return None
+            record.rows_out = len(payload.get("data") or []) if isinstance(payload, dict) else None
+            return payload
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _send(self, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        url = f"{self.base_url}{path}"
+        delay = 1.0
+        response = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except requests.RequestException as e:
+                logging.warning(f"{method} {path} attempt {attempt} failed: {e}")
+                response = None
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                logging.warning(f"{method} {path} attempt {attempt} returned {response.status_code}.")
+
+            if attempt == self.max_attempts:
+                break
+            wait = delay
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            if retry_after and retry_after.isdigit():
+                wait = max(wait, float(retry_after))
+            time.sleep(wait)
+            delay *= 2
+
+        logging.error(f"{method} {path} failed after {self.max_attempts} attempts.")
+        return response
+
 
-    except requests.RequestException as e:
-        print(f"Network error while fetching token: {str(e)}")
-        return None
+_client: Optional[ShiprocketClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ShiprocketClient:
+    """Returns the shared module-level client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ShiprocketClient()
+        return _client
+
+
+def get_shiprocket_token(force_refresh: bool = False) -> Optional[str]:
+    return get_client().get_token(force_refresh=force_refresh)
 
 def get_orders(
     from_date: Optional[str] = None,
@@ -142,19 +325,6 @@ def get_orders(
     fbs: Optional[int] = None,
     debug: bool = False
 ) -> pd.DataFrame:
-    
-    
-    warnings.filterwarnings("ignore", category=UserWarning)
-
-    token = get_shiprocket_token()
-    if not token:
-        logging.error("Failed to get Shiprocket token.")
-        return pd.DataFrame()
-
-    headers = {
-        'Content-Type': 'application/json',
-        'Authorization': f'Bearer {token}'
-    }
 
     params = {}
     if from_date: params["from"] = from_date
@@ -170,167 +340,241 @@ def get_orders(
     if pickup_location: params["pickup_location"] = pickup_location
     if fbs is not None: params["fbs"] = fbs
 
-    for attempt in range(3):
-        response = requests.get(SHIPROCKET_ORDERS_URL, headers=headers, params=params)
-        if response.status_code == 200:
-            break
-        logging.warning(f"API attempt {attempt+1} failed. Retrying...")
-    else:
-        logging.error(f"API request failed after 3 attempts: {response.status_code}: {response.text}")
+    payload = fetch_orders_page(params)
+    if payload is None:
         return pd.DataFrame()
 
-    try:
-        data = response.json().get("data", [])
-
-        if debug:
-            with open('shiprocket_orders.json', 'w') as f:
-                json.dump(data, f, indent=4)
+    data = payload.get("data", [])
+
+    if debug:
+        with open('shiprocket_orders.json', 'w') as f:
+            json.dump(data, f, indent=4)
+
+    return normalise_orders(data)
+
+
+def fetch_orders_page(params: Dict) -> Optional[Dict]:
+    """Fetches one page of the orders endpoint through the shared client."""
+    return get_client().fetch_orders_page(params)
+
+
+def _records(value) -> List[Dict]:
+    # Products and shipments arrive as lists, occasionally as a single dict.
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return [value]
+    return []
+
+
+def _shipment_weight(value) -> float:
+    if isinstance(value, str):
+        match = WEIGHT_PATTERN.search(value)
+        return float(match.group(1)) if match else 0.0
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return 0.0
+
+
+def flatten_orders(data: List[Dict]) -> pd.DataFrame:
+    """
+    Flattens order payloads into one row per product per shipment, in a single walk.
+
+    Order and charge fields are collected once per order and repeated onto that order's rows
+    when the DataFrame is built; an order without products or shipments still gives one row,
+    with those fields empty. All columns are filled into preallocated lists and the
+    DataFrame is built once.
+
+    Args:
+        data (List[Dict]): Orders as returned by the orders endpoint. They are not modified.
+
+    Returns:
+        pd.DataFrame: The FINAL_COLUMNS found in the payloads, plus a boolean 'has_product'.
+            Columns no order carries are left out; missing values are NaN.
+    """
+    nested = []
+    total_rows = 0
+    for order in data:
+        products = _records(order.get('products')) or [None]
+        shipments = _records(order.get('shipments')) or [None]
+        nested.append((products, shipments))
+        total_rows += len(products) * len(shipments)
+
+    nan = float('nan')
+    order_columns = {column: [nan] * len(data) for column in (*ORDER_FIELDS, *CHARGE_FIELDS)}
+    row_columns = {column: [nan] * total_rows for column in (*PRODUCT_FIELDS, *SHIPMENT_FIELDS)}
+    order_position = [0] * total_rows
+    has_product = [False] * total_rows
+    order_keys, charge_keys, product_keys, shipment_keys = set(), set(), set(), set()
+
+    order_fields = [(order_columns[column], key) for column, key in ORDER_FIELDS.items()]
+    charge_fields = [(order_columns[column], key) for column, key in CHARGE_FIELDS.items()]
+    product_fields = [(row_columns[column], key) for column, key in PRODUCT_FIELDS.items()]
+    shipment_fields = [(row_columns[column], key) for column, key in SHIPMENT_FIELDS.items() if column != 'weight']
+    weights = row_columns['weight']
+
+    row = 0
+    for position, (order, (products, shipments)) in enumerate(zip(data, nested)):
+        order_keys.update(order)
+        get = order.get
+        for values, key in order_fields:
+            values[position] = get(key, nan)
+
+        charges = get('awb_data')
+        charges = charges.get('charges') if isinstance(charges, dict) else None
+        if isinstance(charges, dict):
+            charge_keys.update(charges)
+            for values, key in charge_fields:
+                values[position] = charges.get(key, nan)
+
+        for product in products:
+            if product is not None:
+                product_keys.update(product)
+            for shipment in shipments:
+                order_position[row] = position
+                if product is not None:
+                    has_product[row] = True
+                    for values, key in product_fields:
+                        values[row] = product.get(key, nan)
+                if shipment is not None:
+                    shipment_keys.update(shipment)
+                    weights[row] = _shipment_weight(shipment.get('weight'))
+                    for values, key in shipment_fields:
+                        values[row] = shipment.get(key, nan)
+                row += 1
+
+    seen = {column for column, key in ORDER_FIELDS.items() if key in order_keys}
+    seen.update(column for column, key in CHARGE_FIELDS.items() if key in charge_keys)
+    seen.update(column for column, key in PRODUCT_FIELDS.items() if key in product_keys)
+    seen.update(column for column, key in SHIPMENT_FIELDS.items() if key in shipment_keys)
+    if shipment_keys:
+        seen.add('weight')
+
+    df = pd.DataFrame({column: values for column, values in order_columns.items() if column in seen})
+    df = df.take(order_position).reset_index(drop=True)
+    for column, values in row_columns.items():
+        if column in seen:
+            df[column] = values
+    df['has_product'] = has_product
+    return df
+
+
+def normalise_orders(data: List[Dict]) -> pd.DataFrame:
+    """Flattens raw order dicts (products, shipments, charges) into shiprocket_orders rows."""
+    warnings.filterwarnings("ignore", category=UserWarning)
 
-        if not data:
-            logging.info("No orders returned.")
+    with stage('normalise', rows_in=len(data or [])) as record:
+        try:
+            if not data:
+                logging.info("No orders returned.")
+                return pd.DataFrame()
+
+            df_final = flatten_orders(data)
+            has_product = df_final.pop('has_product')
+            for col in PRODUCT_NUMERIC_COLUMNS:
+                if col in df_final.columns:
+                    values = pd.to_numeric(df_final[col], errors='coerce')
+                    df_final[col] = values.mask(has_product & values.isna(), 0)
+
+            for i in FINAL_COLUMNS:
+                if i not in df_final.columns:
+                    df_final[i] = ''
+            df_final = df_final[FINAL_COLUMNS]
+
+            df_final["courier"] = df_final["courier"].str.replace(COURIER_NOISE_PATTERN, '', regex=True).str.strip()
+
+            date_columns = ["shiprocket_created_at","picked_up_date","etd_date","out_for_delivery_date","rto_initiated_date","rto_delivered_date","pickedup_timestamp","delivered_date"]
+            custom_formats = {
+                "shiprocket_created_at": "%d %b %Y, %I:%M %p",
+                "pickedup_timestamp": "%d %b %Y, %I:%M %p",
+                "etd_date": "%d-%m-%Y %H:%M:%S",
+                "out_for_delivery_date": "%d-%m-%Y %H:%M:%S"
+            }
+            for col in date_columns:
+                if col in custom_formats:
+                    df_final[col] = pd.to_datetime(df_final[col], format=custom_formats[col], errors="coerce")
+                else:
+                    df_final[col] = pd.to_datetime(df_final[col], errors="coerce", dayfirst=True)
+
+            for col in date_columns:
+                df_final[col] = df_final[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+
+            date_zero_replace = ['pickedup_timestamp', 'rto_initiated_date', 'rto_delivered_date']
+            df_final[date_zero_replace] = df_final[date_zero_replace].replace({'0000-00-00 00:00:00': pd.NaT, '': pd.NaT})
+
+            num_col = [
+                "cod_charges", "applied_weight_amount", "freight_charges", "charged_weight_amount",
+                "charged_weight_amount_rto", "applied_weight_amount_rto", "billing_amount", "other_charges",
+                "giftwrap_charges", "applied_weight", "charged_weight",'order_total']
+            df_final[num_col] = df_final[num_col].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+            groups_key = ['shiprocket_id','channel_order_id']
+            one_time_value = [
+                'order_total', 'other_deduction', 'cod_charges', 'applied_weight_amount',
+                'freight_charges', 'charged_weight_amount', 'charged_weight_amount_rto',
+                'applied_weight_amount_rto', 'billing_amount', 'other_charges',
+                'giftwrap_charges', 'applied_weight', 'weight', 'charged_weight'
+            ]
+
+            first_mask = df_final.groupby(groups_key).cumcount() == 0
+            df_final[one_time_value] = df_final[one_time_value].where(first_mask, 0)
+
+            record.rows_out = len(df_final)
+            return df_final
+
+        except ValueError as e:
+            logging.error(f"Error normalising orders: {e}")
             return pd.DataFrame()
 
-        for order in data:
-            others = order.get("others")
-            if isinstance(others, dict):
-                order["others"] = [others]
-            elif not isinstance(others, list):
-                order["others"] = None
-
-        df_orders = pd.json_normalize(data)
-
-        if any("products" in order and order["products"] for order in data):
-            df_products = pd.json_normalize(data, record_path='products', meta=['id'], record_prefix='product_')\
-                .drop(columns=["product_id"], errors='ignore')\
-                .rename(columns={"product_quantity": "quantity"})
-            df_products.columns = df_products.columns.str.removeprefix("product_")
-            df_products.rename(columns=ProductRenameFinal,inplace=True)
-            product_col = [
-                "item_name","item_sku","item_quantity","item_available",
-                "item_price","item_cost","item_hsn_code",
-                "item_discount","item_discount_including_tax",
-                "item_selling_price","item_mrp","tax_percent","description","id"
-                ]
-            df_products = df_products[product_col]
-            numeric_columns = ["item_price", "item_cost", "item_hsn_code"]
-            df_products[numeric_columns] = df_products[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
-
-
-        else:
-            df_products = pd.DataFrame(columns=["id", "product_name", "quantity"])
-
-        if any("shipments" in order and order["shipments"] for order in data):
-            df_shipments = pd.json_normalize(data, record_path='shipments', meta=['id'], record_prefix='shipment_')\
-                .drop(columns=['shipment_id'], errors='ignore')
-            df_shipments.columns = df_shipments.columns.str.removeprefix("shipment_")
-            df_shipments = df_shipments.rename(columns=ShipmentRenameFinal)
-            shipment_col = [
-                "courier", "weight", "dimensions", "pickedup_timestamp","awb",
-                "rto_delivered_date", "rto_initiated_date", "delivery_executive_name",
-                "id"]
-            df_shipments = df_shipments[shipment_col]
-            df_shipments['weight'] = df_shipments['weight'].str.extract(r'(\d+\.?\d*)').astype(float).fillna(0)
-        else:
-            df_shipments = pd.DataFrame(columns=["id"])
-
-        if any("others" in order and isinstance(order["others"], list) and order["others"] for order in data):
-            df_others = pd.json_normalize(data, record_path=['others'], meta=['id'], record_prefix='others_', errors='ignore')\
-                .drop(columns=["others_order_items"], errors='ignore')
-            df_others.columns = df_others.columns.str.removeprefix("shipment_")
-            
-        else:
-            df_others = pd.DataFrame(columns=["id"])
-
-        df_final = df_orders.drop(columns=['products','shipments','others','activities','errors'], errors='ignore')
-        df_final = df_final.merge(df_products, on='id', how='left')
-        df_final = df_final.merge(df_shipments, on='id', how='left')
-        df_final = df_final.rename(columns={'id':"shiprocket_id"})
-        df_final.rename(columns=rename__final_dict, inplace=True,errors='ignore')
-        final_cols = [
-            'shiprocket_id', 'channel_order_id', 'shiprocket_created_at', 'invoice_no',
-            'customer_name', 'customer_email', 'customer_phone', 'customer_address',
-            'customer_address_2', 'customer_city', 'customer_state', 'customer_pincode',
-            'status', 'payment_method', 'item_name', 'tax_percent',
-            'item_quantity', 'item_net_price_excl_deduction', 'item_sp_excl_tax', 'item_disc_excl_tax',
-            'item_sp_incl_tax', 'item_disc_incl_tax', 'order_total', 'other_deduction',
-            'picked_up_date', 'etd_date', 'out_for_delivery_date', 'delivered_date',
-            'rto_initiated_date', 'rto_delivered_date', 'cod_charges', 'applied_weight_amount',
-            'freight_charges', 'charged_weight_amount', 'charged_weight_amount_rto', 'applied_weight_amount_rto',
-            'billing_amount', 'other_charges', 'giftwrap_charges', 'courier',
-            'weight', 'dimensions', 'applied_weight', 'charged_weight',
-            'pickedup_timestamp', 'awb', 'delivery_executive_name', 'rto_risk',
-            'pickup_location'
-        ]
-
-        for i in final_cols:
-            if i not in df_final.columns:
-                df_final[i] = ''
-        df_final = df_final[final_cols]
-        
-        pattern = r'\bsurface\w*\b|\b\d+\s?(kg|kgs|gm|gms)\b'
-
-        df_final["courier"] = df_final["courier"].str.replace(pattern, '', flags=re.IGNORECASE, regex=True).str.strip()
-
-        date_columns = ["shiprocket_created_at","picked_up_date","etd_date","out_for_delivery_date","rto_initiated_date","rto_delivered_date","pickedup_timestamp","delivered_date"]
-        custom_formats = {
-            "shiprocket_created_at": "%d %b %Y, %I:%M %p",
-            "pickedup_timestamp": "%d %b %Y, %I:%M %p",
-            "etd_date": "%d-%m-%Y %H:%M:%S",
-            "out_for_delivery_date": "%d-%m-%Y %H:%M:%S"
-        }
-        for col in date_columns:
-            if col in custom_formats:
-                df_final[col] = pd.to_datetime(df_final[col], format=custom_formats[col], errors="coerce")
-            else:
-                df_final[col] = pd.to_datetime(df_final[col], errors="coerce", dayfirst=True)
-
-        for col in date_columns:
-            df_final[col] = df_final[col].dt.strftime('%Y-%m-%d %H:%M:%S')
-
-        date_zero_replace = ['pickedup_timestamp', 'rto_initiated_date', 'rto_delivered_date']
-        df_final[date_zero_replace] = df_final[date_zero_replace].replace({'0000-00-00 00:00:00': pd.NaT, '': pd.NaT})
-
-        num_col = [
-            "cod_charges", "applied_weight_amount", "freight_charges", "charged_weight_amount",
-            "charged_weight_amount_rto", "applied_weight_amount_rto", "billing_amount", "other_charges",
-            "giftwrap_charges", "applied_weight", "charged_weight",'order_total']
-        df_final[num_col] = df_final[num_col].apply(pd.to_numeric, errors='coerce').fillna(0)
-
-        groups_key = ['shiprocket_id','channel_order_id']
-        one_time_value = [
-            'order_total', 'other_deduction', 'cod_charges', 'applied_weight_amount',
-            'freight_charges', 'charged_weight_amount', 'charged_weight_amount_rto',
-            'applied_weight_amount_rto', 'billing_amount', 'other_charges',
-            'giftwrap_charges', 'applied_weight', 'weight', 'charged_weight'
-        ]
-
-        valid_columns = [col for col in one_time_value if col in df_final.columns]
-
-        first_mask = df_final.groupby(groups_key).cumcount() == 0
-        df_final[valid_columns] = df_final[valid_columns].where(first_mask, 0)
-        
-        return df_final
-
-    except ValueError as e:
-        logging.error(f"Error parsing JSON response: {e}")
-        return pd.DataFrame()
-
-def get_all_orders(start_date: str, end_date: str) -> pd.DataFrame:
-    all_orders = []
-    page = 1
-    while True:
-        df = get_orders(
-            from_date=start_date,
-            to_date=end_date,
-            per_page=100,
-            page=page
-        )
-        if df.empty:
-            break
-        all_orders.append(df)
-        print(f"Page {page} fetched with {len(df)} records.")
-        page += 1
-    return pd.concat(all_orders, ignore_index=True) if all_orders else pd.DataFrame()
-
-
-
+def get_all_orders(start_date: str, end_date: str, per_page: int = 100, max_workers: int = MAX_IN_FLIGHT_PAGES) -> pd.DataFrame:
+    """Fetches every order page between two dates and normalises them once."""
+    return normalise_orders(fetch_all_order_payloads(start_date, end_date, per_page=per_page, max_workers=max_workers))
+
+
+def fetch_all_order_payloads(start_date: str, end_date: str, per_page: int = 100, max_workers: int = MAX_IN_FLIGHT_PAGES) -> List[Dict]:
+    """
+    Fetches every order page between two dates and returns the raw order dicts.
+
+    The first page's pagination metadata gives the page count; the remaining pages are
+    fetched concurrently with at most `max_workers` requests in flight. If the response
+    carries no pagination metadata, pages are walked one by one until an empty page.
+
+    Raises:
+        RuntimeError: If any page, including the first (e.g. the login failed), could not be
+            fetched, so callers never mistake a partial fetch for the complete window.
+    """
+    params = {"from": start_date, "to": end_date, "per_page": per_page}
+
+    first = fetch_orders_page({**params, "page": 1})
+    if first is None:
+        raise RuntimeError("Page 1 of the orders could not be fetched.")
+
+    all_orders = list(first.get("data") or [])
+    logging.info(f"Page 1 fetched with {len(all_orders)} orders.")
+
+    total_pages = ((first.get("meta") or {}).get("pagination") or {}).get("total_pages")
+    if total_pages is None:
+        page = 2
+        while all_orders:
+            payload = fetch_orders_page({**params, "page": page})
+            if payload is None:
+                raise RuntimeError(f"Page {page} of the orders could not be fetched.")
+            data = payload.get("data") or []
+            if not data:
+                break
+            all_orders.extend(data)
+            logging.info(f"Page {page} fetched with {len(data)} orders.")
+            page += 1
+    elif total_pages > 1:
+        def fetch(page: int) -> List[Dict]:
+            payload = fetch_orders_page({**params, "page": page})
+            if payload is None:
+                raise RuntimeError(f"Page {page} of {total_pages} could not be fetched.")
+            return payload.get("data") or []
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for page, data in enumerate(executor.map(fetch, range(2, total_pages + 1)), start=2):
+                all_orders.extend(data)
+                logging.info(f"Page {page}/{total_pages} fetched with {len(data)} orders.")
+
+    return all_orders
@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy import select
+from models.base import KBBIOBase
+from models.shiprocket.shiprocket_models import ShiprocketSyncState, ShiprocketOrderState
+from sql_connector import get_connector
+from dbcrud import DatabaseCrud, DELETE_BATCH_SIZE
+from Shiprocket.shiprocket import fetch_all_order_payloads, normalise_orders
+from logging_config import logger
+
+
+SYNC_JOB_NAME = 'shiprocket_orders'
+
+# Orders keep changing (pickup, delivery, RTO, charges) for a couple of weeks after creation,
+# so each incremental run re-fetches orders created since the last sync minus this overlap.
+INCREMENTAL_OVERLAP_DAYS = int(os.getenv("SHIPROCKET_INCREMENTAL_OVERLAP_DAYS", "15"))
+RECONCILE_DAYS = int(os.getenv("SHIPROCKET_RECONCILE_DAYS", "180"))
+RECONCILE_INTERVAL = timedelta(hours=int(os.getenv("SHIPROCKET_RECONCILE_INTERVAL_HOURS", "168")))
+
+
+def order_fingerprint(order: Dict) -> str:
+    """Stable hash of an order payload; any field change on Shiprocket's side changes it."""
+    return hashlib.sha1(json.dumps(order, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def dedupe_orders(orders: List[Dict]) -> List[Dict]:
+    """
+    Keeps one payload per order id, the last one fetched, in first-seen order.
+
+    Orders shift between pages while they are fetched, so overlapping pages can return the
+    same order twice. Orders without an id are kept as they are.
+    """
+    by_id, without_id = {}, []
+    for order in orders:
+        if order.get("id") is None:
+            without_id.append(order)
+        else:
+            by_id[str(order["id"])] = order
+    if len(by_id) + len(without_id) < len(orders):
+        logger.info(f"Dropped {len(orders) - len(by_id) - len(without_id)} duplicate orders returned by overlapping pages.")
+    return list(by_id.values()) + without_id
+
+
+def _load_sync_state(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(ShiprocketSyncState).where(ShiprocketSyncState.job_name == SYNC_JOB_NAME)
+        ).first()
+
+
+def _load_order_hashes(engine, shiprocket_ids: List[str]) -> Dict[str, str]:
+    known = {}
+    with engine.connect() as connection:
+        for start in range(0, len(shiprocket_ids), DELETE_BATCH_SIZE):
+            batch = shiprocket_ids[start:start + DELETE_BATCH_SIZE]
+            rows = connection.execute(
+                select(ShiprocketOrderState.shiprocket_id, ShiprocketOrderState.payload_hash)
+                .where(ShiprocketOrderState.shiprocket_id.in_(batch))
+            )
+            known.update({row.shiprocket_id: row.payload_hash for row in rows})
+    return known
+
+
+def shiprocket_incremental_sync(full: bool = False) -> None:
+    """
+    Syncs Shiprocket orders into shiprocket_orders using a high-watermark.
+
+    A normal run fetches orders created since the last successful sync (minus
+    INCREMENTAL_OVERLAP_DAYS) and rewrites only the orders whose payload changed since they
+    were last stored, tracked per order in shiprocket_order_state. Every RECONCILE_INTERVAL,
+    or when `full` is set, a deep reconciliation re-checks the last RECONCILE_DAYS instead,
+    catching late status changes on older orders.
+    """
+    db_kbbio = DatabaseCrud(get_connector('kbbio'))
+    kbbio_engine = db_kbbio.db_engine
+    KBBIOBase.metadata.create_all(bind=kbbio_engine)
+
+    now = datetime.now()
+    state = _load_sync_state(kbbio_engine)
+    deep = (
+        full
+        or state is None
+        or state.last_synced_at is None
+        or state.last_reconciled_at is None
+        or now - state.last_reconciled_at >= RECONCILE_INTERVAL
+    )
+
+    if deep:
+        from_date = now - timedelta(days=RECONCILE_DAYS)
+    else:
+        from_date = state.last_synced_at - timedelta(days=INCREMENTAL_OVERLAP_DAYS)
+
+    mode = "deep reconciliation" if deep else "incremental"
+    logger.info(f"Shiprocket {mode} sync from {from_date:%Y-%m-%d} to {now:%Y-%m-%d}.")
+
+    try:
+        # Raises if any page could not be fetched, so the sync state below is only advanced
+        # after the whole window was read.
+        orders = fetch_all_order_payloads(start_date=from_date.strftime('%Y-%m-%d'), end_date=now.strftime('%Y-%m-%d'))
+        orders = dedupe_orders(orders)
+
+        fingerprints = {str(order["id"]): order_fingerprint(order) for order in orders if order.get("id") is not None}
+        known = _load_order_hashes(kbbio_engine, list(fingerprints))
+        changed = [order for order in orders if known.get(str(order.get("id"))) != fingerprints.get(str(order.get("id")))]
+        logger.info(f"{len(orders)} orders fetched, {len(changed)} new or changed.")
+
+        if changed:
+            df = normalise_orders(changed)
+            if df.empty:
+                logger.error(f"{len(changed)} changed orders normalised to no rows; high-watermark left unchanged.")
+                return
+            changed_ids = df['shiprocket_id'].dropna().astype(str).unique().tolist()
+            result = db_kbbio.replace_range(
+                table_name='shiprocket_orders',
+                key_column='shiprocket_id',
+                range_or_ids=changed_ids,
+                df=df,
+                commit=True,
+                staging=True,
+            )
+            if not result.committed:
+                logger.error("Shiprocket sync did not commit; high-watermark left unchanged.")
+                return
+
+            # Only orders that made it into shiprocket_orders are recorded as synced; any that
+            # normalise_orders dropped keep their old hash and count as changed next run.
+            stored = set(changed_ids)
+            dropped = sum(1 for order in changed if order.get("id") is not None and str(order["id"]) not in stored)
+            if dropped:
+                logger.warning(f"{dropped} changed orders were not normalised; they will be retried next run.")
+
+            db_kbbio.upsert_rows('shiprocket_order_state', [
+                {
+                    'shiprocket_id': str(order["id"]),
+                    'shiprocket_updated_at': order.get("updated_at"),
+                    'payload_hash': fingerprints[str(order["id"])],
+                    'synced_at': now,
+                }
+                for order in changed if order.get("id") is not None and str(order["id"]) in stored
+            ])
+
+        db_kbbio.upsert_rows('shiprocket_sync_state', [{
+            'job_name': SYNC_JOB_NAME,
+            'last_synced_at': now,
+            'last_reconciled_at': now if deep else state.last_reconciled_at,
+            'updated_at': now,
+        }])
+
+    except Exception:
+        logger.error("Shiprocket incremental sync failed; high-watermark left unchanged.", exc_info=True)
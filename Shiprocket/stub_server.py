@@ -0,0 +1,197 @@
+"""
+Local stand-in for the Shiprocket API, for benchmarking the order sync without the real service.
+
+Serves POST /auth/login and a paginated GET /orders from an in-memory list of synthetic
+orders. Point the client at it with SHIPROCKET_API_BASE=http://127.0.0.1:<port>, or use
+serve_stub() in-process:
+
+    with serve_stub(make_orders(5000)) as base_url:
+        ...
+
+Run standalone with: python -m Shiprocket.stub_server --orders 5000 --port 8765
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def make_orders(count: int, seed: int = 0, start: Optional[datetime] = None) -> List[Dict]:
+    """Builds `count` deterministic orders shaped like the Shiprocket orders payload."""
+    rng = random.Random(seed)
+    start = start or datetime(2025, 1, 1)
+    couriers = ["Delhivery Surface 2kg", "Xpressbees 1 kg", "Blue Dart Air", "Ekart Surface"]
+    statuses = ["DELIVERED", "SHIPPED", "RTO DELIVERED", "CANCELED", "NEW"]
+    orders = []
+    for number in range(count):
+        created = start + timedelta(minutes=rng.randint(0, 60 * 24 * 180))
+        products = [
+            {
+                "id": rng.randint(1, 10**6),
+                "name": f"Product {rng.randint(1, 300)}",
+                "channel_sku": f"SKU-{rng.randint(1, 300)}",
+                "quantity": rng.randint(1, 5),
+                "available": 1,
+                "price": round(rng.uniform(50, 2000), 2),
+                "product_cost": round(rng.uniform(40, 1800), 2),
+                "hsn": str(rng.randint(10**7, 10**8 - 1)),
+                "discount": round(rng.uniform(0, 50), 2),
+                "discount_including_tax": round(rng.uniform(0, 60), 2),
+                "selling_price": round(rng.uniform(50, 2000), 2),
+                "mrp": round(rng.uniform(60, 2500), 2),
+                "tax_percentage": rng.choice([0, 5, 12, 18]),
+                "description": "",
+            }
+            for _ in range(rng.randint(1, 3))
+        ]
+        orders.append({
+            "id": 100000000 + number,
+            "channel_order_id": f"KB{200000 + number}",
+            "created_at": created.strftime("%d %b %Y, %I:%M %p"),
+            "updated_at": (created + timedelta(days=rng.randint(0, 10))).strftime("%d %b %Y, %I:%M %p"),
+            "invoice_no": f"INV{number}",
+            "customer_name": f"Customer {rng.randint(1, 5000)}",
+            "customer_email": f"customer{number}@example.com",
+            "customer_phone": str(rng.randint(7 * 10**9, 10**10 - 1)),
+            "customer_address": f"{rng.randint(1, 999)} Main Road",
+            "customer_address_2": "",
+            "customer_city": rng.choice(["Pune", "Mumbai", "Delhi", "Bengaluru"]),
+            "customer_state": rng.choice(["Maharashtra", "Delhi", "Karnataka"]),
+            "customer_pincode": str(rng.randint(110000, 600000)),
+            "status": rng.choice(statuses),
+            "payment_method": rng.choice(["cod", "prepaid"]),
+            "total": round(sum(p["selling_price"] * p["quantity"] for p in products), 2),
+            "discount": round(rng.uniform(0, 100), 2),
+            "picked_up_date": (created + timedelta(days=1)).strftime("%d %b %Y, %I:%M %p"),
+            "etd_date": (created + timedelta(days=4)).strftime("%d-%m-%Y %H:%M:%S"),
+            "out_for_delivery_date": (created + timedelta(days=3)).strftime("%d-%m-%Y %H:%M:%S"),
+            "delivered_date": (created + timedelta(days=4)).strftime("%d-%m-%Y %H:%M:%S"),
+            "other_charges": 0,
+            "giftwrap_charges": 0,
+            "rto_risk": rng.choice(["low", "medium", "high"]),
+            "pickup_location": rng.choice(["Primary", "Warehouse 2"]),
+            "products": products,
+            "shipments": [{
+                "id": rng.randint(1, 10**8),
+                "courier": rng.choice(couriers),
+                "weight": f"{rng.uniform(0.2, 5):.2f} kg",
+                "dimensions": "10x10x10",
+                "pickedup_timestamp": (created + timedelta(days=1)).strftime("%d %b %Y, %I:%M %p"),
+                "awb": str(rng.randint(10**11, 10**12 - 1)),
+                "rto_delivered_date": "0000-00-00 00:00:00",
+                "rto_initiated_date": "0000-00-00 00:00:00",
+                "delivery_executive_name": "",
+                "product_quantity": sum(p["quantity"] for p in products),
+                "total": 0,
+            }],
+            "others": {"order_items": [], "weight": 1},
+            "awb_data": {"charges": {
+                "cod_charges": rng.choice([0, 30, 45]),
+                "applied_weight_amount": round(rng.uniform(40, 200), 2),
+                "freight_charges": round(rng.uniform(40, 200), 2),
+                "applied_weight": round(rng.uniform(0.5, 5), 2),
+                "charged_weight": round(rng.uniform(0.5, 5), 2),
+                "charged_weight_amount": round(rng.uniform(40, 200), 2),
+                "charged_weight_amount_rto": 0,
+                "applied_weight_amount_rto": 0,
+                "billing_amount": round(rng.uniform(40, 250), 2),
+            }},
+        })
+    return orders
+
+
+def _make_handler(orders: List[Dict], latency: float, rate_limit_every: int):
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: Dict, headers: Optional[Dict] = None) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if urlparse(self.path).path.endswith("/auth/login"):
+                self._send(200, {"token": "stub-token"})
+            else:
+                self._send(404, {"message": "not found"})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if not url.path.endswith("/orders"):
+                self._send(404, {"message": "not found"})
+                return
+
+            with lock:
+                counter["requests"] += 1
+                throttled = rate_limit_every and counter["requests"] % rate_limit_every == 0
+            if throttled:
+                self._send(429, {"message": "Too Many Attempts."}, {"Retry-After": "0"})
+                return
+
+            if latency:
+                time.sleep(latency)
+
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", ["15"])[0])
+            total_pages = max(1, -(-len(orders) // per_page))
+            data = orders[(page - 1) * per_page:page * per_page]
+            self._send(200, {
+                "data": data,
+                "meta": {"pagination": {
+                    "total": len(orders),
+                    "count": len(data),
+                    "per_page": per_page,
+                    "current_page": page,
+                    "total_pages": total_pages,
+                }},
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+@contextmanager
+def serve_stub(orders: List[Dict], latency: float = 0.0, rate_limit_every: int = 0, port: int = 0):
+    """Runs the stub in a background thread and yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(orders, latency, rate_limit_every))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic Shiprocket orders locally.")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds of simulated latency per page.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429.")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", args.port),
+        _make_handler(make_orders(args.orders, args.seed), args.latency, args.rate_limit_every),
+    )
+    print(f"Shiprocket stub serving {args.orders} orders on http://127.0.0.1:{args.port}")
+    server.serve_forever()
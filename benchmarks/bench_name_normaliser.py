@@ -0,0 +1,82 @@
+"""
+Benchmarks party-name standardisation on a synthetic customs column.
+
+Compares the previous per-pattern str.contains loops plus row-wise clean_to_the_order
+against NameNormaliser.normalise_series, and checks both produce identical output.
+
+    python -m benchmarks.bench_name_normaliser --rows 500000 --distinct 4000
+"""
+import re
+import time
+import random
+import argparse
+import pandas as pd
+
+from kbexports.name_normaliser import (
+    EXPORTER_PATTERNS,
+    FOREIGN_IMPORTER_PATTERNS,
+    NameNormaliser,
+    clean_to_the_order,
+)
+
+
+NAME_PARTS = ['FRESH', 'AGRO', 'FOODS', 'PRODUCE', 'TRADING', 'GLOBAL', 'IMPEX', 'FARMS', 'VEGETABLES', 'FRUITS']
+SUFFIXES = ['LTD', 'LIMITED', 'PVT LTD', 'LLC', 'GMBH', 'B.V.', 'INC', '']
+TO_ORDER_VARIANTS = ['TO ORDER', 'TO THE ORDER OF', 'Z TO OREDER', 'TO ORDER OF N A', '...', ' , ', 'to the order of ABC BANK']
+
+
+def make_names(rows: int, distinct: int, patterns: dict, seed: int = 42) -> pd.Series:
+    rng = random.Random(seed)
+    standards = [pattern.replace(r'\b', '').replace(r'\s', ' ').split('|')[0] for pattern in patterns]
+    pool = []
+    for _ in range(distinct):
+        roll = rng.random()
+        if roll < 0.3:
+            base = rng.choice(standards)
+        elif roll < 0.4:
+            base = rng.choice(TO_ORDER_VARIANTS)
+        else:
+            base = " ".join(rng.sample(NAME_PARTS, 2))
+        name = f"{base} {rng.choice(SUFFIXES)}".strip()
+        pool.append(name.lower() if rng.random() < 0.2 else name)
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return pd.Series(rng.choices(pool, weights=weights, k=rows))
+
+
+def legacy_normalise(names: pd.Series, patterns: dict) -> pd.Series:
+    df = pd.DataFrame({'name': names})
+    for pattern, standard in patterns.items():
+        df.loc[df['name'].str.contains(pattern, case=False, na=False, regex=True), 'name'] = standard
+    df.loc[df['name'].str.match(re.compile(r'^[\s\.,]*$'), na=False), 'name'] = 'TO ORDER'
+    df['name'] = df['name'].astype(str).str.strip(' \t\n\r",.*&')
+    return df['name'].apply(clean_to_the_order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--distinct", type=int, default=4_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for column, patterns in (('indian_exporter_name', EXPORTER_PATTERNS), ('foreign_importer_name', FOREIGN_IMPORTER_PATTERNS)):
+        names = make_names(args.rows, args.distinct, patterns, seed=args.seed)
+
+        start = time.perf_counter()
+        expected = legacy_normalise(names, patterns)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = NameNormaliser(patterns).normalise_series(names)
+        new_seconds = time.perf_counter() - start
+
+        assert actual.tolist() == expected.tolist(), f"{column}: outputs differ"
+        print(
+            f"{column}: {args.rows} rows, {names.nunique()} distinct | "
+            f"legacy {legacy_seconds:.2f}s | normaliser {new_seconds:.3f}s | "
+            f"{legacy_seconds / new_seconds:.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
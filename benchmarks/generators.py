@@ -0,0 +1,174 @@
+"""
+Seeded synthetic data for the benchmark suite.
+
+make_customs_frame builds raw customs rows with the same headers and the same kinds of mess
+as the export-data workbooks (mixed date formats, numbers with separators, tabs, "TO ORDER"
+consignees, country aliases); clean_custom_frame turns them into the kbe_import_export layout.
+make_shiprocket_orders builds orders payloads with nested products, shipments and others.
+The same seed always gives the same data, so timings from different runs are comparable.
+"""
+import os
+import random
+from datetime import datetime
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_name_normaliser import make_names
+from kbexports.name_normaliser import EXPORTER_PATTERNS, FOREIGN_IMPORTER_PATTERNS
+from kbexports.product_classifier import CLASSIFICATION_RULES
+from kbexports.regions import COUNTRY_ALIASES
+from Shiprocket.stub_server import make_orders
+
+
+CUSTOMS_DATE_FORMATS = ['%d-%b-%Y', '%d-%b-%y', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y']
+DATE_FORMAT_WEIGHTS = [0.80, 0.05, 0.05, 0.04, 0.04, 0.02]
+PACK_SIZES = ['', '10 KG', '4KG', '25 KG BAGS', '3.5 KGS', '12X200GMS', '6B X 500GMS X 12 PUNNET', '1 X 5 KG', '(250 CTNS)']
+MODIFIERS = ['FRESH', 'INDIAN', 'GRADE A', 'FROZEN', 'DRIED', 'ORGANIC', '']
+COUNTRIES = [
+    'United Kingdom', 'Netherlands', 'Germany', 'Saudi Arabia', 'Nepal', 'Bangladesh', 'Oman',
+    'Qatar', 'Kuwait', 'Singapore', 'Malaysia', 'France', 'Canada', 'Unknownland',
+]
+UNITS = ['KGS', 'KGS', 'KGS', 'NOS', 'MTS', 'LBS', 'QTL']
+CURRENCIES = ['USD', 'GBP', 'EUR', 'AED']
+PORTS = ['JNPT', 'MUNDRA', 'CHENNAI SEA', 'BOMBAY AIR', 'DELHI AIR']
+FOREIGN_PORTS = ['LONDON', 'ROTTERDAM', 'JEBEL ALI', 'DAMMAM', 'HAMBURG', 'FELIXSTOWE']
+CITIES = ['PUNE', 'NASHIK', 'MUMBAI', 'BENGALURU', 'AHMEDABAD']
+
+
+def _zipf_choice(rng: np.random.Generator, pool: List, size: int) -> np.ndarray:
+    # Real columns repeat a few values heavily; per-unique-value code paths depend on that.
+    weights = 1 / np.arange(1, len(pool) + 1)
+    return np.asarray(pool, dtype=object)[rng.choice(len(pool), size=size, p=weights / weights.sum())]
+
+
+def _descriptions(rng: np.random.Generator, distinct: int) -> List[str]:
+    products = [rule['label'] for rule in CLASSIFICATION_RULES] + ['MIXED SPICES', 'ASSORTED SNACKS', 'HANDICRAFT ITEMS']
+    pool = []
+    for _ in range(distinct):
+        text = f"{rng.choice(MODIFIERS)} {rng.choice(products)} {rng.choice(PACK_SIZES)}".strip()
+        pool.append(text.lower() if rng.random() < 0.2 else text)
+    return pool
+
+
+def _amounts(rng: np.random.Generator, size: int, low: float, high: float) -> np.ndarray:
+    values = np.round(rng.uniform(low, high, size), 2)
+    text = values.astype(str).astype(object)
+    # Some exports format amounts with thousands separators or a currency prefix.
+    separated = rng.random(size) < 0.1
+    text[separated] = [f"{value:,.2f}" for value in values[separated]]
+    prefixed = rng.random(size) < 0.02
+    text[prefixed] = ["Rs. " + value for value in text[prefixed]]
+    return text
+
+
+def make_customs_frame(rows: int, seed: int = 42, start: str = '2024-01-01', end: str = '2024-12-31') -> pd.DataFrame:
+    """
+    Builds raw customs rows with the headers of the export-data workbooks.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Random seed; the same seed gives the same frame.
+        start (str): First shipping date, YYYY-MM-DD.
+        end (str): Last shipping date, YYYY-MM-DD.
+
+    Returns:
+        pd.DataFrame: Unparsed text and numbers as read from a workbook.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(start, end, freq='D')
+    dates = days[rng.integers(0, len(days), rows)]
+
+    date_text = np.empty(rows, dtype=object)
+    formats = rng.choice(len(CUSTOMS_DATE_FORMATS), size=rows, p=DATE_FORMAT_WEIGHTS)
+    for number, fmt in enumerate(CUSTOMS_DATE_FORMATS):
+        mask = formats == number
+        date_text[mask] = dates[mask].strftime(fmt)
+    date_text[rng.random(rows) < 0.002] = None
+
+    hs_codes = rng.choice([7099990, 8045020, 7031010, 8011910, 7032000, 8109010, 9042110], rows)
+    quantity = rng.integers(1, 25_000, rows)
+    fob_inr = _amounts(rng, rows, 1_000, 5_000_000)
+    fob_usd = np.round(rng.uniform(10, 60_000, rows), 2)
+    countries = COUNTRIES + list(COUNTRY_ALIASES)
+    exporter_seed, importer_seed = (int(value) for value in rng.integers(0, 2**31, 2))
+
+    df = pd.DataFrame({
+        'Date': date_text,
+        'HS Code': hs_codes.astype(str),
+        'Product Description': _zipf_choice(rng, _descriptions(rng, 3_000), rows),
+        'Quantity': quantity.astype(str),
+        'Unit': rng.choice(UNITS, rows),
+        'FOB Value INR': fob_inr,
+        'Unit Price INR': np.round(rng.uniform(5, 500, rows), 2),
+        'FOB Value USD': fob_usd,
+        'FOB Value Foreign Currency': fob_usd,
+        'Unit Price Foreign Currency': np.round(rng.uniform(0.1, 8, rows), 3),
+        'Currency Name': rng.choice(CURRENCIES, rows),
+        'FOB Value In Lacs INR': np.round(rng.uniform(0.01, 50, rows), 2),
+        'IEC': rng.integers(10**9, 10**10, rows).astype(str),
+        'Indian Exporter Name': make_names(rows, 2_000, EXPORTER_PATTERNS, seed=exporter_seed).to_numpy(),
+        'Exporter Address': _zipf_choice(rng, [f"Plot {n},\tMIDC Area" for n in range(500)], rows),
+        'Exporter City': rng.choice(CITIES, rows),
+        'Pin Code': _zipf_choice(rng, [f"{n // 1000} {n % 1000:03d}" for n in range(411001, 411500)], rows),
+        'CHA Name': _zipf_choice(rng, [f"CHA AGENCY {n}" for n in range(200)], rows),
+        'Foreign Importer Name': make_names(rows, 4_000, FOREIGN_IMPORTER_PATTERNS, seed=importer_seed).to_numpy(),
+        'Importer Address': _zipf_choice(rng, [f"Unit {n}, Industrial Estate" for n in range(1_000)], rows),
+        'Foreign Port': rng.choice(FOREIGN_PORTS, rows),
+        'Foreign Country': _zipf_choice(rng, countries, rows),
+        'Indian Port': rng.choice(PORTS, rows),
+        'Item No': rng.integers(1, 30, rows),
+        'Drawback': np.round(rng.uniform(0, 5_000, rows), 2),
+        'Chapter': (hs_codes // 100_000).astype(str),
+        'HS 4 Digit': (hs_codes // 1_000).astype(str),
+        'Month': dates.strftime('%B'),
+        'Year': dates.year,
+    })
+    return df
+
+
+def write_customs_file(path: str, rows: int, seed: int = 42) -> str:
+    """
+    Writes make_customs_frame output as .csv or .xlsx, chosen by the path's extension.
+
+    Writing large workbooks with openpyxl is slow (minutes per million rows), so the suite
+    uses CSV for its default sizes and keeps .xlsx for the read-path comparison.
+    """
+    df = make_customs_frame(rows, seed=seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.lower().endswith('.csv'):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
+
+
+def make_importer_mapping(rows: int = 500, seed: int = 42) -> pd.DataFrame:
+    """Builds kbe_importer_mapping rows for importer spellings the customs generator produces."""
+    names = make_names(rows * 4, rows * 2, FOREIGN_IMPORTER_PATTERNS, seed=seed).drop_duplicates().head(rows)
+    return pd.DataFrame({
+        'original_importer_name': names.to_numpy(),
+        'standardized_importer_name': [f"{name.upper().strip()} GROUP" for name in names],
+    })
+
+
+def make_shiprocket_orders(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Builds `count` orders payloads as the orders endpoint returns them.
+
+    Starts from the stub server's orders and varies the shapes normalise_orders has to
+    handle: several products and shipments per order, and `others` given as a dict, a list
+    of dicts or missing.
+    """
+    rng = random.Random(seed)
+    orders = make_orders(count, seed=seed, start=datetime(2025, 1, 1))
+    for order in orders:
+        roll = rng.random()
+        if roll < 0.1:
+            order['others'] = [order['others'], {'order_items': [], 'weight': 2}]
+        elif roll < 0.15:
+            order.pop('others')
+        if rng.random() < 0.05:
+            extra = dict(order['shipments'][0], id=rng.randint(1, 10**8), awb=str(rng.randint(10**11, 10**12 - 1)))
+            order['shipments'].append(extra)
+    return orders
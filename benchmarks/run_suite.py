@@ -0,0 +1,233 @@
+"""
+Runs the customs and Shiprocket pipelines on seeded synthetic data and writes the timings as JSON.
+
+Each benchmark runs inside a pipeline_run, so the results carry the same per-stage breakdown
+as the production PIPELINE_RUN log lines (read, date parse, ..., normalise, insert). Rows are
+loaded into a scratch SQLite database unless --database-url points at a local MySQL.
+
+    python -m benchmarks.run_suite --sizes 10000 100000 1000000
+    python -m benchmarks.run_suite --sizes 100000 --compare benchmarks/results/<earlier run>.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import create_engine, delete
+
+import sql_connector
+from benchmarks.generators import write_customs_file, make_shiprocket_orders, make_importer_mapping
+from dbcrud import DatabaseCrud, BULK_LOAD_METHODS
+from models.kbe.kbe_models import KBEImportExport, KBEImportExportMapping
+from models.shiprocket.shiprocket_models import ShiprocketOrder
+from kbexports.kbe_processor import custom_data_processor, _prepare_for_import
+from Shiprocket.shiprocket import normalise_orders
+from utils.staging_cache import staging_cache
+from utils.instrumentation import pipeline_run
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _git_commit() -> Optional[str]:
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+    return completed.stdout.strip() or None
+
+
+def _environment() -> Dict:
+    import pyarrow
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'sqlalchemy': sqlalchemy.__version__,
+        'pyarrow': pyarrow.__version__,
+    }
+
+
+def _empty(db: DatabaseCrud, table) -> None:
+    with db.db_engine.begin() as connection:
+        connection.execute(delete(table))
+
+
+def customs_case(rows: int, seed: int, workdir: str, file_format: str) -> Callable:
+    """Writes one customs file, then returns a runner that reads, cleans and loads it."""
+    path = write_customs_file(os.path.join(workdir, f"customs_{rows}_{seed}.{file_format}"), rows, seed=seed)
+
+    def run(db: DatabaseCrud, method: str) -> int:
+        _empty(db, KBEImportExport.__table__)
+        df = _prepare_for_import(custom_data_processor(path))
+        return db.import_data('kbe_import_export', df, commit=True, method=method).rows_inserted
+
+    return run
+
+
+def shiprocket_case(rows: int, seed: int, workdir: str, file_format: str) -> Callable:
+    """Builds `rows` orders payloads, then returns a runner that normalises and loads them."""
+    orders = make_shiprocket_orders(rows, seed=seed)
+
+    def run(db: DatabaseCrud, method: str) -> int:
+        _empty(db, ShiprocketOrder.__table__)
+        df = normalise_orders(orders)
+        return db.import_data('shiprocket_orders', df, commit=True, method=method).rows_inserted
+
+    return run
+
+
+BENCHMARKS = {
+    'customs': customs_case,
+    'shiprocket': shiprocket_case,
+}
+
+
+def run_benchmark(name: str, rows: int, db: DatabaseCrud, args, workdir: str) -> Dict:
+    """
+    Runs one benchmark at one size `args.repeat` times and keeps the fastest run's stages.
+
+    Returns:
+        dict: benchmark, rows, seconds (best), every repeat's seconds, rows loaded and stages.
+    """
+    started = time.perf_counter()
+    case = BENCHMARKS[name](rows, args.seed, workdir, args.format)
+    setup_seconds = time.perf_counter() - started
+
+    runs = []
+    for _ in range(args.repeat):
+        with pipeline_run(f"bench-{name}", persist=False) as run:
+            loaded = case(db, args.method)
+        runs.append((run.seconds, loaded, run.summary()['stages']))
+
+    seconds, loaded, stages = min(runs, key=lambda item: item[0])
+    return {
+        'benchmark': name,
+        'rows': rows,
+        'rows_loaded': loaded,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else None,
+        'repeats': [round(item[0], 4) for item in runs],
+        'setup_seconds': round(setup_seconds, 3),
+        'stages': stages,
+    }
+
+
+def _timings(results: Dict) -> Dict:
+    timings = {}
+    for result in results['results']:
+        key = (result['benchmark'], result['rows'])
+        timings[key + ('total',)] = result['seconds']
+        for stage in result['stages']:
+            timings[key + (stage['stage'],)] = stage['seconds']
+    return timings
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[tuple]:
+    """
+    Prints current timings against a baseline results file.
+
+    Args:
+        baseline (dict): An earlier results file.
+        current (dict): This run's results.
+        threshold (float): Ratio above which a total counts as a regression, e.g. 1.2.
+
+    Returns:
+        list: (benchmark, rows, baseline seconds, current seconds) for each regressed total.
+    """
+    before, after = _timings(baseline), _timings(current)
+    regressions = []
+    print(f"\nCompared with {baseline.get('git_commit')} ({baseline.get('created_at')}):")
+    for key in sorted(after, key=lambda k: (k[0], k[1], k[2] != 'total')):
+        if key not in before:
+            continue
+        old, new = before[key], after[key]
+        ratio = new / old if old else float('inf')
+        label = f"{key[0]:<11} {key[1]:>9,} {key[2]}"
+        print(f"  {label:<45} {old:>9.3f}s -> {new:>9.3f}s  x{ratio:.2f}")
+        if key[2] == 'total' and ratio > threshold:
+            regressions.append((key[0], key[1], old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Rows (customs) or orders (Shiprocket) per benchmark.")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per size; the fastest is reported.")
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv", help="Customs file format to read.")
+    parser.add_argument("--method", choices=BULK_LOAD_METHODS,
+                        help="DatabaseCrud bulk-load method (default: executemany on SQLite, where multi-row INSERTs "
+                             "are the bottleneck, otherwise to_sql as in production).")
+    parser.add_argument("--database-url", help="SQLAlchemy URL of the sink (default: a scratch SQLite file).")
+    parser.add_argument("--staging-cache", action="store_true", help="Let repeats read workbooks from the Parquet staging cache.")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>-<commit>.json).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier results file to compare against.")
+    parser.add_argument("--fail-over", type=float, default=None, metavar="RATIO",
+                        help="With --compare, exit 1 if a total is slower than the baseline by more than RATIO.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="kbe_bench_") as workdir:
+        staging_cache.enabled = args.staging_cache
+        staging_cache.directory = os.path.join(workdir, "staging")
+
+        engine = create_engine(args.database_url or f"sqlite:///{os.path.join(workdir, 'sink.db')}")
+        sink = SimpleNamespace(engine=engine)
+        # Anything the pipelines look up through get_connector (e.g. the importer mapping)
+        # resolves to the sink too, so a benchmark never reaches a configured database.
+        sql_connector._connectors.update(kbe=sink, kbbio=sink)
+        for table in (KBEImportExport, KBEImportExportMapping, ShiprocketOrder):
+            table.__table__.create(bind=engine, checkfirst=True)
+        db = DatabaseCrud(sink)
+        args.method = args.method or ('executemany' if engine.dialect.name == 'sqlite' else 'to_sql')
+        _empty(db, KBEImportExportMapping.__table__)
+        make_importer_mapping(seed=args.seed).to_sql(KBEImportExportMapping.__tablename__, engine, if_exists='append', index=False)
+
+        results = []
+        for rows in args.sizes:
+            for name in args.benchmarks:
+                result = run_benchmark(name, rows, db, args, workdir)
+                results.append(result)
+                print(f"{name:<11} {rows:>9,} rows  {result['seconds']:>9.3f}s  {result['rows_per_sec'] or 0:>12,.0f} rows/s")
+        engine.dispose()
+
+    current = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'seed': args.seed,
+        'format': args.format,
+        'method': args.method,
+        'database': engine.dialect.name,
+        'environment': _environment(),
+        'results': results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{current['git_commit'] or 'nogit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(current, handle, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), current, args.fail_over or float('inf'))
+        if args.fail_over is not None and regressions:
+            for name, rows, old, new in regressions:
+                print(f"REGRESSION {name} at {rows:,} rows: {old:.3f}s -> {new:.3f}s")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
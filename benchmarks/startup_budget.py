@@ -0,0 +1,78 @@
+"""
+Checks that `import main` stays within a startup budget, using python -X importtime.
+
+The CLI only imports a job's dependencies once its subcommand runs, so importing main (and
+running --help) must not pull in pandas, SQLAlchemy, xlwings or the job modules. The test
+suite enforces the same budget (tests/test_startup.py); this script prints the numbers.
+
+    python -m benchmarks.startup_budget --budget-ms 100
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET_MS = 100.0
+FORBIDDEN_MODULES = ('pandas', 'numpy', 'sqlalchemy', 'xlwings', 'pycountry_convert', 'requests', 'dbcrud', 'kbexports', 'Shiprocket')
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def import_profile(module: str = "main"):
+    """Returns ({module: cumulative microseconds} for top-level imports, set of all imported modules)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+
+    cumulative, imported = {}, set()
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        imported.add(name)
+        if len(match.group(3)) == 1:
+            cumulative[name] = int(match.group(2))
+    return cumulative, imported
+
+
+def help_wall_time(runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", "--help"], cwd=REPO_ROOT, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def lazy_import_violations(imported) -> list:
+    """Modules from FORBIDDEN_MODULES (or their submodules) among `imported`, sorted."""
+    return sorted(name for name in imported if name.split(".")[0] in FORBIDDEN_MODULES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS, help="Maximum cumulative import time of main.")
+    args = parser.parse_args()
+
+    cumulative, imported = import_profile()
+    main_ms = cumulative.get("main", 0) / 1000
+    heavy = lazy_import_violations(imported)
+
+    print(f"import main: {main_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"main.py --help: {help_wall_time() * 1000:.0f} ms wall, including interpreter start")
+    if heavy:
+        print(f"modules that should load lazily: {', '.join(heavy)}")
+
+    if main_ms > args.budget_ms or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,97 @@
+import os
+import time
+import uuid
+from itertools import chain
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
 import pandas as pd
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy import insert, delete, and_, func, cast, select, Numeric, Table, text, MetaData, desc
+from sqlalchemy import insert, delete, and_, func, cast, select, Numeric, Table, text, MetaData, desc, Column, inspect, String, type_coerce
 from sqlalchemy.exc import SQLAlchemyError
-from models.kbe.kbe_models import KBEImportExport
-from models.shiprocket.shiprocket_models import ShiprocketOrder
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models.kbe.kbe_models import KBEImportExport, KBEIngestManifest, KBEBackfillCheckpoint, KBEMonthlySummary
+from models.shiprocket.shiprocket_models import ShiprocketOrder, ShiprocketSyncState, ShiprocketOrderState
 from logging_config import logger
+from utils.instrumentation import stage
 
 tables = {
     'kbe_import_export':KBEImportExport,
+    'kbe_ingest_manifest':KBEIngestManifest,
+    'kbe_backfill_checkpoint':KBEBackfillCheckpoint,
+    'kbe_monthly_summary':KBEMonthlySummary,
     "shiprocket_orders":ShiprocketOrder,
+    "shiprocket_sync_state":ShiprocketSyncState,
+    "shiprocket_order_state":ShiprocketOrderState,
 }
 
+BULK_LOAD_METHODS = ('to_sql', 'load_data', 'executemany')
+DELETE_BATCH_SIZE = 1000
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a DatabaseCrud.import_data call."""
+    table_name: str
+    method: str = 'to_sql'
+    rows_inserted: int = 0
+    chunks: int = 0
+    elapsed: float = 0.0
+    committed: bool = False
+    rows_deleted: int = 0
+    key_range: Optional[tuple] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_inserted / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        state = "committed" if self.committed else "not committed"
+        deleted = f"Deleted {self.rows_deleted} rows, i" if self.rows_deleted else "I"
+        return (
+            f"{deleted}mported {self.rows_inserted} rows into {self.table_name} via '{self.method}' "
+            f"in {self.chunks} chunks, {self.elapsed:.2f}s ({self.rows_per_sec:.0f} rows/s), {state}."
+        )
+
+
+def _batched(values: list, size: int) -> list:
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def _frame_records(df: pd.DataFrame) -> list:
+    """Converts a DataFrame into driver-friendly tuples, mapping NaN/NaT to None."""
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            values = series.to_numpy(dtype='datetime64[us]').astype(object)
+        else:
+            values = series.astype(object).to_numpy()
+        values[pd.isna(series).to_numpy()] = None
+        columns.append(values)
+    return list(zip(*columns))
+
+
+def _infile_column(series: pd.Series) -> pd.Series:
+    """Renders a column as LOAD DATA text: backslash-escaped, with \\N for NULL."""
+    missing = series.isna()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.dt.strftime('%Y-%m-%d %H:%M:%S')
+    elif pd.api.types.is_bool_dtype(series):
+        values = series.astype(int).astype(str)
+    elif pd.api.types.is_numeric_dtype(series):
+        values = series.astype(str)
+    else:
+        values = (
+            series.astype(str)
+            .str.replace('\\', '\\\\', regex=False)
+            .str.replace('\t', '\\t', regex=False)
+            .str.replace('\n', '\\n', regex=False)
+            .str.replace('\r', '\\r', regex=False)
+        )
+    return values.where(~missing, r'\N')
+
 
 class DatabaseCrud:
     def __init__(self, db_connector) -> None:
@@ -81,32 +162,370 @@ class DatabaseCrud:
 
         return row_count
 
-    def import_data(self, table_name, df: pd.DataFrame, commit):
-        if df is not None:
-            row_count_before = self.get_row_count(table_name)
-            row_count_after = None
-            
-            try:
-                with self.db_engine.connect() as connection:
-                    df.to_sql(table_name, self.db_connector.engine, if_exists='append', index=False, method='multi', chunksize=500)
-                    row_count_after = self.get_row_count(table_name)
+    def import_data(self, table_name, df: pd.DataFrame, commit, method: str = 'to_sql', batch_size: int = 500) -> ImportResult:
+        """
+        Appends a DataFrame to the specified table using the selected bulk-load engine.
+
+        Rows inserted are summed from the rowcounts the insert statements report,
+        so no COUNT(*) is run against the target table.
+
+        Args:
+            table_name (str): The name of the table to insert into.
+            df (pd.DataFrame): Rows to insert; columns must match the table columns.
+            commit (bool): Whether to commit the transaction.
+            method (str): One of BULK_LOAD_METHODS. 'to_sql' (default) uses pandas multi-row
+                INSERTs, 'load_data' streams the frame to a temporary TSV and issues
+                LOAD DATA LOCAL INFILE (MySQL only; the connector needs DB_LOCAL_INFILE=true,
+                see sql_connector.local_infile), 'executemany' sends prepared INSERTs
+                through the driver in batches.
+            batch_size (int): Rows per INSERT batch (or per TSV write for 'load_data').
+
+        Returns:
+            ImportResult: Rows inserted, chunks, elapsed time and whether the load was committed.
+        """
+        result = ImportResult(table_name=table_name, method=method)
+
+        if df is None or df.empty:
+            logger.info(f"Empty Dataframe hence 0 rows imported in {table_name}")
+            return result
+
+        if method not in BULK_LOAD_METHODS:
+            logger.error(f"Unknown bulk load method '{method}'. Expected one of {BULK_LOAD_METHODS}.")
+            return result
+
+        started = time.perf_counter()
+        try:
+            with self.db_engine.connect() as connection:
+                transaction = connection.begin()
+                try:
+                    with stage('insert', rows_in=len(df)) as record:
+                        result.rows_inserted, result.chunks = self.bulk_load(
+                            connection, table_name, df, method=method, batch_size=batch_size
+                        )
+                        record.rows_out = result.rows_inserted
                     if commit:
-                        connection.commit()
-            except SQLAlchemyError as e:
-                print(f"Error inserting data into {table_name}: {e}")
-                if row_count_after is not None:
-                    connection.rollback()
-                    print(f"Rolling back changes in {table_name} due to import error.")
-            except Exception as e:
-                print(f"Unknown error occurred: {e}")
+                        transaction.commit()
+                        result.committed = True
+                    else:
+                        transaction.rollback()
+                except Exception:
+                    transaction.rollback()
+                    logger.error(f"Rolling back changes in {table_name} due to import error.")
+                    raise
+        except SQLAlchemyError as e:
+            logger.error(f"Error inserting data into {table_name}: {e}")
+        except Exception as e:
+            logger.error(f"Unknown error occurred: {e}")
+        result.elapsed = time.perf_counter() - started
 
-            if (row_count_before is not None) and (row_count_after is not None):
-                rows_inserted = row_count_after - row_count_before
-                print(f"Data imported into {table_name}. {rows_inserted} rows inserted.")
-            else:
-                print("Failed to determine rows inserted.")
-        else:
-            print(f"Empty Dataframe hence 0 rows imported in {table_name}")
+        logger.info(result.summary())
+        return result
+
+    def bulk_load(self, connection, table_name: str, df: pd.DataFrame, method: str = 'to_sql', batch_size: int = 500) -> tuple:
+        """
+        Inserts a DataFrame on an open connection without committing.
+
+        The caller owns the transaction, so the load can be combined with other
+        statements on the same connection.
+
+        Args:
+            connection (sqlalchemy.engine.Connection): Connection with an active transaction.
+            table_name (str): The name of the table to insert into.
+            df (pd.DataFrame): Rows to insert.
+            method (str): One of BULK_LOAD_METHODS.
+            batch_size (int): Rows per batch.
+
+        Returns:
+            tuple: (rows inserted as reported by the driver, number of chunks sent).
+        """
+        loader = getattr(self, f"_load_{method}")
+        return loader(connection, table_name, df, batch_size)
+
+    def _load_to_sql(self, connection, table_name: str, df: pd.DataFrame, batch_size: int) -> tuple:
+        rows = df.to_sql(table_name, connection, if_exists='append', index=False, method='multi', chunksize=batch_size)
+        chunks = -(-len(df) // batch_size)
+        # pandas returns None when the driver does not report rowcounts
+        return (len(df) if rows is None else rows), chunks
+
+    def _load_executemany(self, connection, table_name: str, df: pd.DataFrame, batch_size: int) -> tuple:
+        if df.empty:
+            return 0, 0
+
+        preparer = connection.dialect.identifier_preparer
+        placeholder = '?' if connection.dialect.paramstyle == 'qmark' else '%s'
+        columns = ", ".join(preparer.quote(str(col)) for col in df.columns)
+        values = ", ".join([placeholder] * len(df.columns))
+        insert_sql = f"INSERT INTO {preparer.quote(table_name)} ({columns}) VALUES ({values})"
+
+        records = _frame_records(df)
+        rows, chunks = 0, 0
+        for start in range(0, len(records), batch_size):
+            result = connection.exec_driver_sql(insert_sql, records[start:start + batch_size])
+            rows += max(result.rowcount, 0)
+            chunks += 1
+        return rows, chunks
+
+    def _load_load_data(self, connection, table_name: str, df: pd.DataFrame, batch_size: int) -> tuple:
+        if df.empty:
+            return 0, 0
+
+        if connection.dialect.name != 'mysql':
+            logger.warning(f"LOAD DATA is MySQL only; falling back to executemany for '{table_name}'.")
+            return self._load_executemany(connection, table_name, df, batch_size)
+
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(str(col)) for col in df.columns)
+
+        tmp = tempfile.NamedTemporaryFile(mode='w', suffix='.tsv', encoding='utf-8', newline='', delete=False)
+        try:
+            with tmp:
+                for start in range(0, len(df), batch_size):
+                    chunk = df.iloc[start:start + batch_size]
+                    fields = [_infile_column(chunk[col]) for col in chunk.columns]
+                    lines = fields[0].str.cat(fields[1:], sep='\t') if len(fields) > 1 else fields[0]
+                    tmp.write('\n'.join(lines))
+                    tmp.write('\n')
+
+            infile_path = tmp.name.replace('\\', '/')
+            load_sql = (
+                f"LOAD DATA LOCAL INFILE '{infile_path}' INTO TABLE {preparer.quote(table_name)} "
+                r"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+                f"({columns})"
+            )
+            result = connection.exec_driver_sql(load_sql)
+            return result.rowcount, 1
+        finally:
+            os.remove(tmp.name)
+
+    def replace_range(
+        self,
+        table_name: str,
+        key_column: str,
+        range_or_ids,
+        df,
+        commit: bool = True,
+        method: str = 'to_sql',
+        batch_size: int = 500,
+        staging: bool = False,
+    ) -> ImportResult:
+        """
+        Atomically replaces a window of rows: deletes the window and inserts the DataFrame
+        in one transaction on one connection, so a failed load leaves the old rows in place.
+
+        With staging=True the frame is first bulk-loaded into a scratch copy of the table
+        (outside the main table's transaction), then the delete and an INSERT ... SELECT from
+        the staging table run as one short transaction. Readers never see a half-loaded window
+        and the main table is only locked for the final swap.
+
+        `df` may also be an iterable of DataFrames (e.g. chunks of a large file), which are
+        loaded one at a time so memory stays bounded by the chunk size. With staging=True and
+        range_or_ids=None the window is taken as the MIN/MAX of key_column over the staged rows.
+
+        Args:
+            table_name (str): The name of the table to replace rows in.
+            key_column (str): Column the window is defined on, e.g. 'date' or 'shiprocket_id'.
+            range_or_ids (tuple | list | None): A (start, end) tuple for an inclusive BETWEEN, or
+                a list of key values for an IN delete. Empty skips the delete; None derives the
+                range from the staged data (staging=True only).
+            df (pd.DataFrame | Iterable[pd.DataFrame]): Replacement rows.
+            commit (bool): Whether to commit the transaction.
+            method (str): One of BULK_LOAD_METHODS.
+            batch_size (int): Rows per batch.
+            staging (bool): Load through a staging table before swapping rows in.
+
+        Returns:
+            ImportResult: Rows deleted and inserted, elapsed time and commit state.
+        """
+        result = ImportResult(table_name=table_name, method=method)
+
+        table_class = tables.get(table_name)
+        if not table_class:
+            logger.error(f"Table '{table_name}' not found in table mapping. Replace failed to execute.")
+            return result
+
+        if method not in BULK_LOAD_METHODS:
+            logger.error(f"Unknown bulk load method '{method}'. Expected one of {BULK_LOAD_METHODS}.")
+            return result
+
+        if range_or_ids is None and not staging:
+            logger.error("replace_range needs an explicit range unless staging=True derives it from the data.")
+            return result
+
+        frames = [df] if df is None or isinstance(df, pd.DataFrame) else df
+        frames = (frame for frame in frames if frame is not None and not frame.empty)
+
+        table = table_class.__table__
+        staging_table = None
+        started = time.perf_counter()
+        try:
+            with self.db_engine.connect() as connection:
+                try:
+                    if staging:
+                        first = next(frames, None)
+                        if first is not None:
+                            staging_table = self._create_staging_table(connection, table, first.columns)
+                            for frame in chain([first], frames):
+                                with stage('stage load', rows_in=len(frame)) as record, connection.begin():
+                                    record.rows_out, _ = self.bulk_load(connection, staging_table.name, frame, method=method, batch_size=batch_size)
+                                result.chunks += 1
+                            if range_or_ids is None:
+                                range_or_ids = self._staged_range(connection, staging_table, key_column)
+
+                    if isinstance(range_or_ids, tuple):
+                        result.key_range = range_or_ids
+
+                    transaction = connection.begin()
+                    try:
+                        with stage('delete') as record:
+                            result.rows_deleted = record.rows_out = self._delete_window(connection, table, key_column, range_or_ids)
+
+                        if staging_table is not None:
+                            with stage('insert') as record:
+                                columns = [table.c[col] for col in staging_table.c.keys()]
+                                insert_query = insert(table).from_select(columns, select(*staging_table.c))
+                                result.rows_inserted = record.rows_out = connection.execute(insert_query).rowcount
+                        else:
+                            for frame in frames:
+                                with stage('insert', rows_in=len(frame)) as record:
+                                    rows, chunks = self.bulk_load(connection, table_name, frame, method=method, batch_size=batch_size)
+                                    record.rows_out = rows
+                                result.rows_inserted += rows
+                                result.chunks += chunks
+
+                        if commit:
+                            with stage('commit'):
+                                transaction.commit()
+                            result.committed = True
+                        else:
+                            transaction.rollback()
+                    except Exception:
+                        transaction.rollback()
+                        logger.error(f"Rolling back replace on {table_name}; existing rows kept.")
+                        raise
+                finally:
+                    if staging_table is not None:
+                        with connection.begin():
+                            staging_table.drop(connection, checkfirst=True)
+        except SQLAlchemyError as e:
+            logger.error(f"Error replacing rows in {table_name}: {e}")
+        except Exception as e:
+            logger.error(f"Unknown error occurred: {e}")
+        result.elapsed = time.perf_counter() - started
+
+        logger.info(result.summary())
+        return result
+
+    def _staged_range(self, connection, staging_table: Table, key_column: str):
+        column = staging_table.c[key_column]
+        with connection.begin():
+            # Returned as stored by the driver; SQLite keeps DATE values as text.
+            start, end = connection.execute(
+                select(type_coerce(func.min(column), String), type_coerce(func.max(column), String))
+            ).one()
+        if start is None:
+            return None
+        logger.info(f"Staged rows span {key_column} {start} to {end}.")
+        return (start, end)
+
+    def _delete_window(self, connection, table: Table, key_column: str, range_or_ids) -> int:
+        if range_or_ids is None or len(range_or_ids) == 0:
+            return 0
+
+        column = table.c[key_column]
+        if isinstance(range_or_ids, tuple) and len(range_or_ids) == 2:
+            start, end = range_or_ids
+            if start > end:
+                raise ValueError(f"Range start '{start}' should be less than or equal to end '{end}'.")
+            condition = column.between(start, end)
+            return connection.execute(delete(table).where(condition)).rowcount
+
+        # Large id lists are deleted in bounded IN batches, each binding at most DELETE_BATCH_SIZE
+        # parameters so statements stay well under max_allowed_packet. All batches share the
+        # caller's transaction, so the window is still replaced atomically; callers replacing
+        # long id lists should pass staging=True so the load is not inside that transaction too,
+        # or use delete_in_batches when a short transaction per batch matters more than atomicity.
+        batches = _batched(list(dict.fromkeys(range_or_ids)), DELETE_BATCH_SIZE)
+        deleted_count = 0
+        for number, batch in enumerate(batches, start=1):
+            batch_started = time.perf_counter()
+            rowcount = connection.execute(delete(table).where(column.in_(batch))).rowcount
+            deleted_count += rowcount
+            logger.info(
+                f"Delete batch {number}/{len(batches)} on '{table.name}': {rowcount} rows "
+                f"for {len(batch)} keys in {time.perf_counter() - batch_started:.2f}s."
+            )
+        return deleted_count
+
+    def _create_staging_table(self, connection, table: Table, columns) -> Table:
+        # Plain columns only: no keys or indexes, so loading into it is as cheap as possible.
+        # The name is unique per run so concurrent imports into the same table never share one;
+        # replace_range drops it when done.
+        staging_table = Table(
+            f"{table.name}_staging_{uuid.uuid4().hex[:12]}",
+            MetaData(),
+            *(Column(col.name, col.type) for col in table.columns if col.name in set(columns)),
+        )
+        with connection.begin():
+            staging_table.create(connection)
+        return staging_table
+
+    def upsert_rows(self, table_name: str, rows: list, commit: bool = True, batch_size: int = 500) -> int:
+        """
+        Inserts rows, updating the non-key columns of rows whose primary key already exists.
+
+        Uses INSERT ... ON DUPLICATE KEY UPDATE on MySQL (ON CONFLICT DO UPDATE on SQLite).
+
+        Args:
+            table_name (str): The name of the table to upsert into.
+            rows (list): Dicts keyed by column name; all rows must share the same keys.
+            commit (bool): Whether to commit the transaction.
+            batch_size (int): Rows per statement.
+
+        Returns:
+            int: Rowcount reported by the driver (MySQL counts an updated row as 2).
+        """
+        table_class = tables.get(table_name)
+        if not table_class:
+            logger.error(f"Table '{table_name}' not found in table mapping. Upsert failed to execute.")
+            return 0
+        if not rows:
+            return 0
+
+        table = table_class.__table__
+        key_columns = [col.name for col in table.primary_key.columns]
+        update_columns = [col for col in rows[0] if col not in key_columns]
+        affected = 0
+
+        try:
+            with self.db_engine.connect() as connection:
+                transaction = connection.begin()
+                try:
+                    for batch in _batched(rows, batch_size):
+                        if connection.dialect.name == 'mysql':
+                            statement = mysql_insert(table).values(batch)
+                            statement = statement.on_duplicate_key_update(
+                                {col: statement.inserted[col] for col in update_columns}
+                            )
+                        else:
+                            statement = sqlite_insert(table).values(batch)
+                            statement = statement.on_conflict_do_update(
+                                index_elements=key_columns,
+                                set_={col: statement.excluded[col] for col in update_columns},
+                            )
+                        affected += connection.execute(statement).rowcount
+                    if commit:
+                        transaction.commit()
+                    else:
+                        transaction.rollback()
+                except SQLAlchemyError as e:
+                    transaction.rollback()
+                    logger.error(f"Error occurred during upsert into '{table_name}': {e}")
+                    return 0
+        except SQLAlchemyError as e:
+            logger.error(f"Connection error: {e}")
+            return 0
+
+        return affected
 
     def truncate_table(self, table_name: str, commit: bool) -> None:
         """
@@ -149,30 +568,184 @@ class DatabaseCrud:
         else:
             print(f"Table '{table_name}' not found in table_mapping.")
 
-    def delete_shiprocket_id_wise(self, shiprocket_id:list, commit: bool):
-            # Try to parse the delete_date with the expected format
-            shiprocket_id_condition = ShiprocketOrder.shiprocket_id.in_(shiprocket_id) 
-            delete_query = delete(ShiprocketOrder).where(shiprocket_id_condition)
+    def create_missing_indexes(self, metadata: MetaData, dry_run: bool = False) -> list:
+        """
+        Adds indexes declared on the models that are missing from existing tables.
 
-            try:
-                with self.db_engine.connect() as connection:
+        metadata.create_all only creates new tables, so indexes added to a model later never
+        reach production. This compares each declared index with the live table (by name and
+        by column list) and creates only what is missing; running it again is a no-op. On MySQL
+        the index is built online with ALGORITHM=INPLACE, LOCK=NONE.
+
+        Args:
+            metadata (MetaData): Model metadata, e.g. KBEBase.metadata.
+            dry_run (bool): Only log the indexes that would be created.
+
+        Returns:
+            list: Names of the indexes created (or that would be created on a dry run).
+        """
+        missing = []
+        with self.db_engine.connect() as connection:
+            inspector = inspect(connection)
+            existing_tables = set(inspector.get_table_names())
+
+            for table in metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    logger.info(f"Table '{table.name}' does not exist yet; create_all will build it with its indexes.")
+                    continue
+
+                live_indexes = inspector.get_indexes(table.name)
+                live_names = {index['name'] for index in live_indexes}
+                live_columns = {tuple(index['column_names']) for index in live_indexes}
+
+                for index in sorted(table.indexes, key=lambda ix: ix.name):
+                    columns = tuple(col.name for col in index.columns)
+                    if index.name not in live_names and columns not in live_columns:
+                        missing.append((table, index, columns))
+
+        # The inspection connection is closed first so it holds no metadata locks during the ALTERs.
+        created = []
+        for table, index, columns in missing:
+            created.append(index.name)
+            if dry_run:
+                logger.info(f"[DRY RUN] Would create index {index.name} on {table.name} {columns}.")
+                continue
+
+            started = time.perf_counter()
+            with self.db_engine.begin() as connection:
+                if connection.dialect.name == 'mysql':
+                    preparer = connection.dialect.identifier_preparer
+                    column_list = ", ".join(preparer.quote(col) for col in columns)
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {preparer.quote(table.name)} "
+                        f"ADD INDEX {preparer.quote(index.name)} ({column_list}), "
+                        f"ALGORITHM=INPLACE, LOCK=NONE"
+                    )
+                else:
+                    index.create(connection)
+            logger.info(f"Created index {index.name} on {table.name} in {time.perf_counter() - started:.2f}s.")
+
+        if not created:
+            logger.info("All declared indexes already exist.")
+        return created
+
+    def create_missing_columns(self, metadata: MetaData, dry_run: bool = False) -> list:
+        """
+        Adds nullable model columns that are missing from existing tables.
+
+        metadata.create_all never alters an existing table, so a nullable column added to a
+        model later is added here with ALTER TABLE ... ADD COLUMN; running it again is a no-op.
+        Non-nullable columns are only reported, since existing rows would need a value.
+
+        Args:
+            metadata (MetaData): Model metadata, e.g. KBEBase.metadata.
+            dry_run (bool): Only log the columns that would be added.
+
+        Returns:
+            list: 'table.column' names added (or that would be added on a dry run).
+        """
+        missing = []
+        with self.db_engine.connect() as connection:
+            inspector = inspect(connection)
+            existing_tables = set(inspector.get_table_names())
+
+            for table in metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+                live_columns = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name in live_columns:
+                        continue
+                    if not column.nullable:
+                        logger.warning(f"Column {table.name}.{column.name} is missing and NOT NULL; add it by hand.")
+                        continue
+                    missing.append((table, column))
+
+        added = []
+        for table, column in missing:
+            added.append(f"{table.name}.{column.name}")
+            if dry_run:
+                logger.info(f"[DRY RUN] Would add column {column.name} {column.type} to {table.name}.")
+                continue
+
+            with self.db_engine.begin() as connection:
+                preparer = connection.dialect.identifier_preparer
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {preparer.quote(table.name)} "
+                    f"ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=connection.dialect)} NULL"
+                )
+            logger.info(f"Added column {column.name} to {table.name}.")
+
+        if not added:
+            logger.info("All declared columns already exist.")
+        return added
+
+    def delete_shiprocket_id_wise(self, shiprocket_id: list, commit: bool, batch_size: int = DELETE_BATCH_SIZE) -> int:
+        """
+        Deletes Shiprocket order rows for the given ids in bounded batches.
+
+        Args:
+            shiprocket_id (list): Shiprocket order ids to delete.
+            commit (bool): Whether to commit each batch.
+            batch_size (int): Ids per DELETE statement.
+
+        Returns:
+            int: Total rows deleted.
+        """
+        return self.delete_in_batches('shiprocket_orders', 'shiprocket_id', shiprocket_id, commit=commit, batch_size=batch_size)
+
+    def delete_in_batches(self, table_name: str, key_column: str, keys: list, commit: bool, batch_size: int = DELETE_BATCH_SIZE) -> int:
+        """
+        Deletes rows whose key is in `keys`, one short transaction per batch.
+
+        Each batch binds at most `batch_size` parameters, which keeps row locks brief and
+        statements well under max_allowed_packet however long the id list grows.
+
+        Args:
+            table_name (str): The name of the table to delete from.
+            key_column (str): Column matched against `keys`.
+            keys (list): Key values to delete; duplicates are ignored.
+            commit (bool): Whether to commit each batch.
+            batch_size (int): Keys per DELETE statement.
+
+        Returns:
+            int: Total rows deleted.
+        """
+        table_class = tables.get(table_name)
+        if not table_class:
+            logger.error(f"Table '{table_name}' not found in table mapping. Delete query failed to execute.")
+            return 0
+
+        column = table_class.__table__.c[key_column]
+        batches = _batched(list(dict.fromkeys(keys)), batch_size)
+        deleted_count = 0
+        started = time.perf_counter()
+
+        try:
+            with self.db_engine.connect() as connection:
+                for number, batch in enumerate(batches, start=1):
+                    batch_started = time.perf_counter()
                     transaction = connection.begin()
                     try:
-                        result = connection.execute(delete_query)
-                        deleted_count = result.rowcount
-                        logger.info(f"Deleted {deleted_count} rows from Shiprocket Orders.")
-
+                        result = connection.execute(delete(table_class).where(column.in_(batch)))
                         if commit:
                             transaction.commit()
-                            logger.info("Transaction committed.")
                         else:
                             transaction.rollback()
-                            logger.info("Transaction not committed.")
                     except SQLAlchemyError as e:
                         transaction.rollback()
-                        logger.error(f"Error occurred during deletion: {e}")
-            except SQLAlchemyError as e:
-                logger.error(f"Connection error: {e}")
-        
-
+                        logger.error(f"Error occurred during deletion of batch {number}/{len(batches)}: {e}")
+                        break
+                    deleted_count += result.rowcount
+                    logger.info(
+                        f"Delete batch {number}/{len(batches)} on '{table_name}': {result.rowcount} rows "
+                        f"for {len(batch)} keys in {time.perf_counter() - batch_started:.2f}s."
+                    )
+        except SQLAlchemyError as e:
+            logger.error(f"Connection error: {e}")
 
+        state = "committed" if commit else "not committed"
+        logger.info(
+            f"Deleted {deleted_count} rows from '{table_name}' in {time.perf_counter() - started:.2f}s ({state})."
+        )
+        return deleted_count
@@ -0,0 +1,82 @@
+import threading
+from typing import Dict, Optional, Tuple
+import pandas as pd
+from sqlalchemy import select, func
+from models.kbe.kbe_models import KBEImportExportMapping
+from sql_connector import get_connector
+from kbexports.name_normaliser import foreign_importer_normaliser
+from logging_config import logger
+
+
+class ImporterMapping:
+    """
+    In-memory index of kbe_importer_mapping (original -> standardized importer name).
+
+    Original names are keyed through the same NameNormaliser the ingest path applies to
+    foreign_importer_name, so a raw spelling in the mapping sheet matches the cleaned column.
+    The table is reloaded only when its fingerprint (row count, max id) changes, which covers
+    appended and re-imported mapping sheets; call invalidate() after editing rows in place.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._fingerprint: Optional[Tuple] = None
+        self._index: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _current_fingerprint(self) -> Tuple:
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(func.count(), func.max(KBEImportExportMapping.id))
+            ).one()
+        return tuple(row)
+
+    def refresh(self) -> Dict[str, str]:
+        with self._lock:
+            fingerprint = self._current_fingerprint()
+            if fingerprint == self._fingerprint:
+                return self._index
+
+            with self.engine.connect() as connection:
+                mapping = pd.DataFrame(connection.execute(
+                    select(
+                        KBEImportExportMapping.original_importer_name,
+                        KBEImportExportMapping.standardized_importer_name,
+                    ).order_by(KBEImportExportMapping.id)
+                ).fetchall(), columns=['original', 'standardized'])
+
+            mapping = mapping.dropna()
+            mapping = mapping[mapping['standardized'].str.strip() != '']
+            mapping['original'] = foreign_importer_normaliser.normalise_series(mapping['original'])
+            # Later rows win, matching a re-imported sheet overriding an older one.
+            self._index = dict(zip(mapping['original'], mapping['standardized']))
+            self._fingerprint = fingerprint
+            logger.info(f"Loaded {len(self._index)} importer mappings.")
+            return self._index
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._fingerprint = None
+
+    def apply(self, names: pd.Series) -> pd.Series:
+        """
+        Args:
+            names (pd.Series): Normalised foreign_importer_name values.
+
+        Returns:
+            pd.Series: Names with mapped entries replaced by their standardized name.
+        """
+        index = self.refresh()
+        if not index or names.empty:
+            return names
+        return names.map(index).fillna(names)
+
+
+_mapping: Optional[ImporterMapping] = None
+
+
+def get_importer_mapping() -> ImporterMapping:
+    global _mapping
+    if _mapping is None:
+        _mapping = ImporterMapping(get_connector('kbe').engine)
+    return _mapping
@@ -0,0 +1,178 @@
+import os
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from models.kbe.kbe_models import KBEIngestManifest
+from dbcrud import DatabaseCrud, DELETE_BATCH_SIZE
+from utils.common_utils import file_sha256
+from logging_config import logger
+
+
+@dataclass
+class FileFingerprint:
+    """Size, mtime in nanoseconds and (lazily) content hash of a source file."""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+
+    def ensure_hash(self) -> str:
+        if self.content_hash is None:
+            self.content_hash = file_sha256(self.path)
+        return self.content_hash
+
+
+def manifest_key(file_path: str) -> str:
+    return os.path.abspath(file_path)
+
+
+def fingerprint_file(file_path: str) -> FileFingerprint:
+    stat = os.stat(file_path)
+    return FileFingerprint(path=file_path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def load_manifest(db_kbe: DatabaseCrud, files: List[str]) -> Dict[str, KBEIngestManifest]:
+    keys = [manifest_key(file) for file in files]
+    entries = {}
+    with db_kbe.db_engine.connect() as connection:
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            rows = connection.execute(
+                select(KBEIngestManifest).where(KBEIngestManifest.file_path.in_(keys[start:start + DELETE_BATCH_SIZE]))
+            )
+            entries.update({row.file_path: row for row in rows})
+    return entries
+
+
+def partition_unchanged(
+    db_kbe: DatabaseCrud, files: List[str], force: bool = False
+) -> Tuple[List[FileFingerprint], List[str]]:
+    """
+    Splits files into those that need importing and those unchanged since their last import.
+
+    A file whose size and mtime match its manifest entry is skipped on a stat call alone.
+    If only the mtime moved (copied or touched), the content hash decides, and the new mtime
+    is recorded so the next run is back to the stat-only check.
+
+    Returns:
+        tuple: (fingerprints of files to import, paths of skipped files)
+    """
+    manifest = {} if force else load_manifest(db_kbe, files)
+    to_import, skipped, touched = [], [], []
+
+    for file in files:
+        fingerprint = fingerprint_file(file)
+        entry = manifest.get(manifest_key(file))
+
+        if entry is not None and entry.file_size == fingerprint.size:
+            if entry.file_mtime_ns == fingerprint.mtime_ns:
+                skipped.append(file)
+                continue
+            if entry.content_hash == fingerprint.ensure_hash():
+                skipped.append(file)
+                touched.append({'file_path': entry.file_path, 'file_mtime_ns': fingerprint.mtime_ns})
+                continue
+
+        to_import.append(fingerprint)
+
+    for row in touched:
+        db_kbe.upsert_rows('kbe_ingest_manifest', [{**manifest_row_defaults(manifest[row['file_path']]), **row}])
+
+    return to_import, skipped
+
+
+def _overlaps(window: Tuple, other: Tuple) -> bool:
+    return window[0] <= other[1] and other[0] <= window[1]
+
+
+def files_to_reimport(files: List[str], windows: Dict[str, Tuple], imported: List[str]) -> List[str]:
+    """
+    Picks the files to import again so the table ends up as a serial import of `files` would.
+
+    Importing a file replaces its whole date window, which also deletes the rows of any other
+    file whose window overlaps it. Starting from the just-imported files, this follows window
+    overlaps (transitively) to every affected file. If the group holds a skipped file, it is
+    re-imported in file order from the first skipped member on, so the last file covering a
+    date still writes it last; imported files that precede every skipped member keep their rows.
+
+    Args:
+        files (List[str]): Every file of the run, in the order their writes apply.
+        windows (Dict[str, Tuple]): (start_date, end_date) per file where known: the imported
+            window for files just imported, the manifest window for skipped ones.
+        imported (List[str]): Files imported in this run.
+
+    Returns:
+        List[str]: Files to import again, in file order (empty when nothing was affected).
+    """
+    group = {file for file in imported if file in windows}
+    frontier = list(group)
+    while frontier:
+        window = windows[frontier.pop()]
+        for file, other in windows.items():
+            if file not in group and _overlaps(window, other):
+                group.add(file)
+                frontier.append(file)
+
+    imported = set(imported)
+    ordered = [file for file in files if file in group]
+    first_skipped = next((position for position, file in enumerate(ordered) if file not in imported), None)
+    return [] if first_skipped is None else ordered[first_skipped:]
+
+
+def overlapping_reimports(db_kbe: DatabaseCrud, files: List[str], summaries, skipped: List[str]) -> List[FileFingerprint]:
+    """
+    Fingerprints of files to import again after `summaries` replaced their date windows.
+
+    See files_to_reimport; skipped files are matched on the start_date/end_date recorded in
+    their manifest entries, imported files on the window their import replaced.
+    """
+    manifest = load_manifest(db_kbe, skipped)
+    windows = {}
+    for file in skipped:
+        entry = manifest.get(manifest_key(file))
+        if entry is not None and entry.start_date is not None and entry.end_date is not None:
+            windows[file] = (entry.start_date, entry.end_date)
+
+    imported = [summary.file for summary in summaries if summary.error is None and summary.start_date is not None]
+    for summary in summaries:
+        if summary.file in imported:
+            windows[summary.file] = (summary.start_date, summary.end_date)
+
+    requeued = files_to_reimport(files, windows, imported)
+    for file in requeued:
+        reason = "rows deleted by an overlapping import" if file in skipped else "overlaps a re-queued file imported before it"
+        logger.info(f"  [REQUEUED] {file}: {reason}")
+    return [fingerprint_file(file) for file in requeued]
+
+
+def manifest_row_defaults(entry: KBEIngestManifest) -> Dict:
+    return {
+        'file_path': entry.file_path,
+        'file_size': entry.file_size,
+        'file_mtime_ns': entry.file_mtime_ns,
+        'content_hash': entry.content_hash,
+        'start_date': entry.start_date,
+        'end_date': entry.end_date,
+        'row_count': entry.row_count,
+    }
+
+
+def record_import(db_kbe: DatabaseCrud, fingerprint: FileFingerprint, start_date, end_date, row_count: int) -> None:
+    db_kbe.upsert_rows('kbe_ingest_manifest', [{
+        'file_path': manifest_key(fingerprint.path),
+        'file_size': fingerprint.size,
+        'file_mtime_ns': fingerprint.mtime_ns,
+        'content_hash': fingerprint.ensure_hash(),
+        'start_date': start_date,
+        'end_date': end_date,
+        'row_count': row_count,
+        'imported_at': datetime.now(),
+    }])
+
+
+def log_skipped(skipped: List[str]) -> None:
+    if not skipped:
+        return
+    logger.info(f"Skipped {len(skipped)} unchanged files (use --force to re-import):")
+    for file in skipped:
+        logger.info(f"  [SKIPPED] {file}")
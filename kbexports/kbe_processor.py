@@ -1,99 +1,102 @@
 import os
 import re
 import glob
+import itertools
+import time
 import warnings
 import numpy as np
 import pandas as pd
 from datetime import datetime, date, timedelta
-from typing import Union, Optional
+from typing import Union, Optional, List
+from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import delete, func
 from sqlalchemy.exc import SQLAlchemyError
-import pycountry_convert as pc
 
 from utils.common_utils import (
     read_file_safely,
+    iter_file_chunks,
     calculate_qty,
     clean_text,
-    parse_date_flexibly
+    parse_date_flexibly,
+    parse_date_column,
 )
-from sql_connector import kbbio_engine, kbe_engine, kbbio_connector, kbe_connector
+from utils.staging_cache import staging_cache
+from utils.instrumentation import stage
+from sql_connector import get_connector
 from models.base import KBEBase, KBBIOBase
 from models.kbe.kbe_models import KBEImportExport, KBEImportExportMapping
 from models.shiprocket.shiprocket_models import ShiprocketOrder
-from dbcrud import DatabaseCrud
+from dbcrud import DatabaseCrud, ImportResult
+from kbexports.product_classifier import get_classifier, UNCLASSIFIED
+from kbexports.importer_mapping import get_importer_mapping
+from kbexports.name_normaliser import clean_to_the_order, exporter_normaliser, foreign_importer_normaliser
+from kbexports.regions import continent_resolver, get_continent
+from kbexports.monthly_summary import refresh_summary_for_result
 from Shiprocket.shiprocket import get_all_orders
 from logging_config import logger
-from sqlalchemy.orm import sessionmaker
 
 
+def custom_data_processor(file_path: str) -> pd.DataFrame:
+    """
+    Reads and processes a supported data file (Excel or CSV) into a cleaned pandas DataFrame.
+    Workbooks are read from the Parquet staging cache once they have been parsed before.
 
-def clean_to_the_order(name: str) -> str:
-    if pd.isna(name):
-        return 'TO ORDER'
-
-    name = str(name).upper()
-
-    name = re.sub(r'[^A-Z0-9 ]+', ' ', name)
-    name = re.sub(r'\s+', ' ', name).strip()
-
-    name = re.sub(r'^(Z\s+)?TO\s+', 'TO ', name)
-    name = re.sub(r'\bN\s*A\b', '', name)
-    name = re.sub(r'\bNA\b', '', name)
-
-    name = re.sub(r'\b(OREDER|ORDDER|OTDER|ORDFER|ORER|OEDER|ORDR|ORDE|OREDR|OREDRR)\b', 'ORDER', name)
-
-    if re.fullmatch(r'TO\s+(THE\s+)?ORDER', name):
-        return 'TO ORDER'
-
-    if name.startswith("TO THE ORDER OF"):
-        entity = name.replace("TO THE ORDER OF", "").strip()
-        if not entity or re.fullmatch(r'[.\-/\\ ]*', entity):
-            return 'TO ORDER'
-        return f'TO THE ORDER OF {entity}'
+    Parameters:
+        file_path (str): Path to the input file. Supported formats: 
+                        .xlsx, .xls, .xlsm, .xlsb, .ods, .odf, .odt, .csv
 
-    if name.startswith("TO ORDER OF"):
-        entity = name.replace("TO ORDER OF", "").strip()
-        if not entity or re.fullmatch(r'[.\-/\\ ]*', entity):
-            return 'TO ORDER'
-        return f'TO ORDER OF {entity}'
+    Returns:
+        pd.DataFrame: A cleaned and preprocessed DataFrame ready for analysis or database import.
+    """
+    with stage('read') as record:
+        df = staging_cache.read(file_path)
+        record.rows_out = len(df)
+    return clean_custom_frame(df)
 
-    if name.startswith("TO THE ORDER"):
-        return "TO THE ORDER"
 
-    if name.startswith("TO ORDER"):
-        return "TO ORDER"
+def iter_custom_data_chunks(file_path: str, chunksize: int = 50000):
+    """
+    Streams a customs file through the same cleaning as custom_data_processor, one chunk at a time.
 
-    return name
+    Parameters:
+        file_path (str): Path to the input file. CSV and .xlsx/.xlsm are read incrementally.
+        chunksize (int): Rows per chunk.
 
-def get_continent(country_name):
-    try:
-        country_code = pc.country_name_to_country_alpha2(country_name, cn_name_format="default")
-        continent_code = pc.country_alpha2_to_continent_code(country_code)
-        return pc.convert_continent_code_to_continent_name(continent_code)
-    except:
-        return 'Unknown'
+    Yields:
+        pd.DataFrame: Cleaned chunks with the same columns as custom_data_processor's output.
+    """
+    chunks = staging_cache.iter_chunks(file_path, chunksize=chunksize)
+    for number in itertools.count(1):
+        with stage('read') as record:
+            chunk = next(chunks, None)
+            record.rows_out = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            return
+        logger.info(f"Processing chunk {number} ({len(chunk)} rows) of {file_path}")
+        yield clean_custom_frame(chunk)
 
 
-def custom_data_processor(file_path: str) -> pd.DataFrame:
+def clean_custom_frame(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Reads and processes a supported data file (Excel or CSV) into a cleaned pandas DataFrame.
+    Cleans and classifies a raw customs DataFrame into the kbe_import_export column layout.
 
     Parameters:
-        file_path (str): Path to the input file. Supported formats: 
-                        .xlsx, .xls, .xlsm, .xlsb, .ods, .odf, .odt, .csv
+        df (pd.DataFrame): Raw rows as read from the source file (whole file or one chunk).
 
     Returns:
         pd.DataFrame: A cleaned and preprocessed DataFrame ready for analysis or database import.
     """
-    ...
-
-
     warnings.filterwarnings("ignore", message="This pattern is interpreted as a regular expression.*")
-    df = read_file_safely(file_path=file_path)
     df.columns = df.columns.str.lower().str.replace(" ","_")
-    df['product_classified'] = pd.Series([pd.NA] * len(df), dtype='string')
-    df['date'] = pd.to_datetime(df['date'], format='%d-%b-%Y', errors='coerce')
-
+    with stage('date parse', rows_in=len(df)) as record:
+        df['date'], date_stats = parse_date_column(df['date'])
+        record.rows_out = len(df) - date_stats['missing'] - date_stats['unparsed']
+    caught = ", ".join(f"{fmt}={count}" for fmt, count in date_stats.items() if count and fmt not in ('missing', 'unparsed'))
+    logger.info(f"Parsed dates: {caught or 'none'}; {date_stats['missing']} empty, {date_stats['unparsed']} unparseable.")
+    if date_stats['unparsed']:
+        logger.warning(f"{date_stats['unparsed']} rows have an unrecognised date format and will be dropped.")
 
     num_col = [
         'quantity','fob_value_inr','unit_price_inr',
@@ -101,185 +104,50 @@ def custom_data_processor(file_path: str) -> pd.DataFrame:
         'unit_price_foreign_currency','fob_value_in_lacs_inr','item_no',
         'drawback','chapter','hs_4_digit','hs_code','pin_code','year'
         ]
-    for col in num_col:
-        if col in df.columns:
-            df[col] = (df[col].astype(str).str.replace(r'[^\d\.]', '', regex=True).replace('', None))
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    if 'pin_code' in df.columns:
-        df['pin_code'] = (
-            df['pin_code']
-            .astype(str)
-            .str.replace(r'[^\d]', '', regex=True)
-            .replace('', None)
-            .astype(float)
-            .astype('Int64')
-        )
+    with stage('numeric clean', rows_in=len(df)) as record:
+        for col in num_col:
+            if col in df.columns:
+                df[col] = (df[col].astype(str).str.replace(r'[^\d\.]', '', regex=True).replace('', None))
+                df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+        if 'pin_code' in df.columns:
+            df['pin_code'] = (
+                df['pin_code']
+                .astype(str)
+                .str.replace(r'[^\d]', '', regex=True)
+                .replace('', None)
+                .astype(float)
+                .astype('Int64')
+            )
+        record.rows_out = len(df)
 
     other_col = [col for col in df.columns if col not in num_col and col != 'date']
 
-    for col in other_col:
-        if col in df.columns:
-            df[col] = (
-                df[col]
-                .astype(str)
-                .str.strip()
-                .str.replace(r'\t+', '', regex=True)
-                .str.encode('ascii', 'ignore').str.decode('ascii')
+    with stage('text clean', rows_in=len(df)) as record:
+        for col in other_col:
+            if col in df.columns:
+                df[col] = (
+                    df[col]
+                    .astype(str)
+                    .str.strip()
+                    .str.replace(r'\t+', '', regex=True)
+                    .str.encode('ascii', 'ignore').str.decode('ascii')
         
-            )
+                )
+        record.rows_out = len(df)
 
-    classification_rules = [
-        {
-            'label': 'COCONUT',
-            'include': r'\bcoconut\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'FRESH GARLIC',
-            'include': r'\bgarlic\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|ice)\b',
-        },
-        {
-            'label': 'MIX FRUITS & VEG',
-            'include': r'\b(mixed fruits|mixed vegetables|mix fruit|mix vegetables|mix vegitable|mixed vegetables)\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'DRUMSTICK',
-            'include': r'\bdrumsticks?\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'DRAGON FRUITS',
-            'include': r'\bdragon\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'MANGO',
-            'include': r'\b(mango|alphanso)\b',
-            'exclude': r'\b(pulp|slice|frozen|cut mango|pickle|papad|cut|dry|dried|powder|raw|juice)\b',
-        },
-        {
-            'label': 'BABY CORN',
-            'include': r'\b(baby|babycorn|baby corn)\b',
-            'exclude': r'\b(okra|potato|frozen|iqf|cut|brine|acetic|acid|onion|bananas?|wheat|babyvita|bitter)\b',
-        },
-        {
-            'label': 'POMEGRANATES',
-            'include': r'\b(pome|anar|pomegranate)\b',
-            'exclude': r'\b(aril|pulp|arils|dhana|dana|frozen|iqf|cut|brine)\b',
-        },
-        {
-            'label': 'POMEGRANATES ARILS',
-            'include': r'\b(aril|pomegranate arils|arils)\b',
-            'exclude': r'\b(vinegar|frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'OKRA',
-            'include': r'\b(okra|lady finger)\b',
-            'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'CHILLI',
-            'include': r'\b(chilli|chilly)\b',
-            'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'GUAVA',
-            'include': r'\b(guava|peru)\b',
-            'exclude': r'\b(pulp|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'CHICKOO',
-            'include': r'\b(sapota|chickoo)\b',
-            'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-        {
-            'label': 'DUDHI',
-            'include': r'\b(dudhi|bottle gourd|bottleguard)\b',
-            'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-        {
-            'label': 'ONION',
-            'include': r'\b(red onion|shallot|small onion|onion)\b',
-            'exclude': r'\b(iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-    ]
-
-    for rule in classification_rules:
-        include = df['product_description'].str.contains(rule['include'], case=False, na=False)
-        exclude = df['product_description'].str.contains(rule['exclude'], case=False, na=False)
-        df.loc[include & ~exclude, 'product_classified'] = rule['label']
-
-    exporter_patterns = {
-        r'\bKAY\sBEE\b': 'KAY BEE EXPORTS',
-        r'\bMAGNUS\b': 'MAGNUS FARM',
-        r'\bFRESHTROP FRUITS\b': 'FRESHTROP FRUITS',
-        r'\bGREEN AGREVOLUTION\b': 'GREEN AGREVOLUTION',
-        r'\bBARAMATI\b': 'BARAMATI AGRO',
-        r'\bULINK AGRITECH\b': 'ULINK AGRITECH',
-        r'\bSAM AGRI FRESH\b': 'SAM AGRI FRESH',
-        r'\bSANTOSH EXPORTS\b': 'SANTOSH EXPORTS',
-        r'\bKASHI EXPORTS\b': 'KASHI EXPORTS',
-        r'\bKHUSHI INTERNATIONAL\b': 'KHUSHI INTERNATIONAL',
-        r'\bGO GREEN\b': 'GO GREEN EXPORT',
-        r'\bTHREE CIRCLES\b': 'THREE CIRCLES',
-        r'\bALL SEASON\b': 'ALL SEASON EXPORTS',
-        r'\bM\.?\s*K\.?\s*EXPORTS\b': 'M.K. EXPORTS',
-        r'\bESSAR IMPEX\b': 'ESSAR IMPEX',
-        r'\bESSAR EXPORTS\b': 'ESSAR EXPORTS',
-        r'\bSUPER FRESH FRUITS\b': 'SUPER FRESH FRUIT',
-        r'\bVASHINI EXPORTS\b': 'VASHINI EXPORTS',
-        r'\bSCION AGRICOS\b': 'SCION AGRICOS',
-        r'\bMANTRA INTERNATIONAL\b': 'MANTRA INTERNATIONAL',
-        r'\bSIA IMPEX\b': 'SIA IMPEX',
-    }
+    with stage('classify', rows_in=len(df)) as record:
+        df['product_classified'] = get_classifier().classify_series(df['product_description'])
+        record.rows_out = int(df['product_classified'].ne(UNCLASSIFIED).sum())
 
-    for pattern, name in exporter_patterns.items():
-        df.loc[
-            df['indian_exporter_name'].str.contains(pattern, case=False, na=False, regex=True), 
-            'indian_exporter_name'
-        ] = name
-
-    foreign_importer_patterns = {
-        r'\bWealmoor|Weal Moor\b': 'WEAL MOOR LTD',
-        r'\bFLAMINGO|FLAMINGO PRODUCE\b': 'FLAMINGO PRODUCE',
-        r'\bMINOR|MINOR, WEIR AND WILLIS LIMITED|MINOR WEIR & WILLIS LIMITED\b': 'MINOR WEIR & WILLIS LIMITED',
-        r"\bNATURE'S PRIDE\b": "NATURE'S PRIDE",
-        r'\bYUKON\b': 'YUKON INTERNATION',
-        r'\bJALARAM PRODUCE\b': 'JALARAM PRODUCE',
-        r'\bRAJA FOODS & VEGETABLE\b': 'RAJA FOODS & VEGETABLES',
-        r'\bDPS\b': 'DPS',
-        r'\bBARAKAT\b': 'BARAKAT VEGETABLE',
-        r'\bBARFOOTS\b': 'BARFOOTS OF BOTELY',
-        r'\bCORFRESH|COREFRESH\b': 'COREFRESH LTD',
-        r'\bPROVENANCE PARTNERS\b': 'PROVENANCE PARTNERS',
-        r'\bS & F GLOBAL|S&F GLOBAL\b': 'S & F GLOBAL FRESH',
-        r'\bBERRYMOUNT VEGETABLES\b': 'BERRYMOUNT VEGETABLES',
-    }
+    with stage('name standardise', rows_in=len(df)) as record:
+        df['indian_exporter_name'] = exporter_normaliser.normalise_series(df['indian_exporter_name'])
+        df['foreign_importer_name'] = foreign_importer_normaliser.normalise_series(df['foreign_importer_name'])
+        record.rows_out = len(df)
 
-    for pattern, standard in foreign_importer_patterns.items():
-        df.loc[
-            df['foreign_importer_name'].str.contains(pattern, case=False, na=False, regex=True),
-            'foreign_importer_name'
-        ] = standard
-
-    for col in ['foreign_importer_name', 'indian_exporter_name']:
-        pattern = re.compile(r'^[\s\.,]*$')
-        df.loc[df[col].str.match(pattern, na=False), col] = 'TO ORDER'
-        df[col] = df[col].astype(str).str.strip(' \t\n\r",.*&')
-        df[col] = df[col].apply(clean_to_the_order)
-
-    df['region'] = (
-        df['foreign_country']
-        .astype(str)
-        .str.upper()
-        .str.replace(r'[^A-Z ]', '', regex=True)
-        .str.strip()
-        .str.title()
-        .apply(get_continent)
-    )
+    with stage('region', rows_in=len(df)) as record:
+        df['region'] = continent_resolver.region_series(df['foreign_country'])
+        record.rows_out = int(df['region'].ne('Unknown').sum())
 
     conversion_map = {
         'KGA': 1,
@@ -324,44 +192,239 @@ def custom_data_processor(file_path: str) -> pd.DataFrame:
 
 
 
-def kbe_custom_import_export(file: str, custom_data: Optional[bool] = None, mapping_importer: Optional[bool] = None):
-    KBEBase.metadata.create_all(bind=kbe_engine)
-    db_kbe = DatabaseCrud(kbe_connector)
+def _prepare_for_import(custom_df: pd.DataFrame) -> pd.DataFrame:
+    custom_df['date'] = pd.to_datetime(custom_df['date'], errors='coerce')
+    if 'foreign_importer_name' in custom_df.columns:
+        custom_df['foreign_importer_name'] = get_importer_mapping().apply(custom_df['foreign_importer_name'])
+    return custom_df.dropna(subset=['date'])
 
-    if custom_data is True:
-        custom_df = custom_data_processor(file_path=file)
 
-        if custom_df.empty:
-            logger.warning("No data to import from custom_data_processor.")
-            return
+def import_custom_frame(
+    custom_df: pd.DataFrame,
+    db_kbe: Optional[DatabaseCrud] = None,
+    refresh_summary: bool = True,
+) -> Optional[ImportResult]:
+    """
+    Replaces the date window covered by a cleaned customs DataFrame in kbe_import_export.
 
-        custom_df.columns = custom_df.columns.str.lower().str.strip()
+    Parameters:
+        custom_df (pd.DataFrame): Output of custom_data_processor.
+        db_kbe (DatabaseCrud, optional): CRUD helper bound to the KBE database.
+        refresh_summary (bool): Refresh kbe_monthly_summary for the replaced months. Folder
+            imports pass False and refresh in _apply_result, where a failure is recorded.
 
-        if 'date' not in custom_df.columns:
-            logger.error("'date' column is missing in input file.")
-            return
+    Returns:
+        ImportResult | None: Outcome of the replace, or None when there was nothing to import.
+    """
+    db_kbe = db_kbe or DatabaseCrud(get_connector('kbe'))
+
+    if custom_df.empty:
+        logger.warning("No data to import from custom_data_processor.")
+        return None
+
+    custom_df.columns = custom_df.columns.str.lower().str.strip()
+
+    if 'date' not in custom_df.columns:
+        logger.error("'date' column is missing in input file.")
+        return None
+
+    custom_df = _prepare_for_import(custom_df)
+    if custom_df.empty:
+        logger.warning("No rows with a valid date to import.")
+        return None
+
+    start_date = custom_df['date'].min().date().isoformat()
+    end_date = custom_df['date'].max().date().isoformat()
 
-        custom_df['date'] = pd.to_datetime(custom_df['date'], errors='coerce')
-        custom_df = custom_df.dropna(subset=['date'])
+    result = db_kbe.replace_range(
+        table_name='kbe_import_export',
+        key_column='date',
+        range_or_ids=(start_date, end_date),
+        df=custom_df,
+        commit=True
+    )
+    if result.committed:
+        logger.info(f"Imported custom data from {start_date} to {end_date} into 'kbe_import_export'.")
+        if refresh_summary:
+            refresh_summary_for_result(db_kbe, result)
+    else:
+        logger.error(f"Custom data from {start_date} to {end_date} was not imported; existing rows kept.")
+    return result
+
+
+@dataclass
+class FileImportSummary:
+    """Per-file outcome of a folder import."""
+    file: str
+    rows: int = 0
+    read_seconds: float = 0.0
+    write_seconds: float = 0.0
+    error: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    summary_stale: bool = False
+
+
+def _read_and_clean(file: str) -> tuple:
+    # Runs in a worker process: parsing and regex cleaning are CPU-bound.
+    started = time.perf_counter()
+    return custom_data_processor(file_path=file), time.perf_counter() - started
+
+
+def _apply_result(summary: FileImportSummary, result: Optional[ImportResult], db_kbe: DatabaseCrud) -> None:
+    if result is not None:
+        summary.rows = result.rows_inserted
+        if result.key_range:
+            summary.start_date, summary.end_date = (pd.Timestamp(value).date() for value in result.key_range)
+        if not result.committed:
+            summary.error = "import not committed"
+        # A stale summary keeps the file out of the ingest manifest, so the next run imports
+        # it again and retries the refresh.
+        summary.summary_stale = not refresh_summary_for_result(db_kbe, result)
+
+
+def import_custom_files(files: List[str], chunksize: Optional[int] = None) -> List[FileImportSummary]:
+    """
+    Imports customs files one after another, reading and writing each before the next.
 
-        start_date = custom_df['date'].min().date().isoformat()
-        end_date = custom_df['date'].max().date().isoformat()
+    Parameters:
+        files (List[str]): Files to import.
+        chunksize (int, optional): Stream each file in chunks of this many rows.
 
+    Returns:
+        List[FileImportSummary]: One entry per file. In streaming mode reading and writing
+        overlap, so all time is reported as write time.
+    """
+    db_kbe = DatabaseCrud(get_connector('kbe'))
+    KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+    summaries = []
+
+    for file in files:
+        logger.info(f"[PROCESSING] {file}")
+        summary = FileImportSummary(file=file)
+        summaries.append(summary)
         try:
-            db_kbe.delete_date_range_query(
-                table_name='kbe_import_export',
-                start_date=start_date,
-                end_date=end_date,
-                commit=True
-            )
+            if chunksize:
+                started = time.perf_counter()
+                result = kbe_custom_import_export(file=file, custom_data=True, chunksize=chunksize, refresh_summary=False)
+                _apply_result(summary, result, db_kbe)
+                summary.write_seconds = time.perf_counter() - started
+            else:
+                custom_df, summary.read_seconds = _read_and_clean(file)
+                started = time.perf_counter()
+                _apply_result(summary, import_custom_frame(custom_df, db_kbe, refresh_summary=False), db_kbe)
+                summary.write_seconds = time.perf_counter() - started
+        except Exception as e:
+            summary.error = str(e)
+            logger.error(f"[ERROR] Failed to process file: {file}")
+            logger.error(f"Reason: {e}")
 
-            db_kbe.import_data(
-                table_name='kbe_import_export',
-                df=custom_df,
-                commit=True
-            )
-            logger.info(f"Imported custom data from {start_date} to {end_date} into 'kbe_import_export'.")
+    return summaries
+
+
+def import_custom_files_parallel(files: List[str], workers: int) -> List[FileImportSummary]:
+    """
+    Parses and cleans customs files in a process pool and imports them through a single writer.
+
+    Worker processes only read and clean. The calling process applies each file's
+    delete-window + insert in the original file order, one at a time, so files with
+    overlapping date ranges end up exactly as a serial run would leave them. At most
+    workers + 1 files are queued, being parsed or waiting to be written at a time, and the
+    next one is submitted as each file is taken for writing, so memory is bounded by that
+    window rather than by the number of files.
+
+    Parameters:
+        files (List[str]): Files to import, in the order their writes should apply.
+        workers (int): Number of worker processes.
+
+    Returns:
+        List[FileImportSummary]: One entry per file.
+    """
+    db_kbe = DatabaseCrud(get_connector('kbe'))
+    KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+    summaries = []
+
+    pending_files = iter(files)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = deque(
+            (file, executor.submit(_read_and_clean, file))
+            for file in itertools.islice(pending_files, workers + 1)
+        )
 
+        while futures:
+            file, future = futures.popleft()
+            summary = FileImportSummary(file=file)
+            summaries.append(summary)
+            try:
+                custom_df, summary.read_seconds = future.result()
+            except Exception as e:
+                summary.error = f"read/clean failed: {e}"
+                logger.error(f"[ERROR] Failed to process file: {file}")
+                logger.error(f"Reason: {e}")
+                continue
+            finally:
+                # This file's slot is free once its frame is out of the pool; queue the next.
+                next_file = next(pending_files, None)
+                if next_file is not None:
+                    futures.append((next_file, executor.submit(_read_and_clean, next_file)))
+
+            started = time.perf_counter()
+            try:
+                _apply_result(summary, import_custom_frame(custom_df, db_kbe, refresh_summary=False), db_kbe)
+            except Exception as e:
+                summary.error = f"import failed: {e}"
+                logger.error(f"[ERROR] Failed to import file: {file}")
+                logger.error(f"Reason: {e}")
+            summary.write_seconds = time.perf_counter() - started
+
+    return summaries
+
+
+def log_import_summary(summaries: List[FileImportSummary]) -> None:
+    failed = [summary for summary in summaries if summary.error]
+    logger.info(f"Import summary: {len(summaries)} files, {len(failed)} failed, "
+                f"{sum(summary.rows for summary in summaries)} rows inserted.")
+    for summary in summaries:
+        status = f"FAILED ({summary.error})" if summary.error else "ok"
+        if summary.summary_stale:
+            status += ", monthly summary not refreshed"
+        logger.info(f"  {summary.file}: {summary.rows} rows, read {summary.read_seconds:.1f}s, "
+                    f"write {summary.write_seconds:.1f}s, {status}")
+
+
+def kbe_custom_import_export(
+    file: str,
+    custom_data: Optional[bool] = None,
+    mapping_importer: Optional[bool] = None,
+    chunksize: Optional[int] = None,
+    refresh_summary: bool = True,
+) -> Optional[ImportResult]:
+    db_kbe = DatabaseCrud(get_connector('kbe'))
+    KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+
+    if custom_data is True and chunksize:
+        # Streaming mode: each cleaned chunk goes straight into a staging table, and the file's
+        # date window is replaced in one short transaction once every chunk has been staged.
+        result = db_kbe.replace_range(
+            table_name='kbe_import_export',
+            key_column='date',
+            range_or_ids=None,
+            df=(_prepare_for_import(chunk) for chunk in iter_custom_data_chunks(file, chunksize=chunksize)),
+            commit=True,
+            staging=True
+        )
+        if result.committed:
+            logger.info(f"Streamed {result.rows_inserted} rows from {file} into 'kbe_import_export'.")
+            if refresh_summary:
+                refresh_summary_for_result(db_kbe, result)
+        else:
+            logger.error(f"Streaming import of {file} was not committed; existing rows kept.")
+        return result
+
+    elif custom_data is True:
+        custom_df = custom_data_processor(file_path=file)
+        try:
+            return import_custom_frame(custom_df, db_kbe, refresh_summary=refresh_summary)
         except SQLAlchemyError as e:
             logger.exception("Error occurred during custom data import:")
 
@@ -376,6 +439,7 @@ def kbe_custom_import_export(file: str, custom_data: Optional[bool] = None, mapp
                 df = df[final_col]
 
                 db_kbe.import_data(table_name='kbe_importer_mapping', df=df, commit=True)
+                get_importer_mapping().invalidate()
                 logger.info(f"Imported {len(df)} records into 'kbe_importer_mapping'.")
             else:
                 logger.warning("No data to import from item_mapping_import.")
@@ -384,110 +448,3 @@ def kbe_custom_import_export(file: str, custom_data: Optional[bool] = None, mapp
 
     else:
         logger.warning("No import option selected.")
-
-
-
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=kbe_engine)
-
-def product_classification():
-    classification_rules = [
-        {
-            'label': 'COCONUT',
-            'include': r'\bcoconut\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'FRESH GARLIC',
-            'include': r'\bgarlic\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|ice)\b',
-        },
-        {
-            'label': 'MIX FRUITS & VEG',
-            'include': r'\b(mixed fruits|mixed vegetables|mix fruit|mix vegetables|mix vegitable|mixed vegetables)\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'DRUMSTICK',
-            'include': r'\bdrumsticks?\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'DRAGON FRUITS',
-            'include': r'\bdragon\b',
-            'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
-        },
-        {
-            'label': 'MANGO',
-            'include': r'\b(mango|alphanso)\b',
-            'exclude': r'\b(pulp|slice|frozen|cut mango|pickle|papad|cut|dry|dried|powder|raw|juice)\b',
-        },
-        {
-            'label': 'BABY CORN',
-            'include': r'\b(baby|babycorn|baby corn)\b',
-            'exclude': r'\b(okra|potato|frozen|iqf|cut|brine|acetic|acid|onion|bananas?|wheat|babyvita|bitter)\b',
-        },
-        {
-            'label': 'POMEGRANATES',
-            'include': r'\b(pome|anar|pomegranate)\b',
-            'exclude': r'\b(aril|pulp|arils|dhana|dana|frozen|iqf|cut|brine)\b',
-        },
-        {
-            'label': 'POMEGRANATES ARILS',
-            'include': r'\b(aril|pomegranate arils|arils)\b',
-            'exclude': r'\b(vinegar|frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'OKRA',
-            'include': r'\b(okra|lady finger)\b',
-            'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'CHILLI',
-            'include': r'\b(chilli|chilly)\b',
-            'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'GUAVA',
-            'include': r'\b(guava|peru)\b',
-            'exclude': r'\b(pulp|iqf|cut|brine|acetic|acid|dry|dried)\b',
-        },
-        {
-            'label': 'CHICKOO',
-            'include': r'\b(sapota|chickoo)\b',
-            'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-        {
-            'label': 'DUDHI',
-            'include': r'\b(dudhi|bottle gourd|bottleguard)\b',
-            'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-        {
-            'label': 'ONION',
-            'include': r'\b(red onion|shallot|small onion|onion)\b',
-            'exclude': r'\b(iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
-        },
-    ]
-
-    session = SessionLocal()
-    try:
-        products = session.query(KBEImportExport).all()
-        for product in products:
-            desc = (product.product_description or "").lower()
-
-            matched_label = None
-            for rule in classification_rules:
-                if re.search(rule['include'], desc):
-                    if not re.search(rule['exclude'], desc):
-                        matched_label = rule['label']
-                        break
-
-            product.product_classified = matched_label or "UNCLASSIFIED"
-
-        session.commit()
-        print("✅ Product classification completed successfully.")
-    except SQLAlchemyError as e:
-        session.rollback()
-        print(f"❌ Error: {e}")
-    finally:
-        session.close()
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from typing import Optional, Tuple
+import pandas as pd
+from sqlalchemy import select, insert, delete, func, type_coerce, String
+from models.kbe.kbe_models import KBEImportExport, KBEMonthlySummary
+from dbcrud import DatabaseCrud, ImportResult
+from utils.instrumentation import stage
+from logging_config import logger
+
+
+SUMMARY_DIMENSIONS = ('product_classified', 'foreign_country', 'indian_exporter_name')
+
+
+def month_bounds(start_date, end_date) -> Tuple[date, date]:
+    """Widens a date window to whole months: (first day of start month, last day of end month)."""
+    first = pd.Timestamp(start_date).to_period('M').start_time.date()
+    last = pd.Timestamp(end_date).to_period('M').end_time.date()
+    return first, last
+
+
+def _month_start(dialect_name: str, column):
+    if dialect_name == 'mysql':
+        return func.date_format(column, '%Y-%m-01')
+    return func.strftime('%Y-%m-01', column)
+
+
+def refresh_monthly_summary(db_kbe: DatabaseCrud, start_date, end_date) -> Optional[int]:
+    """
+    Recomputes kbe_monthly_summary for every month touched by a date window.
+
+    The months' summary rows are deleted and re-aggregated from kbe_import_export with one
+    INSERT ... SELECT ... GROUP BY in a single transaction, so readers see either the old or
+    the new totals for a month, never a partial mix.
+
+    Args:
+        db_kbe (DatabaseCrud): CRUD helper bound to the KBE database.
+        start_date: First date of the replaced window.
+        end_date: Last date of the replaced window.
+
+    Returns:
+        int | None: Summary rows written, or None if the refresh failed.
+    """
+    first, last = month_bounds(start_date, end_date)
+    raw = KBEImportExport.__table__
+    summary = KBEMonthlySummary.__table__
+
+    try:
+        with stage('summary refresh') as record, db_kbe.db_engine.begin() as connection:
+            month_start = _month_start(connection.dialect.name, raw.c.date)
+            dimensions = [raw.c[name] for name in SUMMARY_DIMENSIONS]
+            aggregate = (
+                select(
+                    month_start,
+                    *dimensions,
+                    func.count(),
+                    func.sum(raw.c.quantity),
+                    func.sum(raw.c.fob_value_inr),
+                    func.sum(raw.c.fob_value_usd),
+                )
+                .where(raw.c.date >= first, raw.c.date < last + timedelta(days=1))
+                .group_by(month_start, *dimensions)
+            )
+            connection.execute(delete(summary).where(summary.c.month_start.between(first, last)))
+            written = connection.execute(
+                insert(summary).from_select(
+                    ['month_start', *SUMMARY_DIMENSIONS, 'shipments', 'quantity', 'fob_value_inr', 'fob_value_usd'],
+                    aggregate,
+                )
+            ).rowcount
+            record.rows_out = written
+        logger.info(f"Refreshed kbe_monthly_summary for {first:%Y-%m} to {last:%Y-%m}: {written} rows.")
+        return written
+    except Exception:
+        logger.error(f"Failed to refresh kbe_monthly_summary for {first} to {last}", exc_info=True)
+        return None
+
+
+def refresh_summary_for_result(db_kbe: DatabaseCrud, result: Optional[ImportResult]) -> bool:
+    """
+    Refreshes the months covered by a committed date-window replace.
+
+    Returns False only when the refresh was needed and failed, leaving those months stale.
+    """
+    if result is not None and result.committed and result.key_range:
+        return refresh_monthly_summary(db_kbe, *result.key_range) is not None
+    return True
+
+
+def rebuild_monthly_summary(db_kbe: DatabaseCrud, start_date=None, end_date=None) -> Optional[int]:
+    """Recomputes the summary for a window, defaulting to every date in kbe_import_export."""
+    if start_date is None or end_date is None:
+        with db_kbe.db_engine.connect() as connection:
+            low, high = connection.execute(select(
+                type_coerce(func.min(KBEImportExport.date), String),
+                type_coerce(func.max(KBEImportExport.date), String),
+            )).one()
+        if low is None:
+            logger.warning("kbe_import_export is empty; nothing to summarise.")
+            return 0
+        start_date = start_date or low
+        end_date = end_date or high
+    return refresh_monthly_summary(db_kbe, start_date, end_date)
@@ -0,0 +1,130 @@
+import re
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+EXPORTER_PATTERNS = {
+    r'\bKAY\sBEE\b': 'KAY BEE EXPORTS',
+    r'\bMAGNUS\b': 'MAGNUS FARM',
+    r'\bFRESHTROP FRUITS\b': 'FRESHTROP FRUITS',
+    r'\bGREEN AGREVOLUTION\b': 'GREEN AGREVOLUTION',
+    r'\bBARAMATI\b': 'BARAMATI AGRO',
+    r'\bULINK AGRITECH\b': 'ULINK AGRITECH',
+    r'\bSAM AGRI FRESH\b': 'SAM AGRI FRESH',
+    r'\bSANTOSH EXPORTS\b': 'SANTOSH EXPORTS',
+    r'\bKASHI EXPORTS\b': 'KASHI EXPORTS',
+    r'\bKHUSHI INTERNATIONAL\b': 'KHUSHI INTERNATIONAL',
+    r'\bGO GREEN\b': 'GO GREEN EXPORT',
+    r'\bTHREE CIRCLES\b': 'THREE CIRCLES',
+    r'\bALL SEASON\b': 'ALL SEASON EXPORTS',
+    r'\bM\.?\s*K\.?\s*EXPORTS\b': 'M.K. EXPORTS',
+    r'\bESSAR IMPEX\b': 'ESSAR IMPEX',
+    r'\bESSAR EXPORTS\b': 'ESSAR EXPORTS',
+    r'\bSUPER FRESH FRUITS\b': 'SUPER FRESH FRUIT',
+    r'\bVASHINI EXPORTS\b': 'VASHINI EXPORTS',
+    r'\bSCION AGRICOS\b': 'SCION AGRICOS',
+    r'\bMANTRA INTERNATIONAL\b': 'MANTRA INTERNATIONAL',
+    r'\bSIA IMPEX\b': 'SIA IMPEX',
+}
+
+FOREIGN_IMPORTER_PATTERNS = {
+    r'\bWealmoor|Weal Moor\b': 'WEAL MOOR LTD',
+    r'\bFLAMINGO|FLAMINGO PRODUCE\b': 'FLAMINGO PRODUCE',
+    r'\bMINOR|MINOR, WEIR AND WILLIS LIMITED|MINOR WEIR & WILLIS LIMITED\b': 'MINOR WEIR & WILLIS LIMITED',
+    r"\bNATURE'S PRIDE\b": "NATURE'S PRIDE",
+    r'\bYUKON\b': 'YUKON INTERNATION',
+    r'\bJALARAM PRODUCE\b': 'JALARAM PRODUCE',
+    r'\bRAJA FOODS & VEGETABLE\b': 'RAJA FOODS & VEGETABLES',
+    r'\bDPS\b': 'DPS',
+    r'\bBARAKAT\b': 'BARAKAT VEGETABLE',
+    r'\bBARFOOTS\b': 'BARFOOTS OF BOTELY',
+    r'\bCORFRESH|COREFRESH\b': 'COREFRESH LTD',
+    r'\bPROVENANCE PARTNERS\b': 'PROVENANCE PARTNERS',
+    r'\bS & F GLOBAL|S&F GLOBAL\b': 'S & F GLOBAL FRESH',
+    r'\bBERRYMOUNT VEGETABLES\b': 'BERRYMOUNT VEGETABLES',
+}
+
+_BLANK_NAME = re.compile(r'^[\s\.,]*$')
+_NON_ALNUM = re.compile(r'[^A-Z0-9 ]+')
+_WHITESPACE = re.compile(r'\s+')
+_TO_PREFIX = re.compile(r'^(Z\s+)?TO\s+')
+_SPACED_NA = re.compile(r'\bN\s*A\b')
+_NA = re.compile(r'\bNA\b')
+_ORDER_TYPOS = re.compile(r'\b(OREDER|ORDDER|OTDER|ORDFER|ORER|OEDER|ORDR|ORDE|OREDR|OREDRR)\b')
+_TO_ORDER = re.compile(r'TO\s+(THE\s+)?ORDER')
+_PUNCTUATION_ONLY = re.compile(r'[.\-/\\ ]*')
+
+
+def clean_to_the_order(name: str) -> str:
+    if pd.isna(name):
+        return 'TO ORDER'
+
+    name = str(name).upper()
+
+    name = _NON_ALNUM.sub(' ', name)
+    name = _WHITESPACE.sub(' ', name).strip()
+
+    name = _TO_PREFIX.sub('TO ', name)
+    name = _SPACED_NA.sub('', name)
+    name = _NA.sub('', name)
+
+    name = _ORDER_TYPOS.sub('ORDER', name)
+
+    if _TO_ORDER.fullmatch(name):
+        return 'TO ORDER'
+
+    if name.startswith("TO THE ORDER OF"):
+        entity = name.replace("TO THE ORDER OF", "").strip()
+        if not entity or _PUNCTUATION_ONLY.fullmatch(entity):
+            return 'TO ORDER'
+        return f'TO THE ORDER OF {entity}'
+
+    if name.startswith("TO ORDER OF"):
+        entity = name.replace("TO ORDER OF", "").strip()
+        if not entity or _PUNCTUATION_ONLY.fullmatch(entity):
+            return 'TO ORDER'
+        return f'TO ORDER OF {entity}'
+
+    if name.startswith("TO THE ORDER"):
+        return "TO THE ORDER"
+
+    if name.startswith("TO ORDER"):
+        return "TO ORDER"
+
+    return name
+
+
+class NameNormaliser:
+    """
+    Standardises party names (exporters, importers) one distinct value at a time.
+
+    Each value runs through the standard-name patterns in order, each one testing the
+    result of the previous, then blank handling and clean_to_the_order. A column is
+    factorised first, so a 500k-row file with a few thousand distinct names runs the
+    pipeline a few thousand times, and the results are gathered back by category code.
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, str]] = None):
+        self.patterns = [
+            (re.compile(pattern, re.IGNORECASE), standard)
+            for pattern, standard in (patterns or {}).items()
+        ]
+
+    def normalise(self, name) -> str:
+        if isinstance(name, str):
+            for pattern, standard in self.patterns:
+                if pattern.search(name):
+                    name = standard
+            if _BLANK_NAME.match(name):
+                name = 'TO ORDER'
+        return clean_to_the_order(str(name).strip(' \t\n\r",.*&'))
+
+    def normalise_series(self, names: pd.Series) -> pd.Series:
+        codes, uniques = pd.factorize(names, use_na_sentinel=False)
+        normalised = np.array([self.normalise(name) for name in uniques], dtype=object)
+        return pd.Series(normalised[codes], index=names.index, name=names.name)
+
+
+exporter_normaliser = NameNormaliser(EXPORTER_PATTERNS)
+foreign_importer_normaliser = NameNormaliser(FOREIGN_IMPORTER_PATTERNS)
@@ -0,0 +1,176 @@
+import time
+from collections import defaultdict
+from typing import Optional
+import pandas as pd
+from sqlalchemy import select, update, or_, func
+from models.base import KBEBase
+from models.kbe.kbe_models import KBEImportExport, KBEBackfillCheckpoint
+from sql_connector import get_connector
+from dbcrud import DatabaseCrud
+from kbexports.product_classifier import get_classifier, UNCLASSIFIED
+from kbexports.monthly_summary import refresh_monthly_summary
+from utils.instrumentation import stage
+from logging_config import logger
+
+
+BACKFILL_JOB_NAME = 'product_classification'
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _load_checkpoint(engine):
+    with engine.connect() as connection:
+        return connection.execute(
+            select(KBEBackfillCheckpoint).where(KBEBackfillCheckpoint.job_name == BACKFILL_JOB_NAME)
+        ).first()
+
+
+def _start_run(db_kbe: DatabaseCrud, checkpoint, restart: bool):
+    """
+    Returns (last_id, pending_since, rows_updated, summary_span) for this run, resuming an
+    unfinished one. summary_span is the (from, to) dates still owed a summary refresh, which
+    carries over from an earlier run whose refresh did not happen.
+    """
+    summary_span = (checkpoint.summary_from, checkpoint.summary_to) if checkpoint is not None else (None, None)
+    if checkpoint is not None and checkpoint.completed_at is None and not restart:
+        logger.info(f"Resuming product classification after id {checkpoint.last_id}.")
+        return checkpoint.last_id, checkpoint.pending_since, checkpoint.rows_updated, summary_span
+
+    if checkpoint is None:
+        pending_since = None
+    elif checkpoint.completed_at is not None:
+        pending_since = checkpoint.started_at
+    else:
+        pending_since = checkpoint.pending_since
+
+    with db_kbe.db_engine.connect() as connection:
+        started_at = connection.execute(select(func.now())).scalar()
+
+    db_kbe.upsert_rows('kbe_backfill_checkpoint', [{
+        'job_name': BACKFILL_JOB_NAME,
+        'last_id': 0,
+        'rows_updated': 0,
+        'started_at': pd.Timestamp(started_at).to_pydatetime(),
+        'completed_at': None,
+        'pending_since': pending_since,
+        'summary_from': summary_span[0],
+        'summary_to': summary_span[1],
+    }])
+    return 0, pending_since, 0, summary_span
+
+
+def _widen(span, dates: pd.Series):
+    dates = dates.dropna()
+    if dates.empty:
+        return span
+    low, high = pd.Timestamp(dates.min()).date(), pd.Timestamp(dates.max()).date()
+    return (min(low, span[0]) if span[0] else low, max(high, span[1]) if span[1] else high)
+
+
+def _refresh_summary(db_kbe: DatabaseCrud, summary_span) -> None:
+    """Refreshes the kbe_monthly_summary months of relabelled rows and clears the span."""
+    if summary_span[0] is None:
+        return
+    if refresh_monthly_summary(db_kbe, *summary_span) is None:
+        logger.error(
+            f"kbe_monthly_summary was not refreshed for {summary_span[0]} to {summary_span[1]}; "
+            f"the next kbe-reclassify retries it, or run kbe-summary --start {summary_span[0]} --end {summary_span[1]}."
+        )
+        return
+    with db_kbe.db_engine.begin() as connection:
+        connection.execute(
+            update(KBEBackfillCheckpoint)
+            .where(KBEBackfillCheckpoint.job_name == BACKFILL_JOB_NAME)
+            .values(summary_from=None, summary_to=None)
+        )
+
+
+def product_classification(batch_size: int = BACKFILL_BATCH_SIZE, only_pending: bool = False, restart: bool = False) -> int:
+    """
+    Reclassifies kbe_import_export.product_classified in keyset-paged batches.
+
+    Each batch reads (id, date, product_description, product_classified) for the next
+    `batch_size` ids, classifies the descriptions with the shared ProductClassifier, and writes
+    back only the rows whose label changed with one UPDATE ... WHERE id IN (...) per label. The
+    batch and its checkpoint are committed together, so an interrupted run resumes after the
+    last committed id instead of starting over.
+
+    The checkpoint also keeps the date span of the relabelled rows; once every batch is done,
+    kbe_monthly_summary is refreshed for the months in that span.
+
+    Args:
+        batch_size (int): Rows read per batch.
+        only_pending (bool): Only revisit rows that are NULL/UNCLASSIFIED, or were inserted
+            since the last completed run started. Customs rows are never edited in place
+            (re-imports delete and insert), so new rows cover changed descriptions.
+        restart (bool): Ignore an unfinished checkpoint and start from the first id.
+
+    Returns:
+        int: Number of rows whose label was updated in this run (including resumed batches).
+    """
+    db_kbe = DatabaseCrud(get_connector('kbe'))
+    KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+    classifier = get_classifier()
+    table = KBEImportExport.__table__
+
+    last_id, pending_since, rows_updated, summary_span = _start_run(db_kbe, _load_checkpoint(db_kbe.db_engine), restart)
+
+    pending_filter = None
+    if only_pending:
+        conditions = [table.c.product_classified.is_(None), table.c.product_classified == UNCLASSIFIED]
+        if pending_since is not None:
+            conditions.append(table.c.created_at >= pending_since)
+        pending_filter = or_(*conditions)
+
+    start_time = time.time()
+    rows_read = 0
+    while True:
+        query = (
+            select(table.c.id, table.c.date, table.c.product_description, table.c.product_classified)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch_size)
+        )
+        if pending_filter is not None:
+            query = query.where(pending_filter)
+
+        with stage('read batch') as record, db_kbe.db_engine.connect() as connection:
+            batch = pd.DataFrame(connection.execute(query).fetchall(), columns=['id', 'date', 'product_description', 'product_classified'])
+            record.rows_out = len(batch)
+        if batch.empty:
+            break
+
+        with stage('classify', rows_in=len(batch)) as record:
+            labels = classifier.classify_series(batch['product_description'])
+            changed = batch.loc[labels.ne(batch['product_classified']).fillna(True).to_numpy()]
+            record.rows_out = len(changed)
+        ids_by_label = defaultdict(list)
+        for row_id, label in zip(changed['id'].tolist(), labels[changed.index].tolist()):
+            ids_by_label[label].append(row_id)
+
+        last_id = int(batch['id'].iloc[-1])
+        rows_read += len(batch)
+        rows_updated += len(changed)
+        summary_span = _widen(summary_span, changed['date'])
+
+        with stage('update', rows_in=len(changed)) as record, db_kbe.db_engine.begin() as connection:
+            record.rows_out = len(changed)
+            for label, ids in ids_by_label.items():
+                connection.execute(update(table).where(table.c.id.in_(ids)).values(product_classified=label))
+            connection.execute(
+                update(KBEBackfillCheckpoint)
+                .where(KBEBackfillCheckpoint.job_name == BACKFILL_JOB_NAME)
+                .values(last_id=last_id, rows_updated=rows_updated, summary_from=summary_span[0], summary_to=summary_span[1])
+            )
+
+        logger.info(f"Classified {rows_read} rows up to id {last_id}, {rows_updated} updated ({time.time() - start_time:.1f}s).")
+
+    with db_kbe.db_engine.begin() as connection:
+        connection.execute(
+            update(KBEBackfillCheckpoint)
+            .where(KBEBackfillCheckpoint.job_name == BACKFILL_JOB_NAME)
+            .values(completed_at=func.now())
+        )
+
+    logger.info(f"Product classification completed: {rows_read} rows read, {rows_updated} updated.")
+    _refresh_summary(db_kbe, summary_span)
+    return rows_updated
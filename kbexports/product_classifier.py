@@ -0,0 +1,142 @@
+import re
+from typing import Dict, List, Optional
+import pandas as pd
+
+
+UNCLASSIFIED = 'UNCLASSIFIED'
+
+# Rules are tried top to bottom; the first rule whose include pattern matches and whose
+# exclude pattern does not wins.
+CLASSIFICATION_RULES = [
+    {
+        'label': 'COCONUT',
+        'include': r'\bcoconut\b',
+        'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
+    },
+    {
+        'label': 'FRESH GARLIC',
+        'include': r'\bgarlic\b',
+        'exclude': r'\b(slice|frozen|cut|dry|dried|powder|ice)\b',
+    },
+    {
+        'label': 'MIX FRUITS & VEG',
+        'include': r'\b(mixed fruits|mixed vegetables|mix fruit|mix vegetables|mix vegitable|mixed vegetables)\b',
+        'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
+    },
+    {
+        'label': 'DRUMSTICK',
+        'include': r'\bdrumsticks?\b',
+        'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
+    },
+    {
+        'label': 'DRAGON FRUITS',
+        'include': r'\bdragon\b',
+        'exclude': r'\b(slice|frozen|cut|dry|dried|powder|milk|chunk|juice|ice)\b',
+    },
+    {
+        'label': 'MANGO',
+        'include': r'\b(mango|alphanso)\b',
+        'exclude': r'\b(pulp|slice|frozen|cut mango|pickle|papad|cut|dry|dried|powder|raw|juice)\b',
+    },
+    {
+        'label': 'BABY CORN',
+        'include': r'\b(baby|babycorn|baby corn)\b',
+        'exclude': r'\b(okra|potato|frozen|iqf|cut|brine|acetic|acid|onion|bananas?|wheat|babyvita|bitter)\b',
+    },
+    {
+        'label': 'POMEGRANATES',
+        'include': r'\b(pome|anar|pomegranate)\b',
+        'exclude': r'\b(aril|pulp|arils|dhana|dana|frozen|iqf|cut|brine)\b',
+    },
+    {
+        'label': 'POMEGRANATES ARILS',
+        'include': r'\b(aril|pomegranate arils|arils)\b',
+        'exclude': r'\b(vinegar|frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
+    },
+    {
+        'label': 'OKRA',
+        'include': r'\b(okra|lady finger)\b',
+        'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
+    },
+    {
+        'label': 'CHILLI',
+        'include': r'\b(chilli|chilly)\b',
+        'exclude': r'\b(frozen|iqf|cut|brine|acetic|acid|dry|dried)\b',
+    },
+    {
+        'label': 'GUAVA',
+        'include': r'\b(guava|peru)\b',
+        'exclude': r'\b(pulp|iqf|cut|brine|acetic|acid|dry|dried)\b',
+    },
+    {
+        'label': 'CHICKOO',
+        'include': r'\b(sapota|chickoo)\b',
+        'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
+    },
+    {
+        'label': 'DUDHI',
+        'include': r'\b(dudhi|bottle gourd|bottleguard)\b',
+        'exclude': r'\b(pulp|slice|iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
+    },
+    {
+        'label': 'ONION',
+        'include': r'\b(red onion|shallot|small onion|onion)\b',
+        'exclude': r'\b(iqf|cut|brine|acetic|acid|dry|dried|frozen)\b',
+    },
+]
+
+
+class ProductClassifier:
+    """
+    Classifies product descriptions against an ordered rule list in a single regex pass.
+
+    Every rule becomes one branch of a combined pattern: a named group holding an include
+    lookahead and an exclude negative lookahead. The regex engine tries branches in rule
+    order, so the first rule that accepts a description is the one that matches, and
+    ``lastgroup`` names it. Descriptions are classified once per unique value and mapped back.
+    """
+
+    def __init__(self, rules: Optional[List[Dict[str, str]]] = None, default: str = UNCLASSIFIED):
+        self.rules = rules if rules is not None else CLASSIFICATION_RULES
+        self.default = default
+        self.labels = {f"r{i}": rule['label'] for i, rule in enumerate(self.rules)}
+        branches = [
+            f"(?P<r{i}>(?=.*?{rule['include']})(?!.*?{rule['exclude']}))"
+            for i, rule in enumerate(self.rules)
+        ]
+        self.pattern = re.compile("|".join(branches), re.IGNORECASE | re.DOTALL)
+
+    def classify(self, description) -> str:
+        """
+        Args:
+            description: A single product description (None/NaN classify as the default).
+
+        Returns:
+            str: The label of the first matching rule, or the default label.
+        """
+        if description is None or pd.isna(description):
+            return self.default
+        match = self.pattern.match(str(description))
+        return self.labels[match.lastgroup] if match else self.default
+
+    def classify_series(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Args:
+            descriptions (pd.Series): Product descriptions.
+
+        Returns:
+            pd.Series: Labels aligned with ``descriptions``.
+        """
+        unique = descriptions.dropna().unique()
+        labels = {description: self.classify(description) for description in unique}
+        return descriptions.map(labels).fillna(self.default).astype('string')
+
+
+_default_classifier = None
+
+
+def get_classifier() -> ProductClassifier:
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = ProductClassifier()
+    return _default_classifier
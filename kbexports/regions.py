@@ -0,0 +1,101 @@
+import re
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import pycountry_convert as pc
+from logging_config import logger
+
+
+UNKNOWN_REGION = 'Unknown'
+
+# Country spellings seen in customs exports that pycountry_convert does not resolve, keyed by
+# the cleaned form (letters and spaces only, title case) and mapped to a name it does resolve.
+COUNTRY_ALIASES = {
+    'U Arab Emts': 'United Arab Emirates',
+    'Uae': 'United Arab Emirates',
+    'Usa': 'United States',
+    'U S A': 'United States',
+    'United States Of America': 'United States',
+    'Uk': 'United Kingdom',
+    'U K': 'United Kingdom',
+    'Korea Rp': 'South Korea',
+    'Korea Dp Rp': 'North Korea',
+    'Netherland': 'Netherlands',
+    'Saudi Arab': 'Saudi Arabia',
+    'Bangladesh Pr': 'Bangladesh',
+    'China P Rp': 'China',
+    'Vietnam Soc Rep': 'Vietnam',
+    'Tanzania Rep': 'Tanzania',
+    'Dominic Rep': 'Dominican Republic',
+    'Congo D Rep': 'Democratic Republic of the Congo',
+    'Congo P Rep': 'Congo',
+    'Bosniahrzgovin': 'Bosnia and Herzegovina',
+    'Papua N Gna': 'Papua New Guinea',
+    'Trinidad': 'Trinidad and Tobago',
+    'St Kitt N A': 'Saint Kitts and Nevis',
+    'St Lucia': 'Saint Lucia',
+    'St Vincent': 'Saint Vincent and the Grenadines',
+    'Cote D Ivoire': "Côte d'Ivoire",
+}
+
+_NON_LETTERS = re.compile(r'[^A-Z ]')
+
+
+def clean_country_name(name) -> str:
+    return _NON_LETTERS.sub('', str(name).upper()).strip().title()
+
+
+def _lookup_continent(country_name: str) -> Optional[str]:
+    try:
+        country_code = pc.country_name_to_country_alpha2(country_name, cn_name_format="default")
+        continent_code = pc.country_alpha2_to_continent_code(country_code)
+        return pc.convert_continent_code_to_continent_name(continent_code)
+    except (KeyError, ValueError):
+        return None
+
+
+class ContinentResolver:
+    """
+    Memoised country -> continent lookup for the region column.
+
+    Each distinct cleaned country name is resolved through the alias table and
+    pycountry_convert once per process; misses resolve to 'Unknown' and are logged once.
+    """
+
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.aliases = dict(COUNTRY_ALIASES)
+        self.aliases.update(aliases or {})
+        self._cache: Dict[str, str] = {}
+
+    def add_alias(self, cleaned_name: str, country_name: str) -> None:
+        self.aliases[cleaned_name] = country_name
+        self._cache.pop(cleaned_name, None)
+
+    def resolve(self, cleaned_name: str) -> str:
+        continent = self._cache.get(cleaned_name)
+        if continent is None:
+            continent = _lookup_continent(self.aliases.get(cleaned_name, cleaned_name))
+            if continent is None:
+                logger.warning(f"No continent for country '{cleaned_name}'; region set to '{UNKNOWN_REGION}'.")
+                continent = UNKNOWN_REGION
+            self._cache[cleaned_name] = continent
+        return continent
+
+    def region_series(self, countries: pd.Series) -> pd.Series:
+        """
+        Args:
+            countries (pd.Series): Raw foreign_country values.
+
+        Returns:
+            pd.Series: Continent names aligned with ``countries``.
+        """
+        codes, uniques = pd.factorize(countries, use_na_sentinel=False)
+        regions = np.array([self.resolve(clean_country_name(name)) for name in uniques], dtype=object)
+        return pd.Series(regions[codes], index=countries.index, name='region')
+
+
+continent_resolver = ContinentResolver()
+
+
+def get_continent(country_name) -> str:
+    return continent_resolver.resolve(clean_country_name(country_name))
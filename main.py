@@ -1,53 +1,62 @@
-from models.base import KBEBase, KBBIOBase
-from models.kbe.kbe_models import KBEImportExport, KBEImportExportMapping
-from models.shiprocket.shiprocket_models import ShiprocketOrder
-import pandas as pd
-from sql_connector import  kbbio_engine, kbe_engine, kbbio_connector, kbe_connector
-from dbcrud import DatabaseCrud
-from Shiprocket.shiprocket import get_all_orders
-from datetime import datetime, date, timedelta
-from logging_config import logger
-from kbexports.kbe_processor import custom_data_processor
-from typing import Optional
-from utils.common_utils import clean_text
-from sqlalchemy import delete, func
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker
-import glob
 import os
-from kbexports.kbe_processor import kbe_custom_import_export,product_classification
-import re
+import glob
 import platform
-from itertools import chain
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Job dependencies (pandas, SQLAlchemy, models, Shiprocket, kbexports) are imported inside
+# each job so a cron invocation only pays for the modules its subcommand uses.
 
 
 def shiprocket_daily(from_days:int):
-    KBBIOBase.metadata.create_all(bind=kbbio_engine)
-    db_kbbio = DatabaseCrud(kbbio_connector)
+    from models.base import KBBIOBase
+    from sql_connector import get_connector
+    from dbcrud import DatabaseCrud
+    from Shiprocket.shiprocket import get_all_orders
+    from utils.instrumentation import pipeline_run
+    from logging_config import logger
+
+    db_kbbio = DatabaseCrud(get_connector('kbbio'))
+    KBBIOBase.metadata.create_all(bind=db_kbbio.db_engine)
     from_date = datetime.today() - timedelta(days=from_days)
     to_date = datetime.today()
     from_date_str = from_date.strftime('%Y-%m-%d')
     to_date_str = to_date.strftime('%Y-%m-%d')
     try:
-        df = get_all_orders(start_date=from_date_str, end_date=to_date_str)
-        if df.empty:
-            logger.info("No orders found to process.")
-            return
-        
-        shiprocket_ids = df['shiprocket_id'].dropna().unique().tolist()
+        with pipeline_run('shiprocket-replace-window', database='kbbio'):
+            df = get_all_orders(start_date=from_date_str, end_date=to_date_str)
+            if df.empty:
+                logger.info("No orders found to process.")
+                return
+
+            shiprocket_ids = df['shiprocket_id'].dropna().unique().tolist()
+
+            if not shiprocket_ids:
+                logger.info("No Shiprocket IDs found in data. Skipping deletion step.")
 
-        if shiprocket_ids:
-            db_kbbio.delete_shiprocket_id_wise(shiprocket_ids,commit=True)
-        else:
-            logger.info("No Shiprocket IDs found in data. Skipping deletion step.")
-        
-        db_kbbio.import_data(table_name='shiprocket_orders',df=df,commit=True)
+            db_kbbio.replace_range(
+                table_name='shiprocket_orders',
+                key_column='shiprocket_id',
+                range_or_ids=shiprocket_ids,
+                df=df,
+                commit=True,
+                staging=True,
+            )
 
     except Exception as e:
         logger.error("Shiprocket sync failed", exc_info=True)
 
 
-def folder_path_wise_custom_data_import_in_db(path: str):
+def shiprocket_sync(full: bool = False):
+    from Shiprocket.shiprocket_sync import shiprocket_incremental_sync
+    from utils.instrumentation import pipeline_run
+
+    with pipeline_run('shiprocket-sync', database='kbbio'):
+        shiprocket_incremental_sync(full=full)
+
+
+def custom_files_under(path: str) -> list:
     current_os = platform.system()
 
     if current_os == "Linux" and path[1:3] == ":\\":
@@ -58,22 +67,159 @@ def folder_path_wise_custom_data_import_in_db(path: str):
     path = os.path.normpath(path)
 
     all_files = glob.glob(os.path.join(path, "**", "*.*"), recursive=True)
-    valid_files = [f for f in all_files if f.lower().endswith((".xlsx", ".csv"))]
+    return [f for f in all_files if f.lower().endswith((".xlsx", ".csv"))]
+
+
+def folder_path_wise_custom_data_import_in_db(path: str, chunksize: Optional[int] = None, workers: int = 1, force: bool = False):
+    from logging_config import logger
+
+    if chunksize and workers > 1:
+        logger.warning(f"Streaming with chunksize={chunksize} imports files one at a time; workers={workers} is ignored.")
+
+    valid_files = custom_files_under(path)
 
     if not valid_files:
         logger.info(f"[INFO] No Excel or CSV files found in path: {path}")
         return
 
-    for file in valid_files:
-        logger.info(f"[PROCESSING] {file}")
-        try:
-            kbe_custom_import_export(file=file, custom_data=True)
-        except Exception as e:
-            logger.error(f"[ERROR] Failed to process file: {file}")
-            logger.error(f"Reason: {e}")
-            continue
+    from models.base import KBEBase
+    from sql_connector import get_connector
+    from dbcrud import DatabaseCrud
+    from kbexports.kbe_processor import import_custom_files, import_custom_files_parallel, log_import_summary
+    from kbexports.ingest_manifest import partition_unchanged, record_import, log_skipped, overlapping_reimports
+    from utils.instrumentation import pipeline_run
+
+    with pipeline_run('kbe-import', database='kbe'):
+        db_kbe = DatabaseCrud(get_connector('kbe'))
+        KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+        fingerprints, skipped = partition_unchanged(db_kbe, valid_files, force=force)
+        log_skipped(skipped)
+
+        if not fingerprints:
+            logger.info("[INFO] All files are unchanged since their last import.")
+            return
+
+        def import_and_record(batch):
+            files = [fingerprint.path for fingerprint in batch]
+            if workers > 1 and not chunksize:
+                summaries = import_custom_files_parallel(files, workers=workers)
+            else:
+                summaries = import_custom_files(files, chunksize=chunksize)
+
+            for fingerprint, summary in zip(batch, summaries):
+                if summary.error is None and summary.summary_stale:
+                    logger.warning(f"[NOT RECORDED] {summary.file}: monthly summary refresh failed; it will be imported again next run.")
+                elif summary.error is None:
+                    record_import(db_kbe, fingerprint, summary.start_date, summary.end_date, summary.rows)
+            return summaries
+
+        summaries = import_and_record(fingerprints)
+
+        # Replacing a changed file's date window also deletes the rows of skipped files whose
+        # windows overlap it, so those are imported again.
+        requeued = overlapping_reimports(db_kbe, valid_files, summaries, skipped)
+        if requeued:
+            logger.info(f"Re-importing {len(requeued)} files whose date windows overlap a replaced window.")
+            summaries += import_and_record(requeued)
+
+        log_import_summary(summaries)
+
+
+def reclassify_products(batch_size: int = 5000, only_pending: bool = False, restart: bool = False):
+    from kbexports.product_backfill import product_classification
+    from utils.instrumentation import pipeline_run
+
+    with pipeline_run('kbe-reclassify', database='kbe'):
+        product_classification(batch_size=batch_size, only_pending=only_pending, restart=restart)
+
+
+def rebuild_summary(start: Optional[str] = None, end: Optional[str] = None):
+    from models.base import KBEBase
+    from sql_connector import get_connector
+    from dbcrud import DatabaseCrud
+    from kbexports.monthly_summary import rebuild_monthly_summary
+    from utils.instrumentation import pipeline_run
+
+    with pipeline_run('kbe-summary', database='kbe'):
+        db_kbe = DatabaseCrud(get_connector('kbe'))
+        KBEBase.metadata.create_all(bind=db_kbe.db_engine)
+        rebuild_monthly_summary(db_kbe, start, end)
+
+
+def staging_cache_command(action: str, path: Optional[str] = None):
+    from utils.staging_cache import staging_cache
+    from logging_config import logger
+
+    if action == "clear":
+        logger.info(f"Removed {staging_cache.clear()} staging cache entries from {staging_cache.directory}.")
+    elif action == "prewarm":
+        files = custom_files_under(path)
+        logger.info(f"Staged {staging_cache.prewarm(files)} of {len(files)} files into {staging_cache.directory}.")
+
+
+def sync_indexes(dry_run: bool = False):
+    from models.base import KBEBase, KBBIOBase
+    import models.kbe.kbe_models
+    import models.shiprocket.shiprocket_models
+    import models.pipeline.pipeline_models
+    from sql_connector import get_connector
+    from dbcrud import DatabaseCrud
+
+    for name, base in (('kbe', KBEBase), ('kbbio', KBBIOBase)):
+        db = DatabaseCrud(get_connector(name))
+        db.create_missing_columns(base.metadata, dry_run=dry_run)
+        db.create_missing_indexes(base.metadata, dry_run=dry_run)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="KBE and KBBIO data jobs. Runs the incremental Shiprocket sync when no command is given.")
+    parser.set_defaults(handler=lambda args: shiprocket_sync())
+    subparsers = parser.add_subparsers(dest="command")
+
+    sync_parser = subparsers.add_parser("shiprocket-sync", help="Incremental Shiprocket order sync.")
+    sync_parser.add_argument("--full", action="store_true", help="Run a deep reconciliation of the last 180 days now.")
+    sync_parser.add_argument("--replace-window", type=int, metavar="DAYS", help="Legacy mode: delete and reload every order from the last DAYS days.")
+    sync_parser.set_defaults(handler=lambda args: shiprocket_daily(args.replace_window) if args.replace_window else shiprocket_sync(full=args.full))
+
+    import_parser = subparsers.add_parser("kbe-import", help="Import every customs .xlsx/.csv file under a folder.")
+    import_parser.add_argument("path", help="Folder to scan recursively (Windows drive paths are mapped under /mnt on Linux).")
+    import_parser.add_argument("--chunksize", type=int, help="Stream each file in chunks of this many rows to bound memory.")
+    import_parser.add_argument("--workers", type=int, default=1, help="Parse and clean files in this many processes (not with --chunksize).")
+    import_parser.add_argument("--force", action="store_true", help="Re-import files even if unchanged since their last import.")
+    import_parser.set_defaults(handler=lambda args: folder_path_wise_custom_data_import_in_db(args.path, chunksize=args.chunksize, workers=args.workers, force=args.force))
+
+    classify_parser = subparsers.add_parser("kbe-reclassify", aliases=["classify-products"], help="Backfill product_classified in resumable batches.")
+    classify_parser.add_argument("--batch-size", type=int, default=5000, help="Rows read and updated per batch.")
+    classify_parser.add_argument("--only-pending", action="store_true", help="Only rows that are unclassified or new since the last completed run.")
+    classify_parser.add_argument("--restart", action="store_true", help="Ignore an unfinished checkpoint and start from the first row.")
+    classify_parser.set_defaults(handler=lambda args: reclassify_products(args.batch_size, only_pending=args.only_pending, restart=args.restart))
+
+    summary_parser = subparsers.add_parser("kbe-summary", help="Rebuild kbe_monthly_summary for a date window (default: all data).")
+    summary_parser.add_argument("--start", help="First date, YYYY-MM-DD.")
+    summary_parser.add_argument("--end", help="Last date, YYYY-MM-DD.")
+    summary_parser.set_defaults(handler=lambda args: rebuild_summary(args.start, args.end))
+
+    cache_parser = subparsers.add_parser("staging-cache", help="Manage the Parquet staging cache of parsed workbooks.")
+    cache_parser.add_argument("action", choices=["prewarm", "clear"])
+    cache_parser.add_argument("path", nargs="?", help="Folder to prewarm (same layout as kbe-import).")
+    cache_parser.set_defaults(handler=lambda args: staging_cache_command(args.action, args.path))
+
+    indexes_parser = subparsers.add_parser("sync-indexes", help="Add model indexes and nullable columns missing from existing tables.")
+    indexes_parser.add_argument("--dry-run", action="store_true", help="Only log the indexes and columns that would be created.")
+    indexes_parser.set_defaults(handler=lambda args: sync_indexes(dry_run=args.dry_run))
+
+    return parser
+
 
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "staging-cache" and args.action == "prewarm" and not args.path:
+        parser.error("staging-cache prewarm requires a path")
+    if args.command == "kbe-import" and args.chunksize and args.workers > 1:
+        parser.error("kbe-import --chunksize streams files one at a time and cannot be combined with --workers")
+    args.handler(args)
 
 
 if __name__=="__main__":
-    shiprocket_daily(180)
+    main()
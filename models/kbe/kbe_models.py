@@ -1,9 +1,16 @@
 from models.base import KBEBase
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Date, DateTime, Index
 from sqlalchemy.sql import func
 
 class KBEImportExport(KBEBase):
     __tablename__ = 'kbe_import_export'
+    __table_args__ = (
+        Index('ix_kbe_import_export_date', 'date'),
+        Index('ix_kbe_import_export_hs_code', 'hs_code'),
+        Index('ix_kbe_import_export_product_classified', 'product_classified'),
+        Index('ix_kbe_import_export_foreign_country', 'foreign_country'),
+        Index('ix_kbe_import_export_year_month', 'year', 'month'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date)
@@ -42,6 +49,26 @@ class KBEImportExport(KBEBase):
     created_at = Column(DateTime, server_default=func.now())
 
 
+class KBEMonthlySummary(KBEBase):
+    __tablename__ = 'kbe_monthly_summary'
+    __table_args__ = (
+        Index('ix_kbe_monthly_summary_month_start', 'month_start'),
+        Index('ix_kbe_monthly_summary_product_month', 'product_classified', 'month_start'),
+        Index('ix_kbe_monthly_summary_country_month', 'foreign_country', 'month_start'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    month_start = Column(Date, nullable=False)
+    product_classified = Column(String(255))
+    foreign_country = Column(String(100))
+    indian_exporter_name = Column(String(255))
+    shipments = Column(Integer, nullable=False)
+    quantity = Column(Float)
+    fob_value_inr = Column(Float)
+    fob_value_usd = Column(Float)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 class KBEImportExportMapping(KBEBase):
     __tablename__ = 'kbe_importer_mapping'
 
@@ -51,5 +78,29 @@ class KBEImportExportMapping(KBEBase):
     created_at = Column(DateTime, server_default=func.now())
 
 
+class KBEIngestManifest(KBEBase):
+    __tablename__ = 'kbe_ingest_manifest'
+
+    file_path = Column(String(512), primary_key=True)
+    file_size = Column(BigInteger, nullable=False)
+    file_mtime_ns = Column(BigInteger, nullable=False)  # os.stat().st_mtime_ns, compared exactly
+    content_hash = Column(String(64), nullable=False)
+    start_date = Column(Date, nullable=True)
+    end_date = Column(Date, nullable=True)
+    row_count = Column(Integer, nullable=True)
+    imported_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 
+class KBEBackfillCheckpoint(KBEBase):
+    __tablename__ = 'kbe_backfill_checkpoint'
 
+    job_name = Column(String(50), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    rows_updated = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    pending_since = Column(DateTime, nullable=True)
+    # Date span of relabelled rows whose kbe_monthly_summary months are not refreshed yet.
+    summary_from = Column(Date, nullable=True)
+    summary_to = Column(Date, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+from models.base import KBEBase, KBBIOBase
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
+from sqlalchemy.sql import func
+
+
+class PipelineRunColumns:
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(32), nullable=False, unique=True)
+    pipeline = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime, nullable=False)
+    seconds = Column(Float, nullable=False)
+    error = Column(String(1000), nullable=True)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class KBEPipelineRun(PipelineRunColumns, KBEBase):
+    __tablename__ = 'pipeline_runs'
+    __table_args__ = (
+        Index('ix_pipeline_runs_pipeline_started_at', 'pipeline', 'started_at'),
+    )
+
+
+class KBBIOPipelineRun(PipelineRunColumns, KBBIOBase):
+    __tablename__ = 'pipeline_runs'
+    __table_args__ = (
+        Index('ix_pipeline_runs_pipeline_started_at', 'pipeline', 'started_at'),
+    )
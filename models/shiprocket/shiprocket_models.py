@@ -1,10 +1,13 @@
 from models.base import KBBIOBase
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
 from sqlalchemy.sql import func
 
 
 class ShiprocketOrder(KBBIOBase):
     __tablename__ = 'shiprocket_orders'
+    __table_args__ = (
+        Index('ix_shiprocket_orders_shiprocket_id', 'shiprocket_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     shiprocket_id = Column(String(50), nullable=False)
@@ -56,4 +59,22 @@ class ShiprocketOrder(KBBIOBase):
     delivery_executive_name = Column(String(100), nullable=True)
     rto_risk = Column(String(50), nullable=True)
     pickup_location = Column(String(100), nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class ShiprocketSyncState(KBBIOBase):
+    __tablename__ = 'shiprocket_sync_state'
+
+    job_name = Column(String(50), primary_key=True)
+    last_synced_at = Column(DateTime, nullable=True)
+    last_reconciled_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class ShiprocketOrderState(KBBIOBase):
+    __tablename__ = 'shiprocket_order_state'
+
+    shiprocket_id = Column(String(50), primary_key=True)
+    shiprocket_updated_at = Column(String(50), nullable=True)
+    payload_hash = Column(String(40), nullable=False)
+    synced_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
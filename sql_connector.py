@@ -21,19 +21,43 @@ class DatabaseConnector:
     - host (str): Database host address.
     - port (str): Database port number.
     - database (str): Database name.
-    - engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine for database operations.
+    - engine (sqlalchemy.engine.base.Engine): SQLAlchemy engine for database operations, created on first access.
+    - pool_options (dict): Extra create_engine pool arguments (see pool_options()).
+    - local_infile (bool): Open connections with LOAD DATA LOCAL INFILE enabled (see local_infile()).
 
     Methods:
     - get_db_string(): Returns the database connection string.
     """
 
-    def __init__(self, username, password, host, port, database) -> None:
+    def __init__(self, username, password, host, port, database, pool_options=None, local_infile=False) -> None:
         self.username = username
         self.password = password
         self.host = host
         self.port = port
         self.database = database
-        self.engine = create_engine(self.get_db_string(),isolation_level='READ COMMITTED')
+        self.pool_options = pool_options or {}
+        self.local_infile = local_infile
+        self._engine = None
+
+    @property
+    def engine(self):
+        """SQLAlchemy engine, created on first use. No connection is opened until a query runs."""
+        if self._engine is None:
+            # local_infile lets DatabaseCrud.import_data(method='load_data') stream files to the server,
+            # so it is only switched on for connectors that ask for it.
+            connect_args = {'local_infile': True} if self.local_infile else {}
+            self._engine = create_engine(
+                self.get_db_string(),
+                isolation_level='READ COMMITTED',
+                connect_args=connect_args,
+                **self.pool_options,
+            )
+        return self._engine
+
+    def dispose(self):
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
 
 
     def get_db_string(self):
@@ -56,24 +80,76 @@ USERNAME = os.getenv('DB_USERNAME')
 PASSWORD = os.getenv('DB_PASSWORD')
 HOST = os.getenv('DB_HOST')
 PORT = os.getenv('DB_PORT')
-DATABASE_KBBIO = os.getenv('DATABASE_KBBIO')
-DATABASE_KBE = os.getenv('DATABASE_KBE')
 
-kbbio_connector = DatabaseConnector(USERNAME, PASSWORD, HOST, PORT, DATABASE_KBBIO)
-kbbio_engine = kbbio_connector.engine
-kbbio_connection = kbbio_engine.connect()
+DATABASES = {
+    'kbbio': 'DATABASE_KBBIO',
+    'kbe': 'DATABASE_KBE',
+}
 
 
-kbe_connector = DatabaseConnector(USERNAME, PASSWORD, HOST, PORT, DATABASE_KBE)
-kbe_engine = kbe_connector.engine
-kbe_connection = kbe_engine.connect()
+def _env_setting(name, setting, default):
+    """Reads e.g. KBE_DB_POOL_SIZE, falling back to DB_POOL_SIZE and then `default`."""
+    return os.getenv(f'{name.upper()}_DB_{setting}', os.getenv(f'DB_{setting}', default))
 
 
+def pool_options(name):
+    """
+    Pool settings for one database, from env.
 
+    Each of POOL_SIZE, MAX_OVERFLOW, POOL_RECYCLE (seconds) and POOL_PRE_PING can be set
+    globally as DB_<SETTING> or per database as <NAME>_DB_<SETTING>, e.g. KBE_DB_POOL_SIZE=2.
+    """
+    return {
+        'pool_size': int(_env_setting(name, 'POOL_SIZE', '5')),
+        'max_overflow': int(_env_setting(name, 'MAX_OVERFLOW', '10')),
+        'pool_recycle': int(_env_setting(name, 'POOL_RECYCLE', '3600')),
+        'pool_pre_ping': _env_setting(name, 'POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    }
 
 
+def local_infile(name):
+    """
+    Whether connections to one database may use LOAD DATA LOCAL INFILE.
 
+    Off unless DB_LOCAL_INFILE (or <NAME>_DB_LOCAL_INFILE) is set; only needed for
+    DatabaseCrud.import_data(method='load_data'), and the server must also run with local_infile=ON.
+    """
+    return _env_setting(name, 'LOCAL_INFILE', 'false').lower() in ('1', 'true', 'yes')
 
 
+_connectors = {}
 
 
+def get_connector(name):
+    """
+    Return the DatabaseConnector for 'kbbio' or 'kbe', creating it on first use.
+
+    Connectors are cheap to create; the engine behind one is only built when first used.
+    """
+    if name not in _connectors:
+        if name not in DATABASES:
+            raise KeyError(f"Unknown database '{name}'. Expected one of: {', '.join(DATABASES)}")
+        _connectors[name] = DatabaseConnector(
+            USERNAME, PASSWORD, HOST, PORT, os.getenv(DATABASES[name]),
+            pool_options=pool_options(name), local_infile=local_infile(name),
+        )
+    return _connectors[name]
+
+
+_legacy_connections = {}
+
+
+def __getattr__(attr):
+    # Backward compatibility for the old module-level globals (kbe_connector, kbe_engine,
+    # kbe_connection, ...), resolved lazily instead of at import time.
+    name, _, kind = attr.partition('_')
+    if name in DATABASES and kind in ('connector', 'engine', 'connection'):
+        connector = get_connector(name)
+        if kind == 'connector':
+            return connector
+        if kind == 'engine':
+            return connector.engine
+        if name not in _legacy_connections:
+            _legacy_connections[name] = connector.engine.connect()
+        return _legacy_connections[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+
+from dbcrud import DatabaseCrud
+from models.base import KBEBase, KBBIOBase
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """A DatabaseCrud over a scratch SQLite file holding every KBE and KBBIO table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    KBEBase.metadata.create_all(bind=engine)
+    KBBIOBase.metadata.create_all(bind=engine)
+    yield DatabaseCrud(SimpleNamespace(engine=engine))
+    engine.dispose()
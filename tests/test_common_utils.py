@@ -0,0 +1,92 @@
+import random
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.common_utils import QTY_COLUMNS, calculate_qty, calculate_qty_frame, parse_date_column, parse_date_flexibly
+
+
+PACK_SIZES = [
+    '', '10 KG', '4KG', '25 KG BAGS', '3.5 KGS', '12X200GMS', '6B X 500GMS X 12 PUNNET', '1 X 5 KG',
+    '(250 CTNS)', '200 GM X 10 MAP BAGS', '2 x 3', '5kg', 'LOT 7', '10 12',
+]
+
+
+def test_parse_date_column_matches_scalar_parser():
+    values = pd.Series(['01-Jan-2024', ' 2024-02-03 ', '03/04/2024', datetime(2024, 5, 6), None, 'junk', '01-Jan-2024'])
+
+    parsed, stats = parse_date_column(values)
+
+    expected = [
+        value.date() if isinstance(value, datetime) else parse_date_flexibly(value)
+        for value in values
+    ]
+    assert [None if pd.isna(value) else value.date() for value in parsed] == expected
+    assert stats['%d-%b-%Y'] == 2
+    assert stats['datetime'] == 1
+    assert stats['missing'] == 1
+    assert stats['unparsed'] == 1
+
+
+def test_parse_date_column_all_null():
+    values = pd.Series([np.nan, None], index=[5, 7], name='shipping_date')
+
+    parsed, stats = parse_date_column(values)
+
+    assert parsed.isna().all()
+    assert parsed.dtype == 'datetime64[ns]'
+    assert list(parsed.index) == [5, 7]
+    assert parsed.name == 'shipping_date'
+    assert stats['missing'] == 2
+    assert sum(count for key, count in stats.items() if key != 'missing') == 0
+
+
+def _scalar_qty(descriptions, quantities):
+    rows = [calculate_qty(description, quantity).tolist() for description, quantity in zip(descriptions, quantities)]
+    frame = pd.DataFrame(rows, index=descriptions.index, columns=QTY_COLUMNS)
+    frame[QTY_COLUMNS[:3]] = frame[QTY_COLUMNS[:3]].astype(float)
+    return frame
+
+
+def test_calculate_qty_frame_matches_scalar():
+    rng = random.Random(3)
+    products = ['FRESH GARLIC', 'mango', 'POMEGRANATE ARILS', 'OKRA', 'GUAVA', 'nan']
+    descriptions = [f"{rng.choice(products)} {rng.choice(PACK_SIZES)}".strip() for _ in range(3_000)]
+    descriptions += ['nan', '', '   ', 'GARLIC']
+    # Every quantity calculate_qty accepts without raising, including NaN and the string 'nan'.
+    quantities = [rng.choice([1, 2.5, '40', ' 7 ', 'nan', 'NaN', 'abc', '', np.nan, '1e3']) for _ in descriptions]
+    descriptions, quantities = pd.Series(descriptions, dtype=object), pd.Series(quantities, dtype=object)
+
+    pd.testing.assert_frame_equal(calculate_qty_frame(descriptions, quantities), _scalar_qty(descriptions, quantities))
+
+
+def test_calculate_qty_frame_numeric_quantities():
+    descriptions = pd.Series(['GARLIC 10 KG', 'GARLIC 10 KG', 'MANGO 12X200GMS', 'OKRA'], index=[4, 3, 2, 1])
+    quantities = pd.Series([5.0, np.nan, 0.0, 1.0], index=[4, 3, 2, 1])
+
+    result = calculate_qty_frame(descriptions, quantities)
+
+    pd.testing.assert_frame_equal(result, _scalar_qty(descriptions, quantities))
+    assert result['qty_pattern'].tolist() == ['KG', 'KG', 'OTHER', 'NO NUMBER']
+
+
+def test_calculate_qty_frame_handles_inputs_the_scalar_rejects():
+    # calculate_qty raises TypeError on these; the frame parses a None quantity like NaN
+    # and reports descriptions that are not strings as 'none'.
+    descriptions = pd.Series(['GARLIC 10 KG', None, np.nan, 12], dtype=object)
+    quantities = pd.Series([None, 1, 1, 1], dtype=object)
+
+    result = calculate_qty_frame(descriptions, quantities)
+
+    assert result['qty_pattern'].tolist() == ['KG', 'none', 'none', 'none']
+    assert result.loc[0, 'number1'] == 10.0
+
+
+def test_calculate_qty_scalar_semantics_are_unchanged():
+    assert calculate_qty('GARLIC 10 KG', 'abc').tolist()[3] == 'none'
+    assert calculate_qty('GARLIC 10 KG', 'nan').tolist()[3] == 'KG'
+    assert calculate_qty('GARLIC 10 KG', np.nan).tolist()[3] == 'KG'
+    with pytest.raises(TypeError):
+        calculate_qty('GARLIC 10 KG', None)
@@ -0,0 +1,202 @@
+import logging
+from types import SimpleNamespace
+
+import pandas as pd
+from sqlalchemy import Column, Date, Integer, MetaData, Table, create_engine, func, inspect, select
+
+from dbcrud import DELETE_BATCH_SIZE, DatabaseCrud
+from models.base import KBEBase
+from models.kbe.kbe_models import KBEImportExport
+from models.shiprocket.shiprocket_models import ShiprocketOrder
+
+
+def _orders(ids, status):
+    return pd.DataFrame({'shiprocket_id': [str(shiprocket_id) for shiprocket_id in ids], 'status': status})
+
+
+def _statuses(db):
+    with db.db_engine.connect() as connection:
+        return dict(connection.execute(
+            select(ShiprocketOrder.status, func.count()).group_by(ShiprocketOrder.status)
+        ).all())
+
+
+def _staging_tables(db):
+    return [name for name in inspect(db.db_engine).get_table_names() if '_staging' in name]
+
+
+def test_replace_range_deletes_id_lists_in_logged_batches(sqlite_db, caplog):
+    ids = list(range(DELETE_BATCH_SIZE * 2 + 10))
+    sqlite_db.import_data('shiprocket_orders', _orders(ids, 'NEW'), commit=True, method='executemany')
+    changed = ids[5:]
+
+    with caplog.at_level(logging.INFO):
+        result = sqlite_db.replace_range(
+            'shiprocket_orders', 'shiprocket_id', [str(shiprocket_id) for shiprocket_id in changed],
+            _orders(changed, 'DELIVERED'), commit=True, method='executemany',
+        )
+
+    assert result.committed
+    assert result.rows_deleted == len(changed)
+    assert result.rows_inserted == len(changed)
+    assert _statuses(sqlite_db) == {'NEW': 5, 'DELIVERED': len(changed)}
+    batch_lines = [record.message for record in caplog.records if record.message.startswith('Delete batch')]
+    assert len(batch_lines) == 3
+    assert batch_lines[-1].startswith("Delete batch 3/3 on 'shiprocket_orders'")
+
+
+def test_replace_range_keeps_old_rows_when_the_load_fails(sqlite_db):
+    sqlite_db.import_data('shiprocket_orders', _orders(range(10), 'NEW'), commit=True, method='executemany')
+    broken = pd.DataFrame({'shiprocket_id': ['1'], 'no_such_column': [1]})
+
+    result = sqlite_db.replace_range(
+        'shiprocket_orders', 'shiprocket_id', [str(shiprocket_id) for shiprocket_id in range(10)],
+        broken, commit=True, method='executemany',
+    )
+
+    assert not result.committed
+    assert _statuses(sqlite_db) == {'NEW': 10}
+
+
+def test_create_missing_columns_adds_nullable_model_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    old_layout = MetaData()
+    Table('kbe_import_export', old_layout, Column('id', Integer, primary_key=True), Column('date', Date))
+    old_layout.create_all(bind=engine)
+    db = DatabaseCrud(SimpleNamespace(engine=engine))
+
+    assert 'kbe_import_export.region' in db.create_missing_columns(KBEBase.metadata, dry_run=True)
+    assert 'region' not in {column['name'] for column in inspect(engine).get_columns('kbe_import_export')}
+
+    added = db.create_missing_columns(KBEBase.metadata)
+
+    live = {column['name'] for column in inspect(engine).get_columns('kbe_import_export')}
+    assert {'region', 'product_description', 'created_at'} <= live
+    assert len(added) == len(KBEImportExport.__table__.columns) - 2
+    assert db.create_missing_columns(KBEBase.metadata) == []
+    engine.dispose()
+
+
+def _typed_orders():
+    return pd.DataFrame({
+        'shiprocket_id': ['1', '2', '3', '4', '5'],
+        'shiprocket_created_at': pd.to_datetime(['2024-01-05 10:30', None, '2024-02-01 00:00', '2024-02-02 00:00', '2024-03-01 00:00']),
+        'order_total': [100.5, float('nan'), 0.0, 12.25, 3.0],
+        'status': ['NEW', None, 'DELIVERED', 'NEW', 'RTO'],
+    })
+
+
+def _stored_orders(db):
+    with db.db_engine.connect() as connection:
+        return connection.execute(select(
+            ShiprocketOrder.shiprocket_id, ShiprocketOrder.shiprocket_created_at,
+            ShiprocketOrder.order_total, ShiprocketOrder.status,
+        ).order_by(ShiprocketOrder.shiprocket_id)).all()
+
+
+def test_executemany_batches_rows_and_stores_missing_values_as_null(sqlite_db):
+    result = sqlite_db.import_data('shiprocket_orders', _typed_orders(), commit=True, method='executemany', batch_size=2)
+
+    assert result.committed
+    assert (result.rows_inserted, result.chunks) == (5, 3)
+    stored = _stored_orders(sqlite_db)
+    assert stored[0] == ('1', pd.Timestamp('2024-01-05 10:30').to_pydatetime(), 100.5, 'NEW')
+    assert stored[1] == ('2', None, None, None)
+    assert len(stored) == 5
+
+
+def test_load_data_falls_back_to_executemany_off_mysql(sqlite_db, caplog):
+    with caplog.at_level(logging.WARNING):
+        result = sqlite_db.import_data('shiprocket_orders', _typed_orders(), commit=True, method='load_data', batch_size=2)
+
+    assert result.committed
+    assert (result.rows_inserted, result.chunks) == (5, 3)
+    assert "falling back to executemany for 'shiprocket_orders'" in caplog.text
+    stored = _stored_orders(sqlite_db)
+    assert stored[0] == ('1', pd.Timestamp('2024-01-05 10:30').to_pydatetime(), 100.5, 'NEW')
+    assert stored[1] == ('2', None, None, None)
+
+
+def test_staged_replace_swaps_id_lists_after_loading(sqlite_db, caplog):
+    ids = list(range(DELETE_BATCH_SIZE + 20))
+    sqlite_db.import_data('shiprocket_orders', _orders(ids, 'NEW'), commit=True, method='executemany')
+    changed = [str(shiprocket_id) for shiprocket_id in ids[10:]]
+
+    with caplog.at_level(logging.INFO):
+        result = sqlite_db.replace_range(
+            'shiprocket_orders', 'shiprocket_id', changed, _orders(changed, 'DELIVERED'),
+            commit=True, method='executemany', staging=True,
+        )
+
+    assert result.committed
+    assert (result.rows_deleted, result.rows_inserted) == (len(changed), len(changed))
+    assert _statuses(sqlite_db) == {'NEW': 10, 'DELIVERED': len(changed)}
+    assert len([record for record in caplog.records if record.message.startswith('Delete batch')]) == 2
+    assert _staging_tables(sqlite_db) == []
+
+
+def test_delete_in_batches_commits_each_batch(sqlite_db, caplog):
+    ids = [str(shiprocket_id) for shiprocket_id in range(25)]
+    sqlite_db.import_data('shiprocket_orders', _orders(ids, 'NEW'), commit=True, method='executemany')
+
+    with caplog.at_level(logging.INFO):
+        deleted = sqlite_db.delete_shiprocket_id_wise(ids[:20] + ids[:5], commit=True, batch_size=8)
+
+    assert deleted == 20
+    assert _statuses(sqlite_db) == {'NEW': 5}
+    assert len([record for record in caplog.records if record.message.startswith('Delete batch')]) == 3
+
+
+def _customs(start, end, hs_code):
+    dates = pd.date_range(start, end, freq='D')
+    return pd.DataFrame({'date': dates, 'hs_code': hs_code, 'quantity': range(len(dates))})
+
+
+def _hs_codes_by_month(db):
+    month = func.substr(KBEImportExport.date, 1, 7)
+    with db.db_engine.connect() as connection:
+        return connection.execute(
+            select(month, KBEImportExport.hs_code, func.count()).group_by(month, KBEImportExport.hs_code).order_by(month, KBEImportExport.hs_code)
+        ).all()
+
+
+def test_staged_replace_derives_the_window_from_the_staged_rows(sqlite_db):
+    sqlite_db.import_data('kbe_import_export', _customs('2024-01-01', '2024-03-31', 'OLD'), commit=True, method='executemany')
+    chunks = [_customs('2024-02-01', '2024-02-14', 'NEW'), _customs('2024-02-15', '2024-02-29', 'NEW')]
+
+    result = sqlite_db.replace_range(
+        'kbe_import_export', 'date', None, iter(chunks), commit=True, method='executemany', staging=True,
+    )
+
+    assert result.committed
+    assert result.chunks == 2
+    assert (result.rows_deleted, result.rows_inserted) == (29, 29)
+    assert [str(day)[:10] for day in result.key_range] == ['2024-02-01', '2024-02-29']
+    assert _hs_codes_by_month(sqlite_db) == [('2024-01', 'OLD', 31), ('2024-02', 'NEW', 29), ('2024-03', 'OLD', 31)]
+    assert _staging_tables(sqlite_db) == []
+
+
+def test_staging_tables_are_unique_per_run(sqlite_db):
+    table = KBEImportExport.__table__
+    with sqlite_db.db_engine.connect() as connection:
+        first = sqlite_db._create_staging_table(connection, table, ['date', 'hs_code'])
+        second = sqlite_db._create_staging_table(connection, table, ['date', 'hs_code'])
+        with connection.begin():
+            first.drop(connection)
+            second.drop(connection)
+
+    assert first.name != second.name
+    assert first.name.startswith('kbe_import_export_staging_')
+
+
+def test_staging_table_is_dropped_when_the_staged_load_fails(sqlite_db):
+    sqlite_db.import_data('shiprocket_orders', _orders(range(10), 'NEW'), commit=True, method='executemany')
+    broken = pd.DataFrame({'shiprocket_id': ['1'], 'no_such_column': [1]})
+
+    result = sqlite_db.replace_range(
+        'shiprocket_orders', 'shiprocket_id', ['1'], broken, commit=True, method='executemany', staging=True,
+    )
+
+    assert not result.committed
+    assert _statuses(sqlite_db) == {'NEW': 10}
+    assert _staging_tables(sqlite_db) == []
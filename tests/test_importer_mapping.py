@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from sqlalchemy import insert, update
+
+from kbexports.importer_mapping import ImporterMapping
+from kbexports.name_normaliser import foreign_importer_normaliser
+from models.kbe.kbe_models import KBEImportExportMapping
+
+
+def _add(db, *pairs):
+    with db.db_engine.begin() as connection:
+        connection.execute(insert(KBEImportExportMapping), [
+            {'original_importer_name': original, 'standardized_importer_name': standardized}
+            for original, standardized in pairs
+        ])
+
+
+@pytest.fixture
+def mapping(sqlite_db):
+    _add(sqlite_db, ('  impex foods inc. ', 'IMPEX GROUP'))
+    return ImporterMapping(sqlite_db.db_engine)
+
+
+def _names(*raw):
+    # apply() receives foreign_importer_name after the ingest path normalised it.
+    return foreign_importer_normaliser.normalise_series(pd.Series(raw))
+
+
+def test_raw_sheet_spellings_match_normalised_names(mapping):
+    assert mapping.apply(_names('IMPEX FOODS INC', 'impex foods inc.')).tolist() == ['IMPEX GROUP', 'IMPEX GROUP']
+
+
+def test_unmapped_names_pass_through(mapping):
+    names = pd.Series(['IMPEX FOODS INC', 'ACME TRADING LLC', None])
+
+    mapped = mapping.apply(names)
+
+    assert mapped.tolist()[:2] == ['IMPEX GROUP', 'ACME TRADING LLC']
+    assert pd.isna(mapped[2])
+
+
+def test_reloads_when_rows_are_added_or_removed(mapping, sqlite_db):
+    assert mapping.apply(_names('ACME TRADING LLC')).tolist() == ['ACME TRADING LLC']
+
+    _add(sqlite_db, ('acme trading llc', 'ACME'))
+    assert mapping.apply(_names('ACME TRADING LLC')).tolist() == ['ACME']
+
+    # A re-imported sheet: later rows win for the same original name.
+    _add(sqlite_db, ('ACME TRADING LLC', 'ACME HOLDINGS'))
+    assert mapping.apply(_names('ACME TRADING LLC')).tolist() == ['ACME HOLDINGS']
+
+
+def test_in_place_edits_need_invalidate(mapping, sqlite_db):
+    names = _names('impex foods inc')
+    assert mapping.apply(names).tolist() == ['IMPEX GROUP']
+    with sqlite_db.db_engine.begin() as connection:
+        connection.execute(update(KBEImportExportMapping).values(standardized_importer_name='IMPEX WORLDWIDE'))
+
+    # Row count and max id are unchanged, so the cached index is still used.
+    assert mapping.apply(names).tolist() == ['IMPEX GROUP']
+    mapping.invalidate()
+    assert mapping.apply(names).tolist() == ['IMPEX WORLDWIDE']
+
+
+def test_blank_standardized_names_are_ignored(sqlite_db):
+    _add(sqlite_db, ('acme trading llc', '  '), ('impex foods inc', None))
+
+    assert ImporterMapping(sqlite_db.db_engine).apply(_names('ACME TRADING LLC', 'IMPEX FOODS INC')).tolist() == [
+        'ACME TRADING LLC', 'IMPEX FOODS INC',
+    ]
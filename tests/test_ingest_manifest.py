@@ -0,0 +1,110 @@
+import os
+from datetime import date
+
+from sqlalchemy import delete, func, select
+
+import sql_connector
+from benchmarks.generators import make_customs_frame
+from kbexports.ingest_manifest import files_to_reimport, load_manifest, manifest_key, partition_unchanged, record_import
+from models.kbe.kbe_models import KBEImportExport
+
+
+def _write(path, text='a,b\n1,2\n'):
+    path.write_text(text)
+    return str(path)
+
+
+def test_unchanged_file_is_skipped_on_exact_mtime(sqlite_db, tmp_path):
+    file = _write(tmp_path / 'customs.csv')
+    to_import, skipped = partition_unchanged(sqlite_db, [file])
+    assert [fingerprint.path for fingerprint in to_import] == [file]
+    record_import(sqlite_db, to_import[0], None, None, 1)
+
+    to_import, skipped = partition_unchanged(sqlite_db, [file])
+
+    assert to_import == []
+    assert skipped == [file]
+    assert load_manifest(sqlite_db, [file])[manifest_key(file)].file_mtime_ns == os.stat(file).st_mtime_ns
+
+
+def test_mtime_moved_by_one_nanosecond_is_detected(sqlite_db, tmp_path):
+    file = _write(tmp_path / 'customs.csv')
+    to_import, _ = partition_unchanged(sqlite_db, [file])
+    record_import(sqlite_db, to_import[0], None, None, 1)
+    mtime_ns = os.stat(file).st_mtime_ns + 1
+    os.utime(file, ns=(mtime_ns, mtime_ns))
+
+    to_import, skipped = partition_unchanged(sqlite_db, [file])
+
+    # Same content, so the hash decides it is unchanged and the new mtime is recorded.
+    assert to_import == []
+    assert skipped == [file]
+    assert load_manifest(sqlite_db, [file])[manifest_key(file)].file_mtime_ns == mtime_ns
+
+
+def test_changed_content_is_imported(sqlite_db, tmp_path):
+    file = _write(tmp_path / 'customs.csv')
+    to_import, _ = partition_unchanged(sqlite_db, [file])
+    record_import(sqlite_db, to_import[0], None, None, 1)
+    stat = os.stat(file)
+    _write(tmp_path / 'customs.csv', 'a,b\n3,4\n')
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000))
+
+    to_import, skipped = partition_unchanged(sqlite_db, [file])
+
+    assert [fingerprint.path for fingerprint in to_import] == [file]
+    assert skipped == []
+
+
+def test_files_to_reimport_follows_overlaps_in_file_order():
+    windows = {
+        'a.csv': (date(2024, 1, 1), date(2024, 1, 31)),
+        'b.csv': (date(2024, 1, 20), date(2024, 2, 10)),
+        'c.csv': (date(2024, 2, 5), date(2024, 2, 28)),
+        'd.csv': (date(2024, 6, 1), date(2024, 6, 30)),
+    }
+    files = ['a.csv', 'b.csv', 'c.csv', 'd.csv']
+
+    # b changed: a and c overlap it, so a, b and c are replayed in order; d is untouched.
+    assert files_to_reimport(files, windows, imported=['b.csv']) == ['a.csv', 'b.csv', 'c.csv']
+    # c changed: b overlaps c and a overlaps b, transitively.
+    assert files_to_reimport(files, windows, imported=['c.csv']) == ['a.csv', 'b.csv', 'c.csv']
+    # a changed and comes first, so only the later overlapping files are replayed after it.
+    assert files_to_reimport(['a.csv', 'd.csv'], windows, imported=['a.csv']) == []
+    assert files_to_reimport(files, windows, imported=['d.csv']) == []
+
+
+def _date_counts(db):
+    # sqlite keeps the imported timestamps, so group on the calendar day.
+    day = func.substr(KBEImportExport.date, 1, 10)
+    with db.db_engine.connect() as connection:
+        return dict(connection.execute(select(day, func.count()).group_by(day).order_by(day)).all())
+
+
+def test_changed_file_does_not_wipe_an_overlapping_skipped_file(sqlite_db, tmp_path, monkeypatch):
+    import main
+
+    monkeypatch.setitem(sql_connector._connectors, 'kbe', sqlite_db.db_connector)
+    folder = tmp_path / 'exports'
+    folder.mkdir()
+    make_customs_frame(300, seed=1, start='2024-01-01', end='2024-01-31').to_csv(folder / 'a.csv', index=False)
+    make_customs_frame(300, seed=2, start='2024-01-20', end='2024-02-10').to_csv(folder / 'b.csv', index=False)
+    main.folder_path_wise_custom_data_import_in_db(str(folder))
+
+    # Only b changes; a is skipped by the manifest, but b's replace deletes a's rows from Jan 20 on.
+    make_customs_frame(200, seed=3, start='2024-01-25', end='2024-02-05').to_csv(folder / 'b.csv', index=False)
+    main.folder_path_wise_custom_data_import_in_db(str(folder))
+    incremental = _date_counts(sqlite_db)
+
+    # Before b's new window, the table must hold what a fresh forced import of a then b leaves:
+    # a's rows, not the old b rows that a would have replaced had it been re-imported.
+    with sqlite_db.db_engine.begin() as connection:
+        connection.execute(delete(KBEImportExport))
+    main.folder_path_wise_custom_data_import_in_db(str(folder), force=True)
+    fresh = _date_counts(sqlite_db)
+
+    def before_new_window(counts):
+        return {day: count for day, count in counts.items() if day < '2024-01-25'}
+
+    assert before_new_window(incremental) == before_new_window(fresh)
+    assert min(incremental) == '2024-01-01'
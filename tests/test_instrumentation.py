@@ -0,0 +1,68 @@
+import json
+import logging
+
+import pytest
+from sqlalchemy import select
+
+import sql_connector
+from models.pipeline.pipeline_models import KBEPipelineRun
+from utils.instrumentation import current_run, pipeline_run, stage
+
+
+def _run_summaries(caplog):
+    return [
+        json.loads(record.message[len('PIPELINE_RUN '):])
+        for record in caplog.records if record.message.startswith('PIPELINE_RUN ')
+    ]
+
+
+def test_run_line_lists_every_stage(caplog):
+    with caplog.at_level(logging.INFO):
+        with pipeline_run('test-run', persist=False):
+            for page in range(3):
+                with stage('fetch', rows_in=10) as record:
+                    record.rows_out = 8
+            with stage('write') as record:
+                record.rows_out = 24
+
+    [summary] = _run_summaries(caplog)
+    assert summary['pipeline'] == 'test-run'
+    assert summary['status'] == 'ok'
+    assert [(entry['stage'], entry['calls'], entry['rows_in'], entry['rows_out']) for entry in summary['stages']] == [
+        ('fetch', 3, 30, 24),
+        ('write', 1, None, 24),
+    ]
+    assert current_run() is None
+
+
+def test_a_stage_that_raises_is_still_recorded(caplog):
+    with caplog.at_level(logging.INFO), pytest.raises(ValueError):
+        with pipeline_run('test-run', persist=False):
+            with stage('parse', rows_in=5):
+                raise ValueError('bad row')
+
+    [summary] = _run_summaries(caplog)
+    assert summary['status'] == 'failed'
+    assert summary['error'] == 'ValueError: bad row'
+    assert [(entry['stage'], entry['calls'], entry['rows_in']) for entry in summary['stages']] == [('parse', 1, 5)]
+
+
+def test_stages_outside_a_run_are_not_recorded(caplog):
+    with caplog.at_level(logging.INFO):
+        with stage('orphan') as record:
+            record.rows_out = 1
+
+    assert _run_summaries(caplog) == []
+
+
+def test_persisted_run_is_written_to_pipeline_runs(sqlite_db, monkeypatch):
+    monkeypatch.setitem(sql_connector._connectors, 'kbe', sqlite_db.db_connector)
+
+    with pipeline_run('test-run', database='kbe', persist=True) as run:
+        with stage('write') as record:
+            record.rows_out = 7
+
+    with sqlite_db.db_engine.connect() as connection:
+        rows = connection.execute(select(KBEPipelineRun.run_id, KBEPipelineRun.status, KBEPipelineRun.summary)).all()
+    assert [(run_id, status) for run_id, status, _ in rows] == [(run.run_id, 'ok')]
+    assert json.loads(rows[0].summary)['stages'][0]['rows_out'] == 7
@@ -0,0 +1,60 @@
+from concurrent.futures import Future
+
+from kbexports import kbe_processor
+
+
+class RecordingExecutor:
+    """Runs submissions inline and records how many results were outstanding at once."""
+
+    def __init__(self, max_workers):
+        self.outstanding = 0
+        self.peak = 0
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, file):
+        self.submitted.append(file)
+        self.outstanding += 1
+        self.peak = max(self.peak, self.outstanding)
+        future = Future()
+        original_result = future.result
+
+        def result(timeout=None):
+            self.outstanding -= 1
+            return original_result(timeout)
+
+        future.result = result
+        if file.startswith('broken'):
+            future.set_exception(ValueError(f"cannot read {file}"))
+        else:
+            future.set_result((file, 0.0))
+        return future
+
+
+def test_parallel_import_keeps_a_bounded_window_in_file_order(sqlite_db, monkeypatch):
+    executors = []
+
+    def make_executor(max_workers):
+        executors.append(RecordingExecutor(max_workers))
+        return executors[-1]
+
+    written = []
+    monkeypatch.setattr(kbe_processor, 'ProcessPoolExecutor', make_executor)
+    monkeypatch.setattr(kbe_processor, 'get_connector', lambda name: sqlite_db.db_connector)
+    monkeypatch.setattr(kbe_processor, 'import_custom_frame', lambda df, db, refresh_summary: written.append(df))
+    files = [f"file_{number}.xlsx" for number in range(10)]
+    files[4] = "broken.xlsx"
+
+    summaries = kbe_processor.import_custom_files_parallel(files, workers=2)
+
+    assert written == [file for file in files if file != "broken.xlsx"]
+    assert [summary.file for summary in summaries] == files
+    assert [summary.file for summary in summaries if summary.error] == ["broken.xlsx"]
+    assert executors[0].submitted == files
+    assert executors[0].peak == 3
+
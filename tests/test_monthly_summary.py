@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+import sql_connector
+from benchmarks.generators import make_customs_frame
+from kbexports import monthly_summary
+from kbexports.ingest_manifest import load_manifest, manifest_key
+
+
+@pytest.fixture
+def exports(sqlite_db, tmp_path, monkeypatch):
+    monkeypatch.setitem(sql_connector._connectors, 'kbe', sqlite_db.db_connector)
+    folder = tmp_path / 'exports'
+    folder.mkdir()
+    make_customs_frame(400, seed=1, start='2024-01-10', end='2024-02-20').to_csv(folder / 'first.csv', index=False)
+    make_customs_frame(400, seed=2, start='2024-02-10', end='2024-03-15').to_csv(folder / 'second.csv', index=False)
+    return folder
+
+
+def _read(db, query):
+    with db.db_engine.connect() as connection:
+        return pd.read_sql(query, connection)
+
+
+def _rolled_up_from_raw(db):
+    raw = _read(db, "SELECT date, quantity, fob_value_inr, fob_value_usd FROM kbe_import_export")
+    raw['month'] = raw['date'].str[:7]
+    totals = raw.groupby('month').agg(
+        shipments=('date', 'size'), quantity=('quantity', 'sum'),
+        fob_value_inr=('fob_value_inr', 'sum'), fob_value_usd=('fob_value_usd', 'sum'),
+    )
+    return totals.reset_index()
+
+
+def _summary_by_month(db):
+    summary = _read(db, "SELECT month_start, shipments, quantity, fob_value_inr, fob_value_usd FROM kbe_monthly_summary")
+    summary['month'] = summary['month_start'].astype(str).str[:7]
+    return summary.drop(columns='month_start').groupby('month').sum().reset_index()
+
+
+def test_importing_two_windows_rolls_up_every_month(sqlite_db, exports):
+    import main
+
+    main.folder_path_wise_custom_data_import_in_db(str(exports))
+
+    summary = _summary_by_month(sqlite_db)
+    assert list(summary['month']) == ['2024-01', '2024-02', '2024-03']
+    pd.testing.assert_frame_equal(summary, _rolled_up_from_raw(sqlite_db), check_dtype=False)
+
+
+def test_failed_refresh_leaves_the_file_unrecorded_and_is_retried(sqlite_db, exports, monkeypatch):
+    import main
+
+    with monkeypatch.context() as patch:
+        patch.setattr(monthly_summary, 'refresh_monthly_summary', lambda db, start, end: None)
+        main.folder_path_wise_custom_data_import_in_db(str(exports))
+
+    files = [str(exports / 'first.csv'), str(exports / 'second.csv')]
+    assert load_manifest(sqlite_db, files) == {}
+    assert _read(sqlite_db, "SELECT COUNT(*) AS n FROM kbe_monthly_summary")['n'][0] == 0
+
+    main.folder_path_wise_custom_data_import_in_db(str(exports))
+
+    assert set(load_manifest(sqlite_db, files)) == {manifest_key(file) for file in files}
+    pd.testing.assert_frame_equal(_summary_by_month(sqlite_db), _rolled_up_from_raw(sqlite_db), check_dtype=False)
@@ -0,0 +1,81 @@
+from datetime import date
+
+from sqlalchemy import insert, select, update
+
+from kbexports import product_backfill
+from kbexports.product_classifier import UNCLASSIFIED
+from models.kbe.kbe_models import KBEBackfillCheckpoint, KBEImportExport, KBEMonthlySummary
+
+
+ROWS = [
+    (date(2024, 1, 5), 'FRESH GARLIC', UNCLASSIFIED),
+    (date(2024, 1, 20), 'FRESH GARLIC', 'FRESH GARLIC'),
+    (date(2024, 3, 2), 'INDIAN MANGO', 'OKRA'),
+    (date(2024, 5, 9), 'HANDICRAFT ITEMS', UNCLASSIFIED),
+]
+
+
+def _seed(db):
+    with db.db_engine.begin() as connection:
+        connection.execute(insert(KBEImportExport), [
+            {'date': day, 'product_description': description, 'product_classified': label,
+             'foreign_country': 'Oman', 'indian_exporter_name': 'ACME', 'quantity': 1, 'fob_value_inr': 10, 'fob_value_usd': 1}
+            for day, description, label in ROWS
+        ])
+
+
+def _summary(db):
+    with db.db_engine.connect() as connection:
+        return sorted(
+            (str(row.month_start)[:7], row.product_classified, row.shipments)
+            for row in connection.execute(select(KBEMonthlySummary))
+        )
+
+
+def _checkpoint(db):
+    with db.db_engine.connect() as connection:
+        return connection.execute(select(KBEBackfillCheckpoint)).one()
+
+
+def test_backfill_refreshes_summary_for_relabelled_months(sqlite_db, monkeypatch):
+    monkeypatch.setattr(product_backfill, 'get_connector', lambda name: sqlite_db.db_connector)
+    _seed(sqlite_db)
+
+    assert product_backfill.product_classification(batch_size=2) == 2
+
+    # January and March were relabelled; May was not touched and is not summarised.
+    assert _summary(sqlite_db) == [('2024-01', 'FRESH GARLIC', 2), ('2024-03', 'MANGO', 1)]
+    checkpoint = _checkpoint(sqlite_db)
+    assert checkpoint.completed_at is not None
+    assert (checkpoint.summary_from, checkpoint.summary_to) == (None, None)
+
+
+def test_backfill_retries_a_summary_refresh_left_by_an_earlier_run(sqlite_db, monkeypatch):
+    monkeypatch.setattr(product_backfill, 'get_connector', lambda name: sqlite_db.db_connector)
+    _seed(sqlite_db)
+    monkeypatch.setattr(product_backfill, 'refresh_monthly_summary', lambda db, start, end: None)
+    product_backfill.product_classification()
+    assert (_checkpoint(sqlite_db).summary_from, _checkpoint(sqlite_db).summary_to) == (date(2024, 1, 5), date(2024, 3, 2))
+    monkeypatch.undo()
+    monkeypatch.setattr(product_backfill, 'get_connector', lambda name: sqlite_db.db_connector)
+
+    assert product_backfill.product_classification() == 0
+
+    assert _summary(sqlite_db) == [('2024-01', 'FRESH GARLIC', 2), ('2024-03', 'MANGO', 1)]
+    assert _checkpoint(sqlite_db).summary_from is None
+
+
+def test_resumed_backfill_keeps_the_span_of_committed_batches(sqlite_db, monkeypatch):
+    monkeypatch.setattr(product_backfill, 'get_connector', lambda name: sqlite_db.db_connector)
+    _seed(sqlite_db)
+    # An interrupted run: batches up to id 1 committed January's relabel, then the process died.
+    with sqlite_db.db_engine.begin() as connection:
+        connection.execute(update(KBEImportExport).where(KBEImportExport.id == 1).values(product_classified='FRESH GARLIC'))
+    sqlite_db.upsert_rows('kbe_backfill_checkpoint', [{
+        'job_name': product_backfill.BACKFILL_JOB_NAME, 'last_id': 1, 'rows_updated': 1,
+        'completed_at': None, 'summary_from': date(2024, 1, 5), 'summary_to': date(2024, 1, 5),
+    }])
+
+    assert product_backfill.product_classification() == 2
+
+    assert _summary(sqlite_db) == [('2024-01', 'FRESH GARLIC', 2), ('2024-03', 'MANGO', 1)]
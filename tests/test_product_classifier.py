@@ -0,0 +1,83 @@
+import csv
+import os
+import random
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kbexports.product_classifier import CLASSIFICATION_RULES, UNCLASSIFIED, ProductClassifier, get_classifier
+
+
+GOLDEN_CORPUS = os.path.join(os.path.dirname(__file__), 'data', 'product_classifier_golden.csv')
+
+
+def first_match_loop(description, rules=CLASSIFICATION_RULES):
+    # The per-row loop the combined pattern replaced: lowercase, then the first rule whose
+    # include matches and whose exclude does not.
+    desc = (description or "").lower()
+    for rule in rules:
+        if re.search(rule['include'], desc):
+            if not re.search(rule['exclude'], desc):
+                return rule['label']
+    return UNCLASSIFIED
+
+
+def _golden_rows():
+    with open(GOLDEN_CORPUS, newline='') as handle:
+        return [(row['description'], row['label']) for row in csv.DictReader(handle)]
+
+
+def _vocabulary():
+    words = set()
+    for rule in CLASSIFICATION_RULES:
+        for pattern in (rule['include'], rule['exclude']):
+            words.update(re.findall(r'[a-z]+(?: [a-z]+)?', pattern.replace(r'\b', ' ')))
+    return sorted(words) + ['fresh', 'indian', 'grade a', '10 kg', '&', '-', 'spices']
+
+
+@pytest.mark.parametrize('description, label', _golden_rows())
+def test_golden_corpus(description, label):
+    assert first_match_loop(description) == label
+    assert get_classifier().classify(description) == label
+
+
+def test_matches_first_match_loop_on_generated_descriptions():
+    rng = random.Random(7)
+    vocabulary = _vocabulary()
+    descriptions = [
+        rng.choice([' ', '  ', '\t', ', ']).join(rng.choices(vocabulary, k=rng.randint(1, 5)))
+        for _ in range(20_000)
+    ]
+    descriptions = [description.upper() if rng.random() < 0.5 else description for description in descriptions]
+    classifier = get_classifier()
+
+    mismatches = [
+        (description, first_match_loop(description), classifier.classify(description))
+        for description in descriptions
+        if first_match_loop(description) != classifier.classify(description)
+    ]
+
+    assert mismatches == []
+
+
+def test_rule_order_decides_overlapping_matches():
+    rules = [
+        {'label': 'FIRST', 'include': r'\bgarlic\b', 'exclude': r'\bdry\b'},
+        {'label': 'SECOND', 'include': r'\bgarlic\b', 'exclude': r'\bfrozen\b'},
+    ]
+    classifier = ProductClassifier(rules)
+
+    for description in ['garlic', 'dry garlic', 'frozen garlic', 'dry frozen garlic', 'onion']:
+        assert classifier.classify(description) == first_match_loop(description, rules)
+    assert classifier.classify('dry garlic') == 'SECOND'
+
+
+def test_classify_series_keeps_alignment_and_defaults_missing():
+    descriptions = pd.Series(['FRESH GARLIC', None, np.nan, 'fresh garlic', 'HANDICRAFT'], index=[3, 1, 4, 1, 5])
+
+    labels = get_classifier().classify_series(descriptions)
+
+    assert list(labels.index) == [3, 1, 4, 1, 5]
+    assert labels.tolist() == ['FRESH GARLIC', UNCLASSIFIED, UNCLASSIFIED, 'FRESH GARLIC', UNCLASSIFIED]
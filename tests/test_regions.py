@@ -0,0 +1,62 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kbexports.regions import UNKNOWN_REGION, ContinentResolver
+
+
+@pytest.fixture
+def resolver():
+    return ContinentResolver()
+
+
+def _warnings(caplog):
+    return [record.message for record in caplog.records if record.levelno == logging.WARNING]
+
+
+@pytest.mark.parametrize('raw, continent', [
+    ('U Arab Emts', 'Asia'),
+    ('U S A', 'North America'),
+    ('u.s.a.', 'North America'),
+    ('Korea Rp', 'Asia'),
+    ('Netherland', 'Europe'),
+    ('  netherland ', 'Europe'),
+])
+def test_customs_spellings_resolve_through_aliases(resolver, raw, continent):
+    assert resolver.region_series(pd.Series([raw])).tolist() == [continent]
+
+
+def test_unresolved_names_are_unknown_and_warned_once(resolver, caplog):
+    countries = pd.Series(['Atlantis', 'Germany', 'ATLANTIS', 'Atlantis', 'El Dorado'])
+
+    with caplog.at_level(logging.WARNING):
+        regions = resolver.region_series(countries)
+        resolver.region_series(countries)
+
+    assert regions.tolist() == [UNKNOWN_REGION, 'Europe', UNKNOWN_REGION, UNKNOWN_REGION, UNKNOWN_REGION]
+    assert _warnings(caplog) == [
+        f"No continent for country 'Atlantis'; region set to '{UNKNOWN_REGION}'.",
+        f"No continent for country 'El Dorado'; region set to '{UNKNOWN_REGION}'.",
+    ]
+
+
+def test_missing_and_empty_countries_are_unknown(resolver, caplog):
+    countries = pd.Series([np.nan, None, '', '  ', 'nan', 'India'], index=[10, 11, 12, 13, 14, 15])
+
+    with caplog.at_level(logging.WARNING):
+        regions = resolver.region_series(countries)
+
+    assert regions.tolist() == [UNKNOWN_REGION] * 5 + ['Asia']
+    assert list(regions.index) == list(countries.index)
+    # NaN and the text 'nan' clean to the same name, so they share one warning.
+    assert len(_warnings(caplog)) == 2
+
+
+def test_add_alias_replaces_a_cached_miss(resolver):
+    assert resolver.region_series(pd.Series(['Holland Nl'])).tolist() == [UNKNOWN_REGION]
+
+    resolver.add_alias('Holland Nl', 'Netherlands')
+
+    assert resolver.region_series(pd.Series(['Holland Nl'])).tolist() == ['Europe']
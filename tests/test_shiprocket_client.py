@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from Shiprocket import shiprocket
+from Shiprocket.shiprocket import ShiprocketClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text=''):
+        self.status_code = status_code
+        self._body = body
+        self.text = text
+        self.headers = {}
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("Expecting value: line 1 column 1 (char 0)")
+        return self._body
+
+
+class FakeApi:
+    """Issues token-N on each login and rejects every token but the newest with a 401."""
+
+    def __init__(self, login_responses=None):
+        self.logins = 0
+        self.login_responses = list(login_responses or [])
+        self.lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, **kwargs):
+        if url.endswith('/auth/login'):
+            with self.lock:
+                self.logins += 1
+                if self.login_responses:
+                    return self.login_responses.pop(0)
+                return FakeResponse(200, {'token': f"token-{self.logins}"})
+        if kwargs['headers']['Authorization'] != f"Bearer token-{self.logins}":
+            return FakeResponse(401, {'message': 'Unauthenticated'})
+        return FakeResponse(200, {'data': []})
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = ShiprocketClient(email='ops@example.com', password='secret', base_url='https://api.test')
+    client.api = FakeApi()
+    monkeypatch.setattr(client.session, 'request', lambda *args, **kwargs: client.api.request(*args, **kwargs))
+    monkeypatch.setattr(shiprocket.time, 'sleep', lambda seconds: None)
+    return client
+
+
+def test_token_is_cached(client):
+    assert client.get_token() == 'token-1'
+    assert client.get_token() == 'token-1'
+    assert client.api.logins == 1
+
+
+def test_concurrent_401s_on_one_token_log_in_once(client):
+    client.get_token()
+    # The server revokes token-1 while it is cached, so every caller gets a 401 for it.
+    original = client.api.request
+
+    def revoked(method, url, timeout=None, **kwargs):
+        if not url.endswith('/auth/login') and kwargs['headers']['Authorization'] == 'Bearer token-1':
+            return FakeResponse(401)
+        return original(method, url, timeout=timeout, **kwargs)
+
+    client.session.request = revoked
+    barrier = threading.Barrier(8)
+    statuses = []
+
+    def call():
+        barrier.wait()
+        statuses.append(client.get('/orders').status_code)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * 8
+    assert client.api.logins == 2
+
+
+def test_stale_token_does_not_replace_a_newer_one(client):
+    client.get_token()
+    client.get_token(force_refresh=True)
+    assert client.api.logins == 2
+
+    assert client.get_token(stale_token='token-1') == 'token-2'
+    assert client.api.logins == 2
+
+
+def test_login_with_a_non_json_body_returns_none(client):
+    client.api.login_responses = [FakeResponse(200, None, text='<html>maintenance</html>')]
+
+    assert client.get_token() is None
+    assert client.get_token() == 'token-2'
+
+
+def test_token_lock_is_free_during_login_backoff(client, monkeypatch):
+    client.api.login_responses = [FakeResponse(503), FakeResponse(503)]
+    lock_states = []
+
+    def sleep(seconds):
+        acquired = client._token_lock.acquire(blocking=False)
+        lock_states.append(acquired)
+        if acquired:
+            client._token_lock.release()
+
+    monkeypatch.setattr(shiprocket.time, 'sleep', sleep)
+
+    assert client.get_token() == 'token-3'
+    assert lock_states == [True, True]
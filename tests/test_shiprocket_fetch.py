@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from Shiprocket import shiprocket
+
+
+class FakePages:
+    """Stands in for fetch_orders_page: `pages` orders per page, later pages answering first."""
+
+    def __init__(self, total_pages, per_page=3, missing=(), paginated=True):
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.missing = set(missing)
+        self.paginated = paginated
+        self.in_flight = 0
+        self.peak = 0
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def __call__(self, params):
+        page = params['page']
+        with self._lock:
+            self.requested.append(page)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(0.002 * (self.total_pages - page + 1))
+            if page in self.missing:
+                return None
+            data = [] if page > self.total_pages else [
+                {'id': (page - 1) * self.per_page + number} for number in range(self.per_page)
+            ]
+            payload = {'data': data}
+            if self.paginated:
+                payload['meta'] = {'pagination': {'total_pages': self.total_pages}}
+            return payload
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    def install(**kwargs):
+        fake = FakePages(**kwargs)
+        monkeypatch.setattr(shiprocket, 'fetch_orders_page', fake)
+        return fake
+    return install
+
+
+def test_concurrent_pages_keep_page_order(pages):
+    fake = pages(total_pages=8)
+
+    orders = shiprocket.fetch_all_order_payloads('2025-01-01', '2025-01-31', max_workers=3)
+
+    assert [order['id'] for order in orders] == list(range(8 * 3))
+    assert sorted(fake.requested) == list(range(1, 9))
+    assert 1 < fake.peak <= 3
+
+
+def test_a_missing_page_fails_the_whole_fetch(pages):
+    pages(total_pages=5, missing={4})
+
+    with pytest.raises(RuntimeError, match='Page 4 of 5'):
+        shiprocket.fetch_all_order_payloads('2025-01-01', '2025-01-31', max_workers=3)
+
+
+def test_a_missing_first_page_fails(pages):
+    pages(total_pages=3, missing={1})
+
+    with pytest.raises(RuntimeError, match='Page 1'):
+        shiprocket.fetch_all_order_payloads('2025-01-01', '2025-01-31')
+
+
+def test_unpaginated_responses_are_walked_until_an_empty_page(pages):
+    fake = pages(total_pages=4, paginated=False)
+
+    orders = shiprocket.fetch_all_order_payloads('2025-01-01', '2025-01-31')
+
+    assert [order['id'] for order in orders] == list(range(4 * 3))
+    assert fake.requested == [1, 2, 3, 4, 5]
+
+
+def test_a_missing_page_fails_an_unpaginated_walk(pages):
+    pages(total_pages=4, paginated=False, missing={3})
+
+    with pytest.raises(RuntimeError, match='Page 3'):
+        shiprocket.fetch_all_order_payloads('2025-01-01', '2025-01-31')
@@ -0,0 +1,146 @@
+import copy
+
+import pandas as pd
+import pytest
+
+from benchmarks.generators import make_shiprocket_orders
+from Shiprocket.shiprocket import FINAL_COLUMNS, normalise_orders
+
+# The json_normalize/merge implementation normalise_orders replaced, kept as the reference
+# the single-pass flatten is checked against. The `others` frame it built was never used.
+LEGACY_PRODUCT_RENAME = {
+    'name': "item_name",
+    'channel_sku': "item_sku",
+    'quantity': "item_quantity",
+    'available': "item_available",
+    'price': "item_price",
+    'product_cost': "item_cost",
+    'hsn': "item_hsn_code",
+    'discount': "item_discount",
+    'discount_including_tax': "item_discount_including_tax",
+    'selling_price': "item_selling_price",
+    'mrp': "item_mrp",
+    'tax_percentage': "tax_percent",
+}
+
+LEGACY_FINAL_RENAME = {
+    "awb_data.charges.cod_charges": "cod_charges",
+    "awb_data.charges.applied_weight_amount": "applied_weight_amount",
+    "awb_data.charges.freight_charges": "freight_charges",
+    "awb_data.charges.applied_weight": "applied_weight",
+    "awb_data.charges.charged_weight": "charged_weight",
+    "awb_data.charges.charged_weight_amount": "charged_weight_amount",
+    "awb_data.charges.charged_weight_amount_rto": "charged_weight_amount_rto",
+    "awb_data.charges.applied_weight_amount_rto": "applied_weight_amount_rto",
+    "awb_data.charges.billing_amount": "billing_amount",
+    "total": "order_total",
+    "discount": "other_deduction",
+    "item_price": "item_net_price_excl_deduction",
+    "item_cost": "item_sp_excl_tax",
+    "item_discount": "item_disc_excl_tax",
+    "item_selling_price": "item_sp_incl_tax",
+    "item_discount_including_tax": "item_disc_incl_tax",
+    "created_at": "shiprocket_created_at",
+}
+
+
+def legacy_normalise_orders(data):
+    data = copy.deepcopy(data)
+    df_orders = pd.json_normalize(data)
+
+    df_products = pd.json_normalize(data, record_path='products', meta=['id'], record_prefix='product_')\
+        .drop(columns=["product_id"], errors='ignore')\
+        .rename(columns={"product_quantity": "quantity"})
+    df_products.columns = df_products.columns.str.removeprefix("product_")
+    df_products = df_products.rename(columns=LEGACY_PRODUCT_RENAME)
+    df_products = df_products[[
+        "item_name", "item_sku", "item_quantity", "item_available", "item_price", "item_cost", "item_hsn_code",
+        "item_discount", "item_discount_including_tax", "item_selling_price", "item_mrp", "tax_percent", "description", "id",
+    ]]
+    numeric_columns = ["item_price", "item_cost", "item_hsn_code"]
+    df_products[numeric_columns] = df_products[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    df_shipments = pd.json_normalize(data, record_path='shipments', meta=['id'], record_prefix='shipment_')\
+        .drop(columns=['shipment_id'], errors='ignore')
+    df_shipments.columns = df_shipments.columns.str.removeprefix("shipment_")
+    df_shipments = df_shipments[[
+        "courier", "weight", "dimensions", "pickedup_timestamp", "awb",
+        "rto_delivered_date", "rto_initiated_date", "delivery_executive_name", "id",
+    ]]
+    df_shipments['weight'] = df_shipments['weight'].str.extract(r'(\d+\.?\d*)').astype(float).fillna(0)
+
+    df_final = df_orders.drop(columns=['products', 'shipments', 'others', 'activities', 'errors'], errors='ignore')
+    df_final = df_final.merge(df_products, on='id', how='left')
+    df_final = df_final.merge(df_shipments, on='id', how='left')
+    df_final = df_final.rename(columns={'id': "shiprocket_id"}).rename(columns=LEGACY_FINAL_RENAME)
+    for column in FINAL_COLUMNS:
+        if column not in df_final.columns:
+            df_final[column] = ''
+    df_final = df_final[FINAL_COLUMNS]
+
+    pattern = r'\bsurface\w*\b|\b\d+\s?(kg|kgs|gm|gms)\b'
+    df_final["courier"] = df_final["courier"].str.replace(pattern, '', case=False, regex=True).str.strip()
+
+    date_columns = ["shiprocket_created_at", "picked_up_date", "etd_date", "out_for_delivery_date",
+                    "rto_initiated_date", "rto_delivered_date", "pickedup_timestamp", "delivered_date"]
+    custom_formats = {
+        "shiprocket_created_at": "%d %b %Y, %I:%M %p",
+        "pickedup_timestamp": "%d %b %Y, %I:%M %p",
+        "etd_date": "%d-%m-%Y %H:%M:%S",
+        "out_for_delivery_date": "%d-%m-%Y %H:%M:%S",
+    }
+    for col in date_columns:
+        if col in custom_formats:
+            parsed = pd.to_datetime(df_final[col], format=custom_formats[col], errors="coerce")
+        else:
+            parsed = pd.to_datetime(df_final[col], errors="coerce", dayfirst=True)
+        df_final[col] = parsed.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    date_zero_replace = ['pickedup_timestamp', 'rto_initiated_date', 'rto_delivered_date']
+    df_final[date_zero_replace] = df_final[date_zero_replace].replace({'0000-00-00 00:00:00': pd.NaT, '': pd.NaT})
+
+    num_col = [
+        "cod_charges", "applied_weight_amount", "freight_charges", "charged_weight_amount",
+        "charged_weight_amount_rto", "applied_weight_amount_rto", "billing_amount", "other_charges",
+        "giftwrap_charges", "applied_weight", "charged_weight", 'order_total']
+    df_final[num_col] = df_final[num_col].apply(pd.to_numeric, errors='coerce').fillna(0)
+
+    one_time_value = [
+        'order_total', 'other_deduction', 'cod_charges', 'applied_weight_amount',
+        'freight_charges', 'charged_weight_amount', 'charged_weight_amount_rto',
+        'applied_weight_amount_rto', 'billing_amount', 'other_charges',
+        'giftwrap_charges', 'applied_weight', 'weight', 'charged_weight',
+    ]
+    first_mask = df_final.groupby(['shiprocket_id', 'channel_order_id']).cumcount() == 0
+    df_final[one_time_value] = df_final[one_time_value].where(first_mask, 0)
+    return df_final
+
+
+def _comparable(df):
+    # Known, intended dtype differences: shiprocket_id is int64 rather than object, and
+    # all-empty date columns are object rather than float64. Values must match exactly.
+    return df.astype({'shiprocket_id': str}).astype(object).where(df.notna(), None)
+
+
+@pytest.mark.parametrize('seed', [0, 7])
+def test_normalise_matches_the_json_normalize_path(seed):
+    orders = make_shiprocket_orders(300, seed=seed)
+
+    expected = legacy_normalise_orders(orders)
+    actual = normalise_orders(copy.deepcopy(orders))
+
+    assert list(actual.columns) == FINAL_COLUMNS
+    pd.testing.assert_frame_equal(_comparable(actual), _comparable(expected))
+
+
+def test_zero_dates_are_empty_like_the_json_normalize_path():
+    orders = make_shiprocket_orders(20, seed=3)
+    for order in orders:
+        for shipment in order['shipments']:
+            shipment['pickedup_timestamp'] = '0000-00-00 00:00:00'
+            shipment['rto_initiated_date'] = ''
+
+    actual = normalise_orders(copy.deepcopy(orders))
+
+    assert actual[['pickedup_timestamp', 'rto_initiated_date']].isna().all().all()
+    pd.testing.assert_frame_equal(_comparable(actual), _comparable(legacy_normalise_orders(orders)))
@@ -0,0 +1,86 @@
+import copy
+
+import pandas as pd
+import pytest
+from sqlalchemy import func, select
+
+from Shiprocket import shiprocket_sync
+from Shiprocket.stub_server import make_orders
+from models.shiprocket.shiprocket_models import ShiprocketOrder, ShiprocketOrderState, ShiprocketSyncState
+
+
+@pytest.fixture
+def sync(sqlite_db, monkeypatch):
+    """Runs shiprocket_incremental_sync against the sqlite fixture with a stubbed fetch."""
+    monkeypatch.setattr(shiprocket_sync, 'get_connector', lambda name: sqlite_db.db_connector)
+
+    def run(orders, full=True):
+        monkeypatch.setattr(shiprocket_sync, 'fetch_all_order_payloads', lambda start_date, end_date: copy.deepcopy(orders))
+        shiprocket_sync.shiprocket_incremental_sync(full=full)
+
+    return run
+
+
+def _scalar(db, query):
+    with db.db_engine.connect() as connection:
+        return connection.execute(query).scalar()
+
+
+def _stored_ids(db):
+    with db.db_engine.connect() as connection:
+        return {row[0] for row in connection.execute(select(ShiprocketOrder.shiprocket_id).distinct())}
+
+
+def _state_ids(db):
+    with db.db_engine.connect() as connection:
+        return {row[0] for row in connection.execute(select(ShiprocketOrderState.shiprocket_id))}
+
+
+def test_sync_stores_orders_state_and_watermark(sqlite_db, sync):
+    orders = make_orders(20, seed=1)
+    ids = {str(order['id']) for order in orders}
+
+    sync(orders)
+
+    assert _stored_ids(sqlite_db) == ids
+    assert _state_ids(sqlite_db) == ids
+    assert _scalar(sqlite_db, select(ShiprocketSyncState.last_synced_at)) is not None
+
+
+def test_duplicate_orders_from_overlapping_pages_are_loaded_once(sqlite_db, sync):
+    orders = make_orders(10, seed=2)
+    updated = dict(copy.deepcopy(orders[3]), status='DELIVERED')
+
+    sync(orders + [updated])
+
+    rows = _scalar(sqlite_db, select(func.count()).select_from(ShiprocketOrder).where(ShiprocketOrder.shiprocket_id == str(updated['id'])))
+    assert rows == len(updated['products']) * len(updated['shipments'])
+    assert _scalar(sqlite_db, select(ShiprocketOrder.status).where(ShiprocketOrder.shiprocket_id == str(updated['id']))) == 'DELIVERED'
+
+
+def test_empty_normalisation_leaves_state_and_watermark_untouched(sqlite_db, sync, monkeypatch):
+    monkeypatch.setattr(shiprocket_sync, 'normalise_orders', lambda orders: pd.DataFrame())
+
+    sync(make_orders(5, seed=3))
+
+    assert _state_ids(sqlite_db) == set()
+    assert _scalar(sqlite_db, select(func.count()).select_from(ShiprocketSyncState)) == 0
+
+
+def test_orders_dropped_by_normalisation_are_not_marked_synced(sqlite_db, sync, monkeypatch):
+    orders = make_orders(6, seed=4)
+    dropped = str(orders[0]['id'])
+    normalise = shiprocket_sync.normalise_orders
+    monkeypatch.setattr(shiprocket_sync, 'normalise_orders', lambda changed: normalise([o for o in changed if str(o['id']) != dropped]))
+
+    sync(orders)
+
+    assert dropped not in _state_ids(sqlite_db)
+    assert len(_state_ids(sqlite_db)) == 5
+
+    # Next run the order's hash is still unknown, so it is picked up again.
+    monkeypatch.setattr(shiprocket_sync, 'normalise_orders', normalise)
+    sync(orders, full=False)
+
+    assert dropped in _stored_ids(sqlite_db)
+    assert dropped in _state_ids(sqlite_db)
@@ -0,0 +1,25 @@
+import sql_connector
+
+
+def _engine_kwargs(monkeypatch, **env):
+    for name in ('DB_LOCAL_INFILE', 'KBE_DB_LOCAL_INFILE', 'KBBIO_DB_LOCAL_INFILE'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(sql_connector, '_connectors', {})
+    monkeypatch.setattr(sql_connector, 'USERNAME', 'user')
+    monkeypatch.setattr(sql_connector, 'PASSWORD', 'secret')
+    created = {}
+    monkeypatch.setattr(sql_connector, 'create_engine', lambda url, **kwargs: created.setdefault('kbe', kwargs))
+    sql_connector.get_connector('kbe').engine
+    return created['kbe']
+
+
+def test_local_infile_is_off_by_default(monkeypatch):
+    assert _engine_kwargs(monkeypatch)['connect_args'] == {}
+
+
+def test_local_infile_can_be_enabled_per_database(monkeypatch):
+    assert _engine_kwargs(monkeypatch, KBE_DB_LOCAL_INFILE='true')['connect_args'] == {'local_infile': True}
+    assert _engine_kwargs(monkeypatch, KBBIO_DB_LOCAL_INFILE='true')['connect_args'] == {}
+    assert _engine_kwargs(monkeypatch, DB_LOCAL_INFILE='1')['connect_args'] == {'local_infile': True}
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.generators import make_customs_frame
+from kbexports.kbe_processor import clean_custom_frame
+from utils import staging_cache as staging_cache_module
+from utils.common_utils import file_sha256, read_file_safely
+from utils.staging_cache import StagingCache
+
+
+def _workbook(path, seed=1, rows=120):
+    df = make_customs_frame(rows, seed=seed)
+    # Mixed cell types as real workbooks have them: typed dates next to text dates, blank
+    # numbers and text, and numeric codes.
+    df['Date'] = df['Date'].astype(object)
+    df.loc[:19, 'Date'] = pd.Timestamp('2024-03-05')
+    df.loc[20:29, 'Quantity'] = np.nan
+    df.loc[30:39, 'Product Description'] = np.nan
+    df.loc[40:44, 'FOB Value USD'] = np.nan
+    df.to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StagingCache(directory=str(tmp_path / 'cache'), max_bytes=10 * 1024 * 1024, enabled=True)
+
+
+def _entries(cache):
+    return sorted(entry.name for entry in cache._entries())
+
+
+def test_first_read_stages_and_second_read_hits(cache, tmp_path, monkeypatch):
+    workbook = _workbook(tmp_path / 'customs.xlsx')
+    cold = cache.read(workbook)
+    assert len(_entries(cache)) == 1
+
+    def no_parse(path):
+        raise AssertionError("a cache hit must not parse the workbook")
+
+    monkeypatch.setattr(staging_cache_module, 'read_file_safely', no_parse)
+    warm = cache.read(workbook)
+
+    pd.testing.assert_frame_equal(warm, cold)
+
+
+def test_miss_for_csv_and_disabled_cache(cache, tmp_path):
+    csv = tmp_path / 'customs.csv'
+    make_customs_frame(10).to_csv(csv, index=False)
+    workbook = _workbook(tmp_path / 'customs.xlsx')
+
+    cache.read(str(csv))
+    StagingCache(directory=cache.directory, enabled=False).read(workbook)
+
+    assert _entries(cache) == []
+
+
+def test_changed_content_is_a_new_entry(cache, tmp_path):
+    workbook = tmp_path / 'customs.xlsx'
+    first = cache.read(_workbook(workbook, seed=1))
+    second = cache.read(_workbook(workbook, seed=2))
+
+    assert len(_entries(cache)) == 2
+    assert not first.equals(second)
+    pd.testing.assert_frame_equal(second, cache.read(str(workbook)))
+
+
+def test_evict_removes_least_recently_used_first(cache, tmp_path):
+    paths = [_workbook(tmp_path / f'customs_{seed}.xlsx', seed=seed) for seed in range(3)]
+    entries = []
+    for age, path in enumerate(paths):
+        cache.read(path)
+        entry = cache._entry_path(file_sha256(path))
+        os.utime(entry, (1_000_000 + age, 1_000_000 + age))
+        entries.append(entry)
+
+    # A hit refreshes the entry's recency, so the second file becomes the oldest.
+    cache.read(paths[0])
+    cache.max_bytes = os.path.getsize(entries[0]) + os.path.getsize(entries[2])
+
+    assert cache.evict() == 1
+    assert [os.path.exists(entry) for entry in entries] == [True, False, True]
+
+
+def test_cache_hit_cleans_to_the_same_frame_as_a_cold_read(cache, tmp_path):
+    workbook = _workbook(tmp_path / 'customs.xlsx')
+    cold = clean_custom_frame(read_file_safely(workbook))
+
+    cache.read(workbook)
+    warm = clean_custom_frame(cache.read(workbook))
+
+    pd.testing.assert_frame_equal(warm, cold)
+    assert warm['date'].dtype == cold['date'].dtype
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+from benchmarks.startup_budget import REPO_ROOT, STARTUP_BUDGET_MS, import_profile, lazy_import_violations
+
+
+def test_main_imports_job_dependencies_lazily():
+    _, imported = import_profile("main")
+
+    assert lazy_import_violations(imported) == []
+
+
+def test_main_import_is_within_budget():
+    # Best of three, so one slow run on a loaded machine does not fail the suite.
+    timings = [import_profile("main")[0].get("main", 0) / 1000 for _ in range(3)]
+
+    assert min(timings) <= STARTUP_BUDGET_MS
+
+
+def test_help_runs_without_job_dependencies():
+    completed = subprocess.run([sys.executable, "main.py", "--help"], cwd=REPO_ROOT, capture_output=True, text=True)
+
+    assert completed.returncode == 0
+    assert "kbe-import" in completed.stdout
+
+
+def test_kbe_import_rejects_chunksize_with_workers():
+    completed = subprocess.run(
+        [sys.executable, "main.py", "kbe-import", "exports", "--chunksize", "1000", "--workers", "4"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+
+    assert completed.returncode == 2
+    assert "cannot be combined with --workers" in completed.stderr
@@ -1,9 +1,12 @@
 import pandas as pd
 import re
 import os
+import hashlib
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 from logging_config import logger
-from datetime import datetime
+from datetime import datetime, date
 
 def clean_text(value):
     if pd.isna(value):
@@ -32,16 +35,94 @@ def read_file_safely(file_path):
         raise RuntimeError(f"Failed to read file '{file_path}': {e}")
 
 
+def file_sha256(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_file_chunks(file_path, chunksize=50000):
+    """
+    Yields a supported file as DataFrames of at most `chunksize` rows.
+
+    CSV is read with pandas' chunked reader and .xlsx/.xlsm with openpyxl's read-only
+    row iterator, so memory is bounded by the chunk size rather than the file size.
+    Other Excel formats have no streaming reader and are yielded whole.
+    """
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+
+    try:
+        if ext == '.csv':
+            yield from pd.read_csv(file_path, chunksize=chunksize)
+        elif ext in {'.xlsx', '.xlsm'}:
+            yield from _iter_xlsx_chunks(file_path, chunksize)
+        else:
+            yield read_file_safely(file_path)
+    except RuntimeError:
+        raise
+    except Exception as e:
+        raise RuntimeError(f"Failed to read file '{file_path}': {e}")
+
+
+def _iter_xlsx_chunks(file_path, chunksize):
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row[:len(columns)])
+            if len(batch) >= chunksize:
+                yield _rows_to_frame(batch, columns)
+                batch = []
+        if batch:
+            yield _rows_to_frame(batch, columns)
+    finally:
+        workbook.close()
+
+
+def _rows_to_frame(rows, columns):
+    df = pd.DataFrame(rows, columns=columns)
+    # Match pd.read_excel, which reports empty cells as NaN rather than None.
+    return df.where(df.notna(), np.nan)
+
+
+
+QTY_PATTERN_KG = re.compile(r'(\d+(?:\.\d+)?)\s*(?:KG|KGS)\b', re.IGNORECASE)
+QTY_PATTERN_OTHER = re.compile(r'(\d+)\s*(?:G|GM|GX|GMS|GC|GMN)?\s*(?:X|\s)\s*(\d+)\s*(?:PUNNET|MAP\s*BAGS)?', re.IGNORECASE)
+QTY_PATTERN_OTHER1 = re.compile(r'(\d+)[A-Z]+\s*(\d+)', re.IGNORECASE)
+QTY_PATTERN_BOX = re.compile(r'\b(\d+)\s*B\s*X\s*(\d+)\s*GMS\s*X\s*(\d+)\s*PUNNET\b', re.IGNORECASE)
+QTY_PATTERN_NON_NUMERIC = re.compile(r'^\D+$')
+
+QTY_COLUMNS = ['number1', 'number2', 'number3', 'qty_pattern']
+
+
+def _parses_as_float(value) -> bool:
+    # The check calculate_qty applies: float() must not raise ValueError ('nan' is accepted).
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _per_unique(values: pd.Series, func, missing: bool) -> np.ndarray:
+    # Applies a boolean func once per distinct value; missing values map to `missing`.
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    flags = np.fromiter((bool(func(value)) for value in uniques), dtype=bool, count=len(uniques))
+    return np.append(flags, missing)[codes]
+
 
 def calculate_qty(description, quantity):
-    logger.info(f"Calculating quantity from description: {description}, quantity: {quantity}")
-    
-    pattern_kg = r'(\d+(?:\.\d+)?)\s*(?:KG|KGS)\b'
-    pattern_other = r'(\d+)\s*(?:G|GM|GX|GMS|GC|GMN)?\s*(?:X|\s)\s*(\d+)\s*(?:PUNNET|MAP\s*BAGS)?'
-    pattern_other1 = r'(\d+)[A-Z]+\s*(\d+)'
-    pattern_box = r'\b(\d+)\s*B\s*X\s*(\d+)\s*GMS\s*X\s*(\d+)\s*PUNNET\b'
-    pattern_non_numeric = r'^\D+$'
-    
     try:
         quantity = float(quantity)
     except ValueError:
@@ -49,29 +130,29 @@ def calculate_qty(description, quantity):
 
     number1, number2, number3 = None, None, None
 
-    if re.match(pattern_non_numeric, description):
+    if QTY_PATTERN_NON_NUMERIC.match(description):
         return pd.Series([None, None, None, 'NO NUMBER'])
 
-    match_box = re.search(pattern_box, description, re.IGNORECASE)
+    match_box = QTY_PATTERN_BOX.search(description)
     if match_box:
         number1 = int(match_box.group(1))
         number2 = int(match_box.group(2))
         number3 = int(match_box.group(3))
         return pd.Series([number1, number2, number3, 'BOX'])
 
-    match_other1 = re.search(pattern_other1, description, re.IGNORECASE)
+    match_other1 = QTY_PATTERN_OTHER1.search(description)
     if match_other1:
         number1 = float(match_other1.group(1))
         number2 = float(match_other1.group(2))
         return pd.Series([number1, number2, None, 'OTHER'])
 
-    match_kg = re.search(pattern_kg, description, re.IGNORECASE)
+    match_kg = QTY_PATTERN_KG.search(description)
     if match_kg:
         number1 = float(match_kg.group(1))
         number2 = 1
         return pd.Series([number1, number2, None, 'KG'])
 
-    match_other = re.search(pattern_other, description, re.IGNORECASE)
+    match_other = QTY_PATTERN_OTHER.search(description)
     if match_other:
         number1 = int(match_other.group(1))
         number2 = int(match_other.group(2))
@@ -80,10 +161,73 @@ def calculate_qty(description, quantity):
     return pd.Series([None, None, None, 'none'])
 
 
+def calculate_qty_frame(descriptions: pd.Series, quantities: pd.Series) -> pd.DataFrame:
+    """
+    Column-level calculate_qty: one str.extract per pattern instead of one call per row.
+
+    Patterns are tried in calculate_qty's priority order (BOX, OTHER1, KG, OTHER), each only
+    on the rows no earlier pattern matched. Wherever calculate_qty returns, the result is
+    the same; where it raises (a None quantity, a description that is not a string), this
+    parses a missing quantity like NaN and reports a non-text description as 'none'.
+
+    Args:
+        descriptions (pd.Series): Product descriptions.
+        quantities (pd.Series): Declared quantities; values float() rejects yield 'none'.
+
+    Returns:
+        pd.DataFrame: number1, number2, number3 (float) and qty_pattern, aligned with descriptions.
+    """
+    result = pd.DataFrame(np.nan, index=descriptions.index, columns=QTY_COLUMNS[:3])
+    result['qty_pattern'] = 'none'
+
+    if pd.api.types.is_numeric_dtype(quantities):
+        has_quantity = np.ones(len(quantities), dtype=bool)
+    else:
+        has_quantity = _per_unique(quantities, _parses_as_float, missing=True)
+    is_text = _per_unique(descriptions, lambda value: isinstance(value, str), missing=False)
+
+    text = descriptions.where(has_quantity & is_text).astype(object)
+    if not text.notna().any():
+        return result
+    no_number = text.str.match(QTY_PATTERN_NON_NUMERIC, na=False)
+    result.loc[no_number, 'qty_pattern'] = 'NO NUMBER'
+    pending = text.notna() & ~no_number
+
+    for pattern, label, groups in (
+        (QTY_PATTERN_BOX, 'BOX', 3),
+        (QTY_PATTERN_OTHER1, 'OTHER', 2),
+        (QTY_PATTERN_KG, 'KG', 1),
+        (QTY_PATTERN_OTHER, 'OTHER', 2),
+    ):
+        if not pending.any():
+            break
+        extracted = text[pending].str.extract(pattern).dropna(subset=[0])
+        if extracted.empty:
+            continue
+        numbers = extracted.astype(float)
+        for group in range(groups):
+            result.loc[numbers.index, QTY_COLUMNS[group]] = numbers[group]
+        if label == 'KG':
+            result.loc[numbers.index, 'number2'] = 1.0
+        result.loc[numbers.index, 'qty_pattern'] = label
+        pending[numbers.index] = False
+
+    return result
+
+
+DATE_FORMATS = (
+    '%d-%b-%Y',
+    '%d-%b-%y',
+    '%Y-%m-%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%d.%m.%Y',
+)
 
 
 def parse_date_flexibly(date_str):
-    for fmt in ('%d-%b-%y', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y'):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str.strip(), fmt).date()
         except (ValueError, AttributeError):
@@ -91,3 +235,53 @@ def parse_date_flexibly(date_str):
     return None  # return None if all formats fail
 
 
+def parse_date_column(values: pd.Series, formats=DATE_FORMATS):
+    """
+    Column-level parse_date_flexibly.
+
+    Distinct values are parsed once each. Values that are already dates (as openpyxl returns
+    them) are taken as-is; strings go through one vectorised pd.to_datetime per format, each
+    applied only to the strings no earlier format parsed.
+
+    Args:
+        values (pd.Series): Raw date values.
+        formats (tuple): strptime formats in priority order.
+
+    Returns:
+        tuple: (datetime64 Series aligned with ``values``, rows caught per format as a dict,
+        plus 'datetime' for native dates, 'missing' for empty cells and 'unparsed' for the rest)
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype=object)
+    rows_per_unique = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    source = pd.Series('unparsed', index=uniques.index, dtype=object)
+
+    native = uniques.map(lambda value: isinstance(value, (datetime, date, np.datetime64))).astype(bool)
+    if native.any():
+        parsed[native] = pd.to_datetime(uniques[native], errors='coerce')
+        source[native & parsed.notna()] = 'datetime'
+
+    text = uniques[~native].astype(str).str.strip()
+    for fmt in formats:
+        if text.empty:
+            break
+        caught = pd.to_datetime(text, format=fmt, errors='coerce').dropna()
+        parsed[caught.index] = caught
+        source[caught.index] = fmt
+        text = text.drop(caught.index)
+
+    stats = {fmt: 0 for fmt in formats}
+    stats.update(pd.Series(rows_per_unique, index=uniques.index).groupby(source).sum().to_dict())
+    stats['missing'] = int((codes < 0).sum())
+    stats.setdefault('datetime', 0)
+    stats.setdefault('unparsed', 0)
+
+    # A trailing NaT lets the -1 code of empty cells index straight into it, and keeps the
+    # lookup valid when the column has no non-null values at all.
+    lookup = np.append(parsed.to_numpy(), np.datetime64('NaT', 'ns'))
+    result = pd.Series(lookup[codes], index=values.index, name=values.name)
+    return result, {key: int(count) for key, count in stats.items()}
+
+
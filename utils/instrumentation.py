@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import wraps
+from typing import Dict, List, Optional
+from logging_config import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Persist each run summary to a pipeline_runs table as well as the log.
+PIPELINE_RUNS_TABLE = os.getenv("PIPELINE_RUNS_TABLE", "0").lower() in ("1", "true", "yes")
+# tracemalloc gives per-stage peaks of Python allocations but slows allocation-heavy code;
+# without it, stages report the process's peak RSS so far.
+PIPELINE_TRACE_MEMORY = os.getenv("PIPELINE_TRACE_MEMORY", "0").lower() in ("1", "true", "yes")
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageRecord:
+    """One execution of a stage. Callers set rows_in / rows_out on the record they are given."""
+    name: str
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+@dataclass
+class StageStats:
+    """All executions of one stage name within a run (e.g. every page fetched)."""
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    peak_bytes: int = 0
+
+    def add(self, record: StageRecord) -> None:
+        self.calls += 1
+        self.seconds += record.seconds
+        if record.rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + record.rows_in
+        if record.rows_out is not None:
+            self.rows_out = (self.rows_out or 0) + record.rows_out
+        self.peak_bytes = max(self.peak_bytes, record.peak_bytes)
+
+    def as_dict(self) -> Dict:
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        return {
+            'stage': self.name,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 4),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_sec': round(rows / self.seconds, 1) if rows and self.seconds > 0 else None,
+            'peak_memory_mb': round(self.peak_bytes / (1024 * 1024), 1) if self.peak_bytes else None,
+        }
+
+
+@dataclass
+class PipelineRun:
+    pipeline: str
+    database: Optional[str] = None
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    status: str = 'running'
+    error: Optional[str] = None
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.seconds = 0.0
+
+    def record(self, record: StageRecord) -> None:
+        with self._lock:
+            self.stages.setdefault(record.name, StageStats(record.name)).add(record)
+
+    def summary(self) -> Dict:
+        return {
+            'run_id': self.run_id,
+            'pipeline': self.pipeline,
+            'status': self.status,
+            'error': self.error,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+            'seconds': round(self.seconds, 3),
+            'stages': [stats.as_dict() for stats in self.stages.values()],
+        }
+
+
+_runs: List[PipelineRun] = []
+_runs_lock = threading.Lock()
+_stage_stack = threading.local()
+
+
+def current_run() -> Optional[PipelineRun]:
+    # A process-wide stack rather than a contextvar, so stages run in worker threads
+    # (e.g. concurrent page fetches) still land in the run that started them.
+    with _runs_lock:
+        return _runs[-1] if _runs else None
+
+
+@contextmanager
+def stage(name: str, rows_in: Optional[int] = None):
+    """
+    Times a named pipeline stage and adds it to the active run.
+
+    Usage:
+        with stage('numeric clean', rows_in=len(df)) as record:
+            ...
+            record.rows_out = len(df)
+
+    Outside a pipeline_run the block runs untimed.
+    """
+    record = StageRecord(name=name, rows_in=rows_in)
+    run = current_run()
+    if run is None:
+        yield record
+        return
+
+    stack = getattr(_stage_stack, 'records', None)
+    if stack is None:
+        stack = _stage_stack.records = []
+    parent = stack[-1] if stack else None
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        if parent is not None:
+            parent.peak_bytes = max(parent.peak_bytes, tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+
+    stack.append(record)
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - started
+        stack.pop()
+        if tracing:
+            record.peak_bytes = max(record.peak_bytes, tracemalloc.get_traced_memory()[1])
+            if parent is not None:
+                parent.peak_bytes = max(parent.peak_bytes, record.peak_bytes)
+            tracemalloc.reset_peak()
+        else:
+            record.peak_bytes = _peak_rss_bytes() or 0
+        run.record(record)
+
+
+def timed_stage(name: str):
+    """Decorator form of stage() for functions whose rows are not counted."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _persist(run: PipelineRun, summary: Dict) -> None:
+    from sql_connector import get_connector
+    from models.pipeline.pipeline_models import KBEPipelineRun, KBBIOPipelineRun
+
+    table = (KBBIOPipelineRun if run.database == 'kbbio' else KBEPipelineRun).__table__
+    engine = get_connector(run.database or 'kbe').engine
+    table.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        connection.execute(table.insert().values(
+            run_id=run.run_id,
+            pipeline=run.pipeline,
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            seconds=run.seconds,
+            error=(run.error or '')[:1000] or None,
+            summary=json.dumps(summary),
+        ))
+
+
+@contextmanager
+def pipeline_run(pipeline: str, database: Optional[str] = None, persist: Optional[bool] = None):
+    """
+    Collects stage timings for one job run and emits them as a single JSON log line.
+
+    Args:
+        pipeline (str): Job name, e.g. 'kbe-import'.
+        database (str, optional): 'kbe' or 'kbbio', where the run is stored when persisted.
+        persist (bool, optional): Also insert the summary into pipeline_runs. Defaults to the
+            PIPELINE_RUNS_TABLE env setting.
+    """
+    run = PipelineRun(pipeline=pipeline, database=database)
+    started_tracing = PIPELINE_TRACE_MEMORY and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    with _runs_lock:
+        _runs.append(run)
+
+    try:
+        yield run
+        run.status = 'ok'
+    except BaseException as e:
+        run.status = 'failed'
+        run.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        with _runs_lock:
+            _runs.remove(run)
+        if started_tracing:
+            tracemalloc.stop()
+        run.finished_at = datetime.now()
+        run.seconds = time.perf_counter() - run._started
+        summary = run.summary()
+        logger.info(f"PIPELINE_RUN {json.dumps(summary)}")
+
+        if PIPELINE_RUNS_TABLE if persist is None else persist:
+            try:
+                _persist(run, summary)
+            except Exception:
+                logger.error(f"Failed to store pipeline run {run.run_id} in pipeline_runs", exc_info=True)
@@ -0,0 +1,171 @@
+import os
+import tempfile
+from typing import Iterable, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from utils.common_utils import file_sha256, read_file_safely, iter_file_chunks
+from logging_config import logger
+
+
+STAGING_CACHE_DIR = os.getenv("KBE_STAGING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "kbe_staging"))
+STAGING_CACHE_MAX_BYTES = int(float(os.getenv("KBE_STAGING_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+STAGING_CACHE_ENABLED = os.getenv("KBE_STAGING_CACHE", "1") != "0"
+
+# Only workbook formats are worth caching; CSV is already cheap to re-read.
+CACHEABLE_EXTENSIONS = {'.xlsx', '.xlsm', '.xls', '.xlsb', '.ods'}
+
+
+def _as_text(df: pd.DataFrame) -> pd.DataFrame:
+    # Raw workbook columns mix types (dates, numbers, codes typed as text), so every column is
+    # staged as nullable text: the same str() form clean_custom_frame converts values to anyway.
+    out = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        values = df[col]
+        out[str(col)] = values.astype(str).where(values.notna(), np.nan).astype(object)
+    return out
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    schema = pa.schema([(str(col), pa.string()) for col in df.columns])
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _to_frame(table: pa.Table) -> pd.DataFrame:
+    df = table.to_pandas()
+    # Match pd.read_excel, which reports empty cells as NaN rather than None.
+    return df.where(df.notna(), np.nan)
+
+
+class StagingCache:
+    """
+    Local Parquet copies of parsed customs workbooks, keyed by the source file's SHA-256.
+
+    The first read of a workbook parses it with openpyxl and stages it; later reads of the
+    same content memory-map the Parquet file instead. Entries are evicted least recently used
+    first once the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str = STAGING_CACHE_DIR, max_bytes: int = STAGING_CACHE_MAX_BYTES, enabled: bool = STAGING_CACHE_ENABLED):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+    def cacheable(self, file_path: str) -> bool:
+        return self.enabled and os.path.splitext(file_path)[1].lower() in CACHEABLE_EXTENSIONS
+
+    def _entry_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.parquet")
+
+    def _lookup(self, file_path: str) -> tuple:
+        path = self._entry_path(file_sha256(file_path))
+        if os.path.exists(path):
+            os.utime(path)
+            return path, True
+        return path, False
+
+    def _write(self, path: str, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Stages chunks into `path`, yielding each text-converted chunk as it is written."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        writer = None
+        try:
+            for chunk in chunks:
+                chunk = _as_text(chunk)
+                table = _to_table(chunk)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+                yield chunk
+            if writer is None:
+                return
+            writer.close()
+            writer = None
+            os.replace(tmp_path, path)
+        finally:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict(keep=path)
+
+    def read(self, file_path: str) -> pd.DataFrame:
+        """Whole-file equivalent of read_file_safely, served from the cache when possible."""
+        if not self.cacheable(file_path):
+            return read_file_safely(file_path)
+
+        path, hit = self._lookup(file_path)
+        if hit:
+            logger.info(f"Reading {file_path} from staging cache.")
+            return _to_frame(pq.read_table(path, memory_map=True))
+
+        frames = list(self._write(path, [read_file_safely(file_path)]))
+        return frames[0]
+
+    def iter_chunks(self, file_path: str, chunksize: int = 50000) -> Iterator[pd.DataFrame]:
+        """Chunked equivalent of iter_file_chunks, served from the cache when possible."""
+        if not self.cacheable(file_path):
+            yield from iter_file_chunks(file_path, chunksize=chunksize)
+            return
+
+        path, hit = self._lookup(file_path)
+        if hit:
+            logger.info(f"Streaming {file_path} from staging cache.")
+            for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunksize):
+                yield _to_frame(pa.Table.from_batches([batch]))
+            return
+
+        yield from self._write(path, iter_file_chunks(file_path, chunksize=chunksize))
+
+    def prewarm(self, files: List[str], chunksize: int = 50000) -> int:
+        staged = 0
+        for file in files:
+            if not self.cacheable(file):
+                continue
+            path, hit = self._lookup(file)
+            if hit:
+                continue
+            try:
+                for _ in self._write(path, iter_file_chunks(file, chunksize=chunksize)):
+                    pass
+                staged += 1
+                logger.info(f"Staged {file}.")
+            except Exception:
+                logger.error(f"Failed to stage {file}", exc_info=True)
+        return staged
+
+    def _entries(self) -> List[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return []
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".parquet")]
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        removed = 0
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and os.path.abspath(entry.path) == os.path.abspath(keep):
+                continue
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} staging cache entries.")
+        return removed
+
+    def clear(self) -> int:
+        entries = self._entries()
+        for entry in entries:
+            os.remove(entry.path)
+        return len(entries)
+
+
+staging_cache = StagingCache()